@@ -0,0 +1,288 @@
+"""
+Server HTTP locale che simula le API REST di Jira Cloud per i benchmark.
+
+Endpoint simulati:
+- GET /rest/api/3/search                   paginazione a offset (startAt, maxResults, total)
+- GET /rest/api/3/search/jql               paginazione a cursore (nextPageToken, isLast)
+- GET /rest/api/3/issue/{key}              dettagli issue (parametro fields)
+- GET /rest/api/3/issue/{key}/comment      commenti paginati (startAt, maxResults, orderBy)
+- GET /__stats                             numero di richieste servite per endpoint
+
+Della JQL vengono interpretati solo i filtri `key in (...)` e `project = X`; gli altri criteri
+sono ignorati. Tutti i dati sono sintetici e deterministici.
+
+Parametri configurabili: numero di issue e commenti, latenza per richiesta, dimensione massima
+delle pagine, profondità e ampiezza dei documenti ADF (descrizioni e commenti), frazione di
+richieste rifiutate con 429 + Retry-After.
+
+Utilizzo:
+    python benchmark/mock_jira_server.py --port 8765 --issues 500 --comments 300 --latency 0.05
+
+Nome del file:
+- benchmark/mock_jira_server.py
+"""
+
+import argparse
+import gzip
+import itertools
+import json
+import re
+import threading
+import time
+
+from collections import Counter
+from dataclasses import dataclass
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+RE_KEY_IN   = re.compile(r"key\s+in\s*\(([^)]*)\)", re.IGNORECASE)
+RE_PROJECT  = re.compile(r'project\s*=\s*"?([A-Z][A-Z0-9_]*)"?', re.IGNORECASE)
+RE_ISSUE    = re.compile(r"^/rest/api/3/issue/([^/]+)(/comment)?$")
+
+PRIORITIES  = ["Highest", "High", "Medium", "Low", "Lowest"]
+STATUSES    = ["Da Gestire", "In corso", "Stand by Cliente", "Stand by Interno"]
+PROJECTS    = ["SAL", "CPC", "TRM", "KML", "UNF", "FIS", "VFA", "FOR"]
+
+# === Configurazione del server simulato ===
+@dataclass(frozen=True)
+class MockConfig:
+    issues: int = 200           # issue restituite dalla ricerca
+    comments: int = 150         # commenti per issue
+    latency: float = 0.03       # secondi di attesa per ogni richiesta
+    page_size: int = 100        # maxResults massimo accettato
+    inline_comments: int = 20   # commenti inclusi nel campo "comment" della ricerca
+    adf_depth: int = 2          # livelli di annidamento degli elenchi
+    adf_width: int = 3          # elementi per livello
+    throttle: float = 0.0       # frazione di richieste rifiutate con 429 (limite di frequenza simulato)
+    retry_after: int = 1        # secondi indicati nell'header Retry-After delle risposte 429
+
+# === Generazione dei dati sintetici ===
+def _text(text, marks=None):
+    node = {"type": "text", "text": text}
+    if marks:
+        node["marks"] = marks
+    return node
+
+def _paragraph(*children):
+    return {"type": "paragraph", "content": list(children)}
+
+def _bullet_list(depth, width, seed):
+    items = []
+    for i in range(width):
+        content = [_paragraph(_text(f"Voce {seed}.{i} livello {depth}"))]
+        if depth > 1:
+            content.append(_bullet_list(depth - 1, width, seed * 10 + i))
+        items.append({"type": "listItem", "content": content})
+    return {"type": "bulletList", "content": items}
+
+def make_adf(seed, depth, width):
+    """Documento ADF con paragrafi formattati, elenchi annidati, codice, pannello e tabella."""
+    return {"type": "doc", "version": 1, "content": [
+        _paragraph(
+            _text(f"Aggiornamento {seed}: ", [{"type": "strong"}]),
+            _text("verificato in ambiente di test ", [{"type": "em"}]),
+            _text("con esito positivo", [{"type": "textColor", "attrs": {"color": "#ff5630"}}]),
+            {"type": "hardBreak"},
+            _text("riferimento ", [{"type": "code"}]),
+            _text("documentazione", [{"type": "link", "attrs": {"href": "https://example.com"}}]),
+        ),
+        _bullet_list(depth, width, seed),
+        {"type": "codeBlock", "attrs": {"language": "sql"},
+         "content": [_text(f"SELECT * FROM ordini WHERE id = {seed};\nCOMMIT;")]},
+        {"type": "panel", "attrs": {"panelType": "info"}, "content": [
+            _paragraph(_text("Nota: ", [{"type": "strong"}, {"type": "underline"}]), _text("firma standard del team.")),
+        ]},
+        {"type": "table", "content": [
+            {"type": "tableRow", "content": [
+                {"type": "tableCell", "content": [_paragraph(_text(f"Cella {seed}.{c}"))]} for c in range(width)
+            ]},
+        ]},
+    ]}
+
+class MockData:
+    def __init__(self, config):
+        self.config = config
+        self.keys = [f"{PROJECTS[i % len(PROJECTS)]}-{i + 1}" for i in range(config.issues)]
+        self.key_set = set(self.keys)
+
+    @lru_cache(maxsize=None)
+    def comment(self, key, index):
+        day, minute = divmod(index, 24 * 60)
+        stamp = f"2025-{1 + day // 28 % 12:02d}-{1 + day % 28:02d}T{minute // 60:02d}:{minute % 60:02d}:00.000+0200"
+        return {
+            "id": str(index + 1),
+            "author": {"displayName": f"Utente {index % 7}"},
+            "created": stamp,
+            "updated": stamp,
+            "body": make_adf(index, self.config.adf_depth, self.config.adf_width),
+        }
+
+    @lru_cache(maxsize=None)
+    def issue_fields(self, key):
+        n = int(key.split("-")[1])
+        project = key.split("-")[0]
+        return {
+            "summary": f"{project} - attività sintetica numero {n}",
+            "description": make_adf(n, self.config.adf_depth + 1, self.config.adf_width),
+            "customfield_10059": {"type": "doc", "content": [_paragraph(_text(f"Referente {n}: Mario Rossi"))]},
+            "environment": "Windows Server 2019\nSQL Server 2017",
+            "project": {"key": project, "name": f"Cliente {project}"},
+            "status": {"name": STATUSES[n % len(STATUSES)]},
+            "priority": {"name": PRIORITIES[n % len(PRIORITIES)]},
+            "created": f"2025-{1 + n % 12:02d}-{1 + n % 28:02d}T09:41:22.123+0200",
+            "duedate": f"2025-{1 + (n * 7) % 12:02d}-{1 + n % 28:02d}" if n % 3 else None,
+            "updated": "2025-10-01T10:00:00.000+0200",
+        }
+
+    def issue(self, key, fields):
+        all_fields = self.issue_fields(key)
+        wanted = [f.strip() for f in fields.split(",") if f.strip()] if fields else ["*all"]
+        if "*all" in wanted:
+            selected = dict(all_fields)
+            wanted = list(all_fields) + ["comment"]
+        else:
+            selected = {f: all_fields[f] for f in wanted if f in all_fields}
+        if "comment" in wanted:
+            inline = min(self.config.comments, self.config.inline_comments)
+            selected["comment"] = {
+                "comments": [self.comment(key, i) for i in range(inline)],
+                "startAt": 0, "maxResults": inline, "total": self.config.comments,
+            }
+        return {"id": str(10000 + int(key.split("-")[1])), "key": key, "fields": selected}
+
+    def search_keys(self, jql):
+        keys = self.keys
+        m = RE_KEY_IN.search(jql)
+        if m:
+            wanted = {k.strip().strip('"') for k in m.group(1).split(",")}
+            keys = [k for k in keys if k in wanted]
+        m = RE_PROJECT.search(jql)
+        if m:
+            keys = [k for k in keys if k.startswith(m.group(1) + "-")]
+        return keys
+
+# === Gestione delle richieste HTTP ===
+class MockJiraHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    data = None     # MockData, impostato da make_server
+    stats = None    # Counter delle richieste per endpoint
+    served = None   # contatore delle richieste (itertools.count, incremento atomico)
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, obj, status=200, headers=None):
+        body = json.dumps(obj, separators=(",", ":")).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        if "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = gzip.compress(body, compresslevel=1)
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+        config = self.data.config
+
+        if url.path == "/__stats":
+            return self._send(dict(self.stats))
+
+        if config.latency:
+            time.sleep(config.latency)
+
+        # Limite di frequenza simulato: una richiesta ogni 1/throttle riceve 429
+        if config.throttle:
+            if next(self.served) % max(1, round(1 / config.throttle)) == 0:
+                self.stats["throttled"] += 1
+                return self._send({"errorMessages": ["Rate limit exceeded"]}, 429,
+                                  {"Retry-After": str(config.retry_after), "X-RateLimit-NearLimit": "true"})
+        max_results = min(int(query.get("maxResults", 50)), config.page_size)
+
+        if url.path in ("/rest/api/3/search", "/rest/api/3/search/jql"):
+            endpoint = "search" if url.path.endswith("search") else "search/jql"
+            self.stats[endpoint] += 1
+            keys = self.data.search_keys(query.get("jql", ""))
+            if endpoint == "search":
+                start_at = int(query.get("startAt", 0))
+            else:
+                start_at = int(query.get("nextPageToken", 0))
+            page = [self.data.issue(k, query.get("fields", "")) for k in keys[start_at:start_at + max_results]]
+            body = {"issues": page}
+            if endpoint == "search":
+                body.update({"startAt": start_at, "maxResults": max_results, "total": len(keys)})
+            else:
+                is_last = start_at + max_results >= len(keys)
+                body["isLast"] = is_last
+                if not is_last:
+                    body["nextPageToken"] = str(start_at + max_results)
+            return self._send(body)
+
+        m = RE_ISSUE.match(url.path)
+        if m:
+            key = m.group(1)
+            if key not in self.data.key_set:
+                self.stats["not_found"] += 1
+                return self._send({"errorMessages": ["Issue does not exist"]}, 404)
+            if m.group(2):
+                self.stats["comment"] += 1
+                start_at = int(query.get("startAt", 0))
+                indexes = range(config.comments)
+                if query.get("orderBy") == "-created":
+                    indexes = reversed(indexes)
+                indexes = list(indexes)[start_at:start_at + max_results]
+                return self._send({
+                    "startAt": start_at, "maxResults": max_results, "total": config.comments,
+                    "comments": [self.data.comment(key, i) for i in indexes],
+                })
+            self.stats["issue"] += 1
+            return self._send(self.data.issue(key, query.get("fields", "")))
+
+        self.stats["not_found"] += 1
+        self._send({"errorMessages": [f"Endpoint non simulato: {url.path}"]}, 404)
+
+# === Avvio del server ===
+def make_server(config=MockConfig(), host="127.0.0.1", port=0):
+    handler = type("Handler", (MockJiraHandler,), {"data": MockData(config), "stats": Counter(),
+                                                   "served": itertools.count(1)})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+def start_server(config=MockConfig(), host="127.0.0.1", port=0):
+    """Avvia il server in un thread e restituisce (server, base_url)."""
+    server = make_server(config, host, port)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+def server_stats(server):
+    return dict(server.RequestHandlerClass.stats)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Server Jira simulato per i benchmark")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--issues", type=int, default=MockConfig.issues)
+    parser.add_argument("--comments", type=int, default=MockConfig.comments)
+    parser.add_argument("--latency", type=float, default=MockConfig.latency)
+    parser.add_argument("--page-size", type=int, default=MockConfig.page_size)
+    parser.add_argument("--adf-depth", type=int, default=MockConfig.adf_depth)
+    parser.add_argument("--adf-width", type=int, default=MockConfig.adf_width)
+    parser.add_argument("--throttle", type=float, default=MockConfig.throttle)
+    parser.add_argument("--retry-after", type=int, default=MockConfig.retry_after)
+    args = parser.parse_args()
+
+    config = MockConfig(issues=args.issues, comments=args.comments, latency=args.latency,
+                        page_size=args.page_size, adf_depth=args.adf_depth, adf_width=args.adf_width,
+                        throttle=args.throttle, retry_after=args.retry_after)
+    server = make_server(config, args.host, args.port)
+    print(f"Server Jira simulato su http://{args.host}:{args.port} ({config})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,209 @@
+"""
+Benchmark dei report Jira contro il server simulato (benchmark/mock_jira_server.py).
+
+Fasi misurate:
+- jira-project-report-v4.3.py
+    - fetch     get_ticket_details + get_ticket_comments di un ticket
+    - parse     estrazione del testo ADF (get_text_from_content) di descrizione e commenti
+    - render    costruzione del documento Word in memoria (build_word_document)
+    - save      salvataggio del file .docx
+    - write     documento completo su file con ciascun backend di scrittura (--backend):
+                write.docx (API python-docx, render + save) e write.ooxml (XML diretto, jira_ooxml.py)
+    - incremental  generate_report_incremental su un report già aggiornato (dettagli e una pagina di commenti)
+    - batch     generate_reports_batch su più ticket; batch.processes con i documenti generati
+                da un processo per CPU (--processes)
+    - e2e       esecuzione completa dello script in un nuovo processo
+- avvio
+    - project   avvio a freddo di jira-project-report-v4.3.py (--help: import e configurazione)
+    - imports   import di python-docx, tkinter e asyncio, che gli script rimandano a quando servono
+- jira-tasks-report-v6.0.py
+    - fetch     paginazione della ricerca (fetch_issues)
+    - group     raggruppamento e ordinamento per priorità (group_by_priority)
+    - render    documento Word e righe di testo in memoria (render_report)
+    - save      salvataggio di .docx e .txt (save_report)
+    - e2e       esecuzione completa dello script in un nuovo processo (tutti i progetti)
+
+Per ogni fase vengono riportati mediana, minimo e massimo su --repeat ripetizioni
+e il numero di richieste ricevute dal server simulato.
+Con --json i risultati vengono salvati; con --baseline vengono confrontati con un'esecuzione
+precedente e lo script termina con codice 1 se una fase è più lenta oltre --tolerance.
+
+Utilizzo:
+    python benchmark/run_benchmark.py --issues 300 --comments 500 --latency 0.05 --json base.json
+    python benchmark/run_benchmark.py --baseline base.json --tolerance 0.2
+
+Nome del file:
+- benchmark/run_benchmark.py
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from mock_jira_server import MockConfig, server_stats, start_server
+
+ROOT            = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROJECT_REPORT  = os.path.join(ROOT, "jira-project-report-v4.3.py")
+TASKS_REPORT    = os.path.join(ROOT, "jira-tasks-report-v6.0.py")
+
+# === Caricamento di uno script di report come modulo ===
+def load_script(path, name):
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+# === Misura di una fase ===
+class Bench:
+    def __init__(self, server, repeat):
+        self.server = server
+        self.repeat = repeat
+        self.results = {}
+
+    def measure(self, name, fn, repeat=None):
+        times = []
+        before = sum(server_stats(self.server).values())
+        result = None
+        for _ in range(repeat or self.repeat):
+            start = time.perf_counter()
+            result = fn()
+            times.append(time.perf_counter() - start)
+        requests_count = (sum(server_stats(self.server).values()) - before) // len(times)
+
+        self.results[name] = {
+            "median": statistics.median(times),
+            "min": min(times),
+            "max": max(times),
+            "requests": requests_count,
+        }
+        print(f"{name:<28} {statistics.median(times) * 1000:>10.1f} {min(times) * 1000:>10.1f} "
+              f"{max(times) * 1000:>10.1f} {requests_count:>10}")
+        return result
+
+def run_script(args, env, cwd):
+    proc = subprocess.run([sys.executable] + args, env=env, cwd=cwd, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f"{os.path.basename(args[-1])} terminato con codice {proc.returncode}:\n{proc.stdout}{proc.stderr}")
+
+# === Avvio a freddo (nuovo processo) ===
+def bench_startup(bench, env, workdir):
+    bench.measure("startup.project", lambda: run_script([PROJECT_REPORT, "--help"], env, workdir))
+    bench.measure("startup.imports", lambda: run_script(["-c", "import docx, tkinter, tkinter.ttk, asyncio"], env, workdir))
+
+# === Benchmark del report di progetto (v4.3) ===
+def bench_project_report(bench, report, keys, batch_size, env, workdir):
+    key = keys[0]
+    details = bench.measure("project.fetch", lambda: (report.get_ticket_details(key), report.get_ticket_comments(key)))
+    (summary, description_adf, riferimenti, ambiente, cliente), comments = details
+
+    def parse():
+        report.get_text_from_content(description_adf.get("content", []))
+        for c in comments:
+            report.get_text_from_content(c["body"].get("content", []))
+
+    bench.measure("project.parse", parse)
+    doc = bench.measure("project.render", lambda: report.build_word_document(
+        key, summary, description_adf, riferimenti, ambiente, comments, cliente))
+    bench.measure("project.save", lambda: doc.save(os.path.join(workdir, f"{key}_report.docx")))
+    for backend in report.DOCX_BACKENDS:
+        bench.measure(f"project.write.{backend}", lambda: report.create_word_document(
+            key, summary, description_adf, riferimenti, ambiente, comments, cliente, workdir, backend=backend))
+    report.generate_report_incremental(key, workdir)   # report e manifest di partenza
+    bench.measure("project.incremental", lambda: report.generate_report_incremental(key, workdir))
+    bench.measure("project.batch", lambda: report.generate_reports_batch(keys[:batch_size]), repeat=1)
+    bench.measure("project.batch.processes", lambda: report.generate_reports_batch(
+        keys[:batch_size], processes=os.cpu_count()), repeat=1)
+    bench.measure("project.e2e", lambda: run_script([PROJECT_REPORT, key], env, workdir))
+
+# === Benchmark del report attività (v6.0) ===
+def bench_tasks_report(bench, tasks, env, workdir):
+    issues = bench.measure("tasks.fetch", lambda: tasks.fetch_issues(delta=False))
+    priorities = bench.measure("tasks.group", lambda: tasks.group_by_priority(issues))
+    doc, lines = bench.measure("tasks.render", lambda: tasks.render_report(priorities))
+    bench.measure("tasks.save", lambda: tasks.save_report(doc, lines, workdir))
+    bench.measure("tasks.e2e", lambda: run_script([TASKS_REPORT, "tutti"], env, workdir))
+
+# === Confronto con un'esecuzione precedente ===
+def compare(results, baseline_file, tolerance):
+    with open(baseline_file, encoding="utf-8") as f:
+        baseline = json.load(f)["results"]
+
+    regressions = []
+    print(f"\nConfronto con {baseline_file} (tolleranza {tolerance:.0%}):")
+    for name, res in results.items():
+        if name not in baseline:
+            continue
+        ratio = res["median"] / baseline[name]["median"] if baseline[name]["median"] else 1.0
+        flag = "REGRESSIONE" if ratio > 1 + tolerance else ""
+        print(f"{name:<28} {ratio:>8.2f}x  {flag}")
+        if flag:
+            regressions.append(name)
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark dei report Jira con server simulato")
+    parser.add_argument("--issues", type=int, default=MockConfig.issues)
+    parser.add_argument("--comments", type=int, default=MockConfig.comments)
+    parser.add_argument("--latency", type=float, default=MockConfig.latency)
+    parser.add_argument("--page-size", type=int, default=MockConfig.page_size)
+    parser.add_argument("--adf-depth", type=int, default=MockConfig.adf_depth)
+    parser.add_argument("--adf-width", type=int, default=MockConfig.adf_width)
+    parser.add_argument("--throttle", type=float, default=MockConfig.throttle,
+                        help="frazione di richieste rifiutate dal server simulato con 429")
+    parser.add_argument("--batch", type=int, default=10, help="ticket generati nella fase batch")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", help="salva i risultati in questo file")
+    parser.add_argument("--baseline", help="confronta con i risultati salvati in questo file")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args()
+    json_file = os.path.abspath(args.json) if args.json else None
+    baseline_file = os.path.abspath(args.baseline) if args.baseline else None
+
+    config = MockConfig(issues=args.issues, comments=args.comments, latency=args.latency,
+                        page_size=args.page_size, adf_depth=args.adf_depth, adf_width=args.adf_width,
+                        throttle=args.throttle)
+    server, base_url = start_server(config)
+    workdir = tempfile.mkdtemp(prefix="jira-bench-")
+
+    # Configurazione degli script: server simulato, nessuna cache o istantanea dell'utente
+    os.environ.update({
+        "JIRA_URL": base_url,
+        "JIRA_USERNAME": "benchmark",
+        "JIRA_API_TOKEN": "benchmark",
+        "JIRA_CACHE": "0",
+        "JIRA_SNAPSHOT_DIR": os.path.join(workdir, "snapshots"),
+    })
+    env = dict(os.environ)
+    os.chdir(workdir)
+    sys.path.insert(0, ROOT)
+
+    report = load_script(PROJECT_REPORT, "jira_project_report")
+    tasks = load_script(TASKS_REPORT, "jira_tasks_report")
+    keys = server.RequestHandlerClass.data.keys
+
+    print(f"Server simulato: {base_url} ({config})")
+    print(f"Cartella di lavoro: {workdir}\n")
+    print(f"{'fase':<28} {'mediana ms':>10} {'min ms':>10} {'max ms':>10} {'richieste':>10}")
+
+    bench = Bench(server, args.repeat)
+    bench_startup(bench, env, workdir)
+    bench_project_report(bench, report, keys, args.batch, env, workdir)
+    bench_tasks_report(bench, tasks, env, workdir)
+    server.shutdown()
+
+    if json_file:
+        with open(json_file, "w", encoding="utf-8") as f:
+            json.dump({"config": config.__dict__, "results": bench.results}, f, indent=2)
+
+    if baseline_file and compare(bench.results, baseline_file, args.tolerance):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
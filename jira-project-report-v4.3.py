@@ -13,9 +13,40 @@ Funzionalità principali:
     - Elenco issues
     - Commenti dettagliati
 - Salva il report in un file `<CODICE_PROGETTO>_report.docx`.
+- Cache locale (jira_cache.py): se il ticket non è cambiato (campo `updated`) dettagli e commenti
+  vengono letti dalla cache con una sola richiesta leggera a Jira.
+- Modalità batch: genera i report di più ticket in parallelo
+  (`--batch KEY1 KEY2 ...`, `--batch` per tutti i ticket aperti, `--file elenco_attivita.txt`);
+  con `--async` le richieste passano dal motore asincrono jira_async.py. I dettagli dei ticket
+  vengono letti con una ricerca `key in (...)` ogni 100 ticket invece di una richiesta per ticket;
+  anche i commenti arrivano dalla ricerca (campo `comment`), con il pager per issue solo per i ticket
+  che ne hanno più di quelli inclusi. Con `--processes N` i documenti vengono generati da N processi
+  (il rendering è CPU-bound), con al massimo `--render-memory` MB di dati dei ticket in attesa.
+- Le richieste rispettano i limiti di Jira Cloud (429, Retry-After, X-RateLimit-*) e ripetono gli
+  errori transitori (jira_ratelimit.py); se i commenti non sono recuperabili il report non viene
+  generato, invece di uscire con commenti mancanti.
+- Report consolidato (`--consolidated [FILE]`, es. con `--file elenco_attivita.txt`): un unico
+  documento con il sommario (campo TOC, aggiornato da Word all'apertura) e una sezione per ticket
+  con segnalibro sul titolo; le sezioni sono scritte nel file appena pronte (backend OOXML),
+  senza tenere in memoria un documento per ticket.
+- Rigenerazione incrementale (`--incremental`): accanto a `<KEY>_report.docx` un piccolo manifest
+  registra l'ultimo commento (id e data) e l'hash di descrizione e intestazione; alla successiva
+  esecuzione vengono scaricati solo i commenti successivi e aggiunti in fondo al documento esistente.
+- Modalità streaming (`--stream`): i commenti vengono scaricati e scritti nel documento una pagina
+  alla volta, senza tenere in memoria l'intera storia del ticket. Il documento viene sempre scritto
+  con il backend OOXML (il backend python-docx terrebbe in memoria l'albero di tutto il documento).
+- Avvio rapido: python-docx, tkinter e asyncio vengono importati solo quando servono;
+  con `--headless` (o JIRA_HEADLESS=1) la GUI non viene mai usata.
+- Backend di scrittura `--backend ooxml` (o JIRA_DOCX_BACKEND=ooxml): word/document.xml viene scritto
+  direttamente nel file .docx come flusso XML (jira_ooxml.py), con gli stessi stili del backend
+  python-docx predefinito; per report con migliaia di commenti rendering e salvataggio sono molto più rapidi.
+- Strumentazione (`--trace FILE` oppure JIRA_TRACE): latenza, stato e byte di ogni richiesta a Jira
+  e durata delle fasi (recupero, parsing ADF, rendering, salvataggio) in un riepilogo JSON
+  o in un file Chrome Trace (`--trace-format chrome`).
 
 Requisiti:
-- Librerie Python: requests, python-docx
+- Librerie Python: requests, python-docx, python-dotenv
+- Modulo condiviso jira_client.py (nella stessa cartella dello script)
 - API token Atlassian valido
 - Permessi di accesso in lettura al progetto Jira
 
@@ -26,21 +57,27 @@ Autore: Roberto Raimondi
 Ultima modifica: 21/08/2025
 """
 
+import argparse
+import json
 import os
+import pickle
+import re
 import requests
 import sys
+import threading
+import time
 
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, as_completed, wait
+from copy import deepcopy
 from datetime import datetime
+from io import BytesIO
 from dotenv import load_dotenv
-from docx import Document
-from docx.text.paragraph import Paragraph
-from docx.table import _Cell
-from docx.enum.text import WD_LINE_SPACING, WD_PARAGRAPH_ALIGNMENT
-from docx.oxml import OxmlElement, parse_xml
-from docx.oxml.ns import qn, nsdecls
-from docx.shared import Cm, Pt, RGBColor
-from tkinter import Button, Entry, Label, StringVar, Tk, messagebox
-from tkinter.ttk import Combobox
+from jira_adf import DEFAULT, LIST_TYPES, adf_to_text, fragment_key, get_render_cache, walk_adf
+from jira_cache import get_cache
+from jira_ooxml import DocxAppendWriter, DocxStreamWriter, element_xml, paragraph_xml, run_xml
+from jira_client import get_client
+from jira_sync import sync_issues
+from jira_trace import enable as enable_trace, span
 
 # === Caricamento variabili ambiente ===
 load_dotenv()
@@ -52,71 +89,352 @@ JIRA_URL    = os.getenv("JIRA_URL")
 USERNAME    = os.getenv("JIRA_USERNAME")
 API_TOKEN   = os.getenv("JIRA_API_TOKEN")
 
-AUTH        = (USERNAME, API_TOKEN)
-HEADERS     = {"Accept": "application/json"}
+# Sessione HTTP condivisa (keep-alive, pool di connessioni, gzip)
+jira        = get_client(base_url=JIRA_URL, username=USERNAME, api_token=API_TOKEN)
+
+# Cache locale delle risposte (None se disattivata con JIRA_CACHE=0 o --no-cache)
+cache       = get_cache()
 JQL_BASE    = 'assignee = currentUser() AND status in ("Da Gestire", "In corso", "Stand by Cliente", "Stand by Interno") ORDER BY key ASC'
 
 # === Costanti per i campi personalizzati ===
 CAMPO_AMBIENTE      = "environment"
 CAMPO_RIFERIMENTI   = "customfield_10059"
+CAMPI_DETTAGLI      = f"summary, description, {CAMPO_RIFERIMENTI}, {CAMPO_AMBIENTE}, project, updated"
+
+# === Modalità senza interfaccia grafica (CI, pianificazioni): Tk non viene mai importato ===
+HEADLESS            = os.getenv("JIRA_HEADLESS") == "1"
+
+# === Backend di scrittura dei documenti: docx (API python-docx) oppure ooxml (jira_ooxml.py) ===
+DOCX_BACKENDS       = ("docx", "ooxml")
+DOCX_BACKEND        = os.getenv("JIRA_DOCX_BACKEND", "docx")
+
+# === Rendering in processi separati (modalità batch): python-docx è CPU-bound e tiene il GIL ===
+RENDER_PROCESSES    = int(os.getenv("JIRA_RENDER_PROCESSES", "0"))    # 0 = rendering nel processo principale
+RENDER_MEMORY_MB    = int(os.getenv("JIRA_RENDER_MEMORY_MB", "256"))  # dati dei ticket in attesa di rendering
+
+# === Report consolidato: un unico .docx con una sezione per ticket (--consolidated) ===
+CONSOLIDATED_FILE   = os.getenv("JIRA_CONSOLIDATED_FILE", "report_attivita.docx")
+
+# === Rigenerazione incrementale (--incremental): solo i commenti nuovi vengono aggiunti al report ===
+INCREMENTAL         = os.getenv("JIRA_INCREMENTAL") == "1"
+MANIFEST_VERSION    = 1
+
+# === Parametri modalità batch ===
+BATCH_WORKERS       = int(os.getenv("JIRA_BATCH_WORKERS", "8"))
+RE_TICKET_KEY       = re.compile(r"^([A-Z][A-Z0-9_]*-\d+)\b")
+BULK_CHUNK          = 100   # chiavi per ricerca `key in (...)`: una pagina Jira Cloud, JQL e URL entro i limiti
+SEARCH_JQL_PATH     = "/rest/api/3/search/jql"
+
+# === Validazione cache: valori "updated" già verificati in questa esecuzione ===
+REVALIDATE_WINDOW   = 60  # secondi
+
+# === Sincronizzazione incrementale dell'elenco ticket (jira_sync.py) ===
+DELTA_SYNC          = os.getenv("JIRA_DELTA_SYNC") == "1"
+_updated_seen       = {}
+_updated_locks      = {}
+_updated_lock       = threading.Lock()
 
 # === Funzione per formattare la data in formato leggibile ===
 def _parse_jira_dt(s: str) -> datetime:
     # Jira: "2025-08-13T09:41:22.123+0200" → consideriamo solo la parte fino ai secondi
-    return datetime.strptime(s[:19], "%Y-%m-%dT%H:%M:%S")
+    # (fromisoformat è implementato in C: molto più rapido di strptime con migliaia di commenti)
+    return datetime.fromisoformat(s[:19])
 
 # === Funzione per ottenere tutti i ticket dell'utente ===
 def get_tickets_for_user():
-    search_url = f"{JIRA_URL}/rest/api/3/search"
-    params = {
-        "jql": JQL_BASE,
-        "fields": "key, summary",
-        "maxResults": 1000
-    }
-    resp = requests.get(search_url, headers=HEADERS, params=params, auth=AUTH)
-    if resp.status_code != 200:
-        return []
-    
-    issues = resp.json().get("issues", [])
+    if DELTA_SYNC:
+        try:
+            issues = sync_issues(jira, JQL_BASE, "key, summary", path="/rest/api/3/search")
+        except requests.RequestException as e:
+            print(f"Errore nella sincronizzazione dei ticket: {e}")
+            return []
+    else:
+        params = {
+            "jql": JQL_BASE,
+            "fields": "key, summary",
+            "maxResults": 1000
+        }
+        resp = jira.get("/rest/api/3/search", params=params)
+        if resp.status_code != 200:
+            return []
+
+        issues = resp.json().get("issues", [])
     tickets = [f"{i['key']} - {i['fields']['summary']}" for i in issues]
     return sorted(tickets, key=lambda x: x.split(" - ")[0])
 
-# === Estrae tutti i commenti di un progetto ordinati per data crescente (dal più vecchio al più recente)===
-def get_ticket_comments(ticket_key):
-    url = f"{JIRA_URL}/rest/api/3/issue/{ticket_key}/comment"
+# === Valore corrente del campo "updated" di un ticket (richiesta leggera per validare la cache) ===
+def get_issue_updated(ticket_key):
+    with _updated_lock:
+        lock = _updated_locks.setdefault(ticket_key, threading.Lock())
+
+    # Un solo controllo per ticket entro REVALIDATE_WINDOW, anche con dettagli e commenti in parallelo
+    with lock:
+        seen = _updated_seen.get(ticket_key)
+        if seen and time.monotonic() - seen[1] < REVALIDATE_WINDOW:
+            return seen[0]
+
+        resp = jira.get(f"/rest/api/3/issue/{ticket_key}", params={"fields": "updated"})
+        if resp.status_code != 200:
+            return None
+        updated = resp.json().get("fields", {}).get("updated")
+        _updated_seen[ticket_key] = (updated, time.monotonic())
+        return updated
+
+def _remember_updated(ticket_key, updated):
+    if updated:
+        _updated_seen[ticket_key] = (updated, time.monotonic())
+
+# === Scarica i commenti grezzi (JSON Jira) di un ticket, pagina per pagina ===
+def _fetch_raw_comments(ticket_key):
+    """
+    Restituisce tutti i commenti grezzi del ticket.
+    Solleva requests.HTTPError se una pagina non è recuperabile (anche dopo i tentativi del client):
+    un elenco troncato non deve finire nel report né nella cache.
+    """
+    url = f"/rest/api/3/issue/{ticket_key}/comment"
     start_at, max_results = 0, 100
-    all_comments = []
+    raw_comments = []
 
     while True:
         params = {"startAt": start_at, "maxResults": max_results}
-        resp = requests.get(url, headers=HEADERS, params=params, auth=AUTH)
+        resp = jira.get(url, params=params)
         if resp.status_code != 200:
-            break
+            raise requests.HTTPError(f"Commenti di {ticket_key} non recuperati: {resp.status_code} {resp.text}",
+                                     response=resp)
 
         data = resp.json()
         comments = data.get("comments", [])
         if not comments:
             break
 
-        for c in comments:
-            created = _parse_jira_dt(c.get("created", ""))
-            author = (c.get("author") or {}).get("displayName", "Sconosciuto")
-            body = c.get("body", None)
-            all_comments.append({
-                "created": created,
-                "author": author,
-                "body": body
-            })
+        raw_comments.extend(comments)
 
         start_at += len(comments)
         if start_at >= data.get("total", start_at):
             break
 
+    return raw_comments
+
+# === Estrae tutti i commenti di un progetto ordinati per data crescente (dal più vecchio al più recente)===
+def get_ticket_comments(ticket_key):
+    with span("fetch.comments", ticket=ticket_key):
+        return _get_ticket_comments(ticket_key)
+
+def _get_ticket_comments(ticket_key):
+    raw_comments = None
+    cached = cache.lookup(ticket_key, "comments") if cache else None
+    if cached and get_issue_updated(ticket_key) == cached[1]:
+        raw_comments = cached[0]
+
+    if raw_comments is None:
+        # "updated" letto prima del download: se il ticket cambia nel frattempo, la voce risulta già vecchia
+        updated = get_issue_updated(ticket_key) if cache else None
+        raw_comments = _fetch_raw_comments(ticket_key)
+        if cache and updated:
+            cache.put(ticket_key, "comments", raw_comments, updated)
+
+    return _comments_from_raw(raw_comments)
+
+# === Commenti di più ticket: campo `comment` della ricerca, pager singolo solo se troncato ===
+def iter_ticket_comments_bulk(ticket_keys, chunk_size=BULK_CHUNK, max_workers=BATCH_WORKERS):
+    """
+    Generatore di (chiave, commenti) per più ticket, nello stesso formato di get_ticket_comments.
+    I commenti arrivano dal campo `comment` di una ricerca `key in (...)` ogni chunk_size ticket;
+    per i ticket con più commenti di quelli inclusi nella ricerca si usa il pager per issue
+    (_fetch_raw_comments, oppure la cache se il ticket non è cambiato).
+    I ticket completi vengono restituiti subito, quelli da paginare man mano che terminano.
+    I ticket non restituiti dalla ricerca vengono recuperati con get_ticket_comments;
+    in caso di errore di connessione i commenti del ticket sono None.
+    """
+    ticket_keys = list(dict.fromkeys(ticket_keys))
+    chunks = [ticket_keys[i:i + chunk_size] for i in range(0, len(ticket_keys), chunk_size)]
+    if not chunks:
+        return
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+        pending = {}
+        seen = set()
+        for issues in pool.map(lambda keys: _search_chunk(keys, "comment, updated"), chunks):
+            for issue in issues:
+                key = issue["key"]
+                seen.add(key)
+                fields = issue.get("fields", {})
+                updated = fields.get("updated")
+                _remember_updated(key, updated)
+                inline = fields.get("comment") or {}
+                raw_comments = inline.get("comments", [])
+
+                if len(raw_comments) >= inline.get("total", len(raw_comments)):
+                    if cache and updated:
+                        cache.put(key, "comments", raw_comments, updated)
+                    yield key, _comments_from_raw(raw_comments)
+                else:
+                    pending[pool.submit(get_ticket_comments, key)] = key
+
+        for key in ticket_keys:
+            if key not in seen:
+                pending[pool.submit(get_ticket_comments, key)] = key
+
+        for fut in as_completed(pending):
+            try:
+                comments = fut.result()
+            except requests.RequestException as e:
+                print(f"Errore di connessione per {pending[fut]}: {e}")
+                comments = None
+            yield pending[fut], comments
+
+def get_ticket_comments_bulk(ticket_keys, chunk_size=BULK_CHUNK, max_workers=BATCH_WORKERS):
+    """{chiave: commenti ordinati per data, None se non recuperabili} per più ticket (vedi iter_ticket_comments_bulk)."""
+    return dict(iter_ticket_comments_bulk(ticket_keys, chunk_size, max_workers))
+
+# === Conversione dei commenti grezzi in {created, author, body} ordinati per data ===
+def _comments_from_raw(raw_comments):
+    all_comments = [_comment_from_raw(c) for c in raw_comments]
     all_comments.sort(key=lambda x: x["created"])
     return all_comments
 
+def _comment_from_raw(c):
+    created = _parse_jira_dt(c.get("created", ""))
+    author = (c.get("author") or {}).get("displayName", "Sconosciuto")
+    body = c.get("body", None)
+    return {
+        "id": c.get("id"),
+        "created": created,
+        "author": author,
+        "body": body
+    }
+
+# === Commenti in streaming: una pagina alla volta, in ordine di creazione ===
+def iter_ticket_comments(ticket_key, page_size=100):
+    """
+    Generatore dei commenti di un ticket, nello stesso formato di get_ticket_comments.
+    La pagina successiva viene scaricata mentre si elabora quella corrente: in memoria
+    restano al massimo due pagine di commenti grezzi, indipendentemente dalla storia del ticket.
+    """
+    url = f"/rest/api/3/issue/{ticket_key}/comment"
+    params = {"orderBy": "created", "maxResults": page_size}
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        pending = pool.submit(jira.get, url, params={**params, "startAt": 0})
+        start_at = 0
+        while pending is not None:
+            resp = pending.result()
+            pending = None
+            if resp.status_code != 200:
+                # Il documento in costruzione viene scartato dal chiamante: niente report con commenti mancanti
+                raise requests.HTTPError(f"Commenti di {ticket_key} incompleti: {resp.status_code} {resp.text}",
+                                         response=resp)
+
+            data = resp.json()
+            del resp
+            page = data.get("comments", [])
+            start_at += len(page)
+            if page and start_at < data.get("total", start_at):
+                pending = pool.submit(jira.get, url, params={**params, "startAt": start_at})
+            del data
+
+            # Ogni commento grezzo viene rilasciato appena convertito
+            for i in range(len(page)):
+                raw, page[i] = page[i], None
+                yield _comment_from_raw(raw)
+
+# === Commenti successivi a quelli già presenti in un report (rigenerazione incrementale) ===
+def get_ticket_comments_since(ticket_key, count, last_id, page_size=100):
+    """
+    Commenti successivi ai primi `count` in ordine di creazione, nello stesso formato di get_ticket_comments.
+    Le pagine partono dal commento count-1, che deve essere ancora last_id: altrimenti la storia del
+    ticket è cambiata (commenti eliminati) e la funzione restituisce None.
+    Solleva requests.HTTPError se una pagina non è recuperabile.
+    """
+    url = f"/rest/api/3/issue/{ticket_key}/comment"
+    params = {"orderBy": "created", "maxResults": page_size}
+    start_at = count - 1
+    raw_comments = []
+
+    with span("fetch.comments", ticket=ticket_key, since=count):
+        while True:
+            resp = jira.get(url, params={**params, "startAt": start_at})
+            if resp.status_code != 200:
+                raise requests.HTTPError(f"Commenti di {ticket_key} non recuperati: {resp.status_code} {resp.text}",
+                                         response=resp)
+
+            data = resp.json()
+            page = data.get("comments", [])
+            if not raw_comments and (not page or str(page[0].get("id")) != str(last_id)):
+                return None
+
+            raw_comments.extend(page)
+            start_at += len(page)
+            if not page or start_at >= data.get("total", start_at):
+                break
+
+    return _comments_from_raw(raw_comments[1:])
+
+# === Caricamento di python-docx alla prima generazione di un documento ===
+# L'import di docx/lxml domina l'avvio dello script: chi non genera documenti (--help,
+# elenco ticket, errori di rete) non lo paga. Le funzioni di rendering usano i nomi globali.
+_docx_loaded = False
+
+def _load_docx():
+    global _docx_loaded, Document, DocxDocument, Paragraph, _Cell, WD_LINE_SPACING, WD_PARAGRAPH_ALIGNMENT
+    global OxmlElement, parse_xml, qn, nsdecls, Cm, Pt, RGBColor, Run
+    if _docx_loaded:
+        return
+    from docx import Document
+    from docx.document import Document as DocxDocument
+    from docx.text.paragraph import Paragraph
+    from docx.text.run import Run
+    from docx.table import _Cell
+    from docx.enum.text import WD_LINE_SPACING, WD_PARAGRAPH_ALIGNMENT
+    from docx.oxml import OxmlElement, parse_xml
+    from docx.oxml.ns import qn, nsdecls
+    from docx.shared import Cm, Pt, RGBColor
+    _docx_loaded = True
+
+# === Stili dei run: ogni combinazione di marks viene calcolata una sola volta ===
+# Chiave normalizzata dei marks (solo quelli che cambiano lo stile, nell'ordine dato) -> elemento
+# <w:rPr> già costruito, clonato sui run; None se i marks non producono alcuno stile.
+_run_styles = {}
+
+def _marks_key(marks):
+    key = []
+    for mark in marks:
+        mtype = mark.get("type")
+        attrs = mark.get("attrs", {})
+        match mtype:
+            case "strong" | "em" | "underline" | "strike" | "code":
+                key.append((mtype,))
+            case "subsup":
+                key.append((mtype, attrs.get("subscript"), attrs.get("superscript")))
+            case "color" | "textColor":
+                key.append(("color", attrs.get("color", "000000")))
+    return tuple(key)
+
+def _build_run_style(marks):
+    r = OxmlElement("w:r")
+    _apply_marks(Run(r, None), marks)
+    return r.rPr
+
 # === Funzione per applicare gli stili a un run di testo ===
 def apply_marks_to_run(run, marks: list):
+    if not marks:
+        return
+    key = _marks_key(marks)
+    if not key:
+        return
+    try:
+        rpr = _run_styles[key]
+    except KeyError:
+        rpr = _run_styles[key] = _build_run_style(marks)
+    if rpr is None:
+        return
+    if run._r.rPr is None:
+        run._r.insert(0, deepcopy(rpr))
+    else:
+        # Run con proprietà già impostate: i marks vengono applicati uno per uno
+        _apply_marks(run, marks)
+
+def _apply_marks(run, marks):
     for mark in marks:
         mtype = mark.get("type")
         attrs = mark.get("attrs", {})
@@ -189,115 +507,150 @@ def add_text(parent, text, marks=None):
     apply_marks_to_run(run, marks)
     return run
 
+# === Renderer DOCX dei nodi ADF (tabelle di smistamento per jira_adf.walk_adf) ===
+# Contesto dei blocchi: [parent, level], uno per ogni lista di nodi visitata.
+# Come nella versione ricorsiva, il livello di un heading vale anche per gli elenchi
+# successivi dello stesso blocco.
+
+def _docx_paragraph(node, ctx):
+    p = ctx[0].add_paragraph()
+    return node.get("content", ()), DOCX_INLINE_TABLE, [p, ctx[1]], None
+
+def _docx_heading(node, ctx):
+    ctx[1] = level = node.get("attrs", {}).get("level", 1)
+    if "content" in node:
+        heading_text = "".join(
+            [c.get("text", "") for c in node["content"] if c["type"] == "text"]
+        )
+        # dentro una cella (panel) il titolo non viene riportato
+        if not isinstance(ctx[0], _Cell):
+            ctx[0].add_heading(heading_text, level=level)
+
+def _docx_list(node, ctx):
+    return node.get("content", ()), DOCX_LIST_TABLE, ctx, None
+
+def _docx_list_item(li, ctx):
+    parent, level = ctx
+    # 1) Estrae tutto il testo dai paragraph interni
+    text_parts = []
+    for child in li.get("content", []):
+        if child.get("type") == "paragraph":
+            text_parts.append(get_text_from_content(child.get("content", [])))
+    raw_text = "\n".join([t for t in text_parts if t.strip()])
+    if raw_text:
+        add_bullet(parent, raw_text, level)
+    # 2) processa eventuali sotto-liste annidate al livello successivo
+    sublists = [child for child in li.get("content", []) if child.get("type") in LIST_TYPES]
+    if sublists:
+        return sublists, DOCX_TABLE, [parent, level + 1], None
+
+def _docx_code_block(node, ctx):
+    code_text = ""
+    for child in node.get("content", []):
+        if child["type"] == "text":
+            code_text += child.get("text", "") + "\n"
+    if code_text.strip():
+        p = ctx[0].add_paragraph()
+        run = add_text(p, code_text.rstrip(), marks=node.get("marks", []))
+        run.font.name = "Courier New"
+        run.font.size = Pt(9)
+
+def _docx_panel(node, ctx):
+    table = ctx[0].add_table(rows=1, cols=1)
+    cell = table.rows[0].cells[0]
+    add_info_panel(cell)
+    if "content" in node:
+        return node["content"], DOCX_TABLE, [cell, ctx[1]], None
+
+def _docx_text(node, ctx):
+    add_text(ctx[0], node.get("text", ""), node.get("marks", []))
+
+def _docx_hard_break(node, ctx):
+    parent = ctx[0]
+    if isinstance(parent, Paragraph):
+        parent.add_run().add_break()
+    else:
+        parent.add_paragraph("")
+
+def _docx_container(node, ctx):
+    if "content" in node:
+        return node["content"], DOCX_TABLE, [ctx[0], ctx[1]], None
+
+# Nodi in linea dentro un paragraph (contesto: [Paragraph, level]);
+# il contenuto di altri nodi in linea viene convertito come un blocco con il paragrafo come parent
+def _inline_text(node, ctx):
+    add_text(ctx[0], node.get("text", ""), marks=node.get("marks", []))
+
+def _inline_hard_break(node, ctx):
+    ctx[0].add_run().add_break()
+
+def _inline_container(node, ctx):
+    if "content" in node:
+        return node["content"], DOCX_TABLE, [ctx[0], ctx[1]], None
+
+DOCX_TABLE = {
+    "paragraph": _docx_paragraph,
+    "heading": _docx_heading,
+    "bulletList": _docx_list,
+    "orderedList": _docx_list,
+    "codeBlock": _docx_code_block,
+    "panel": _docx_panel,
+    "text": _docx_text,
+    "hardBreak": _docx_hard_break,
+    DEFAULT: _docx_container,
+}
+
+DOCX_LIST_TABLE = {
+    "listItem": _docx_list_item,
+}
+
+DOCX_INLINE_TABLE = {
+    "text": _inline_text,
+    "hardBreak": _inline_hard_break,
+    DEFAULT: _inline_container,
+}
+
 # === Funzione per generare il documento Word ===
 def parse_adf_to_docx(content, parent, level=1):
     """
     Converte il contenuto ADF (Atlassian Document Format) in paragrafi e run di Word.
-    Gestisce paragrafi, hardBreak, grassetto e corsivo.
+    Gestisce paragrafi, titoli, elenchi annidati, blocchi di codice, pannelli, hardBreak e stili del testo.
+    L'albero viene visitato in modo iterativo (jira_adf.walk_adf), senza limiti di profondità.
+    Nel corpo del documento ogni blocco di primo livello passa dalla cache dei frammenti
+    (jira_adf.FragmentCache): un blocco già convertito (es. pannello o firma ripetuti in molti
+    commenti) viene copiato dagli elementi OOXML memorizzati invece di essere ridisegnato.
     """
-    for node in content:
-        node_type = node.get("type")
-
-        match node_type:
-            case "paragraph":
-                p = parent.add_paragraph()
-                for child in node.get("content", []):
-                    child_type = child.get("type")
-                    match child_type:
-                        case "text":
-                            add_text(p, child.get("text", ""), marks=child.get("marks", []))
-                        case "hardBreak":
-                            p.add_run().add_break()
-                        case _ if "content" in child:
-                            parse_adf_to_docx(child["content"], p, level)
-
-            case "heading":
-                level = node.get("attrs", {}).get("level", 1)
-                if "content" in node:
-                    heading_text = "".join(
-                        [c.get("text", "") for c in node["content"] if c["type"] == "text"]
-                    )
-                    match type(parent).__name__:
-                        case "Document" | "Paragraph":
-                            parent.add_heading(heading_text, level=level)
-                        case "Cell":
-                            # dentro una cella, aggiungi paragrafo con stile heading
-                            p = parent.add_paragraph(heading_text, style=f"Heading {level}")
-
-            # case "bulletList" | "orderedList":
-            #     style = "List Bullet" if node_type == "bulletList" else "List Number"
-            #     for li in node.get("content", []):  # ogni listItem
-            #         if li.get("type") == "listItem":
-            #             for paragraph_node in li.get("content", []):
-            #                 if paragraph_node["type"] == "paragraph":
-            #                     p = parent.add_paragraph(style=style)
-            #                     for child in paragraph_node.get("content", []):
-            #                         child_type = child.get("type")
-            #                         match child_type:
-            #                             case "text":
-            #                                 add_text(p, child.get("text", ""), marks=child.get("marks", []))
-            #                             case "hardBreak":
-            #                                 p.add_run().add_break()
-            #                             case _ if "content" in child:
-            #                                 parse_adf_to_docx(child["content"], p, level)
-            #                 elif paragraph_node["type"] in ("bulletList", "orderedList"):
-            #                     # Gestione corretta delle liste annidate
-            #                     parse_adf_to_docx([paragraph_node], parent, level + 1)
-                                
-            case "bulletList" | "orderedList":
-                ordered = node_type == "orderedList"
-                for li in node.get("content", []):  # ogni listItem
-                    if li.get("type") == "listItem":
-                        # 1) Estrae tutto il testo dai paragraph interni
-                        text_parts = []
-                        for child in li.get("content", []):
-                            if child.get("type") == "paragraph":
-                                text_parts.append(get_text_from_content(child.get("content", [])))
-                        raw_text = "\n".join([t for t in text_parts if t.strip()])
-                        if raw_text:
-                            add_bullet(parent, raw_text, level)
-                        # 2) processa eventuali sotto-liste annidate
-                        for child in li.get("content", []):
-                            if child.get("type") in ("bulletList", "orderedList"):
-                                parse_adf_to_docx([child], parent, level + 1)
-                    
-            case "codeBlock":
-                code_text = ""
-                for child in node.get("content", []):
-                    if child["type"] == "text":
-                        code_text += child.get("text", "") + "\n"
-                if code_text.strip():
-                    p = parent.add_paragraph()
-                    run = add_text(p, code_text.rstrip(), marks=node.get("marks", []))
-                    run.font.name = "Courier New"
-                    run.font.size = Pt(9)
-
-            case "panel":
-                table = parent.add_table(rows=1, cols=1)
-                cell = table.rows[0].cells[0]
-                add_info_panel(cell)
-                if "content" in node:
-                    parse_adf_to_docx(node["content"], cell, level)
-
-            case "text":
-                text = node.get("text", "")
-                marks = node.get("marks", [])
-                add_text(parent, text, marks)
-
-            case "hardBreak":
-                if isinstance(parent, Paragraph):
-                    parent.add_run().add_break()
-                elif isinstance(parent, _Cell):
-                    parent.add_paragraph("")
-                else:
-                    parent.add_paragraph("")
-
-            case _ if "content" in node:
-                parse_adf_to_docx(node["content"], parent, level)
+    _load_docx()
+    render_cache = get_render_cache()
+    if render_cache is None or not isinstance(parent, DocxDocument):
+        walk_adf(content, DOCX_TABLE, [parent, level])
+        return
 
-            case _:
-                pass
-        # Se ci sono altri tipi di nodo, si possono aggiungere qui...
+    body = parent.element.body
+    for node in content:
+        # Il livello corrente fa parte della chiave: un heading lo cambia per i blocchi successivi
+        key, size = fragment_key("docx", level, node)
+        cached = render_cache.get(key)
+        if cached is not None:
+            elements, level = cached
+            for element in elements:
+                _append_to_body(body, deepcopy(element))
+            continue
+
+        before = len(body)
+        start = before - 1 if body.sectPr is not None else before
+        ctx = [parent, level]
+        walk_adf((node,), DOCX_TABLE, ctx)
+        level = ctx[1]
+        added = body[start:start + len(body) - before]
+        render_cache.put(key, ([deepcopy(element) for element in added], level), size)
+
+def _append_to_body(body, element):
+    # Come python-docx: i nuovi blocchi vanno prima delle proprietà di sezione finali
+    if body.sectPr is not None:
+        body.sectPr.addprevious(element)
+    else:
+        body.append(element)
 
 # === Funzione per aggiungere un pannello informativo con bordo e sfondo ===
 def add_info_panel(cell, bg_color="D9D9D9", border_size=4, border_color="000000"):
@@ -328,66 +681,49 @@ def add_info_panel(cell, bg_color="D9D9D9", border_size=4, border_color="000000"
     tcPr.set(qn('w:textDirection'), "btLr")
 
 # === Funzione per gestire elenchi puntati e numerati con indentazione manuale ===
+# Contesto degli elementi: (parent, level, style); contesto dei figli di un elemento: (parent, level, paragrafo)
+def _list_entry(li, ctx):
+    parent, level, style = ctx
+    # crea il paragrafo principale del bullet
+    p = parent.add_paragraph(style=style)
+    p.paragraph_format.left_indent = Cm(0.75 * (level - 1))
+    p.paragraph_format.first_line_indent = Cm(0)
+    return li.get("content", ()), LIST_ENTRY_TABLE, (parent, level, p), None
+
+def _list_entry_paragraph(child, ctx):
+    # testo annidato dentro paragraph: livello +1
+    return child.get("content", ()), DOCX_INLINE_TABLE, [ctx[2], ctx[1] + 1], None
+
+def _list_entry_sublist(child, ctx):
+    # sotto-elenco: livello +1
+    style = "List Number" if child.get("type") == "orderedList" else "List Bullet"
+    return child.get("content", ()), LIST_TABLE, (ctx[0], ctx[1] + 1, style), None
+
+LIST_TABLE = {
+    DEFAULT: _list_entry,
+}
+
+LIST_ENTRY_TABLE = {
+    "paragraph": _list_entry_paragraph,
+    "bulletList": _list_entry_sublist,
+    "orderedList": _list_entry_sublist,
+}
+
 def parse_list(node, parent, level=1, ordered=False):
     style = "List Number" if ordered else "List Bullet"
-    for li in node.get("content", []):
-        # crea il paragrafo principale del bullet
-        p = parent.add_paragraph(style=style)
-        p.paragraph_format.left_indent = Cm(0.75 * (level - 1))
-        p.paragraph_format.first_line_indent = Cm(0)
-
-        for child in li.get("content", []):
-            match child.get("type"):
-                case "paragraph":
-                    for sub in child.get("content", []):
-                        match sub.get("type"):
-                            case "text":
-                                add_text(p, sub.get("text", ""), marks=sub.get("marks", []))
-                            case "hardBreak":
-                                p.add_run().add_break()
-                            case _ if "content" in sub:
-                                # testo annidato dentro paragraph
-                                parse_adf_to_docx(sub["content"], p, level + 1)
-                case "bulletList":
-                    # sotto-elenco: livello +1
-                    parse_list(child, parent, level + 1, ordered=False)
-                case "orderedList":
-                    parse_list(child, parent, level + 1, ordered=True)
+    walk_adf(node.get("content", []), LIST_TABLE, (parent, level, style))
 
 # === Funzione per estrarre il testo da un contenuto ADF (rich text) ===
 def get_text_from_content(content_list):
-    texts = []
-    for c in content_list:
-        match c.get("type"):
-            case "text":
-                texts.append(c.get("text", ""))
-
-            case "paragraph":
-                if "content" in c:
-                    texts.append(get_text_from_content(c["content"]))
-                texts.append("\n")  # newline dopo ogni paragrafo
-
-            case "hardBreak":
-                texts.append("\n")
-
-            case "bulletList" | "orderedList":
-                for li in c.get("content", []):
-                    texts.append(get_text_from_content(li.get("content", [])))
-
-            case "listItem":
-                if "content" in c:
-                    texts.append(get_text_from_content(c["content"]))
-                texts.append("\n")  # newline dopo ogni listItem
-
-            case "panel":
-                if "content" in c:
-                    texts.append(get_text_from_content(c["content"]))
-
-            case _:
-                if "content" in c:
-                    texts.append(get_text_from_content(c["content"]))
-
-    return "".join(texts)
+    render_cache = get_render_cache()
+    if render_cache is None:
+        return adf_to_text(content_list)
+    key, size = fragment_key("text", content_list)
+    text = render_cache.get(key)
+    if text is None:
+        text = adf_to_text(content_list)
+        render_cache.put(key, text, size)
+    return text
 
 # === Estrazione commenti da issues del progetto ===
 def parse_rich_text(raw_field):
@@ -401,14 +737,81 @@ def parse_rich_text(raw_field):
 
 # === Recupero dettagli ticket ===
 def get_ticket_details(ticket_key):
-    url = f"{JIRA_URL}/rest/api/3/issue/{ticket_key}"
-    params = {"fields": f"summary, description, {CAMPO_RIFERIMENTI}, {CAMPO_AMBIENTE}, project"}
-    resp = requests.get(url, headers=HEADERS, params=params, auth=AUTH)
-    if resp.status_code != 200:
-        return None
-    
-    fields = resp.json()["fields"]
-    
+    with span("fetch.details", ticket=ticket_key):
+        return _get_ticket_details(ticket_key)
+
+def _get_ticket_details(ticket_key):
+    fields = None
+    cached = cache.lookup(ticket_key, "details") if cache else None
+    if cached and get_issue_updated(ticket_key) == cached[1]:
+        fields = cached[0]
+
+    if fields is None:
+        url = f"/rest/api/3/issue/{ticket_key}"
+        params = {"fields": CAMPI_DETTAGLI}
+        resp = jira.get(url, params=params)
+        if resp.status_code != 200:
+            return None
+
+        fields = resp.json()["fields"]
+        updated = fields.get("updated")
+        _remember_updated(ticket_key, updated)
+        if cache and updated:
+            cache.put(ticket_key, "details", fields, updated)
+
+    return _details_from_fields(fields)
+
+# === Recupero dettagli di più ticket con ricerche `key in (...)` ===
+def get_ticket_details_bulk(ticket_keys, chunk_size=BULK_CHUNK, max_workers=BATCH_WORKERS):
+    """
+    Dettagli di più ticket con una ricerca ogni chunk_size chiavi (ricerche in parallelo),
+    invece di una richiesta per ticket. Restituisce {chiave: tupla di get_ticket_details}.
+    I ticket non restituiti dalla ricerca (chiave inesistente o spostata, chunk rifiutato da Jira con 400)
+    vengono recuperati singolarmente con get_ticket_details; se non esistono non compaiono.
+    Gli altri errori della ricerca sollevano requests.HTTPError.
+    """
+    ticket_keys = list(dict.fromkeys(ticket_keys))
+    chunks = [ticket_keys[i:i + chunk_size] for i in range(0, len(ticket_keys), chunk_size)]
+    details = {}
+    if not chunks:
+        return details
+
+    with span("fetch.details_bulk", tickets=len(ticket_keys)):
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(chunks)))) as pool:
+            for issues in pool.map(lambda keys: _search_chunk(keys, CAMPI_DETTAGLI), chunks):
+                for issue in issues:
+                    fields = issue.get("fields", {})
+                    updated = fields.get("updated")
+                    _remember_updated(issue["key"], updated)
+                    if cache and updated:
+                        cache.put(issue["key"], "details", fields, updated)
+                    details[issue["key"]] = _details_from_fields(fields)
+
+    for key in ticket_keys:
+        if key not in details:
+            found = get_ticket_details(key)
+            if found:
+                details[key] = found
+    return details
+
+# === Ricerca `key in (...)` di un gruppo di ticket (dettagli o commenti) ===
+def _search_chunk(keys, fields):
+    jql = f"key in ({', '.join(keys)})"
+    issues = []
+    try:
+        for page in jira.iter_pages(SEARCH_JQL_PATH, {"jql": jql, "fields": fields}, page_size=len(keys)):
+            issues.extend(page)
+    except requests.HTTPError as e:
+        # Solo 400 (JQL rifiutata, es. chiave inesistente): i ticket del chunk vengono recuperati uno per uno.
+        # Gli altri errori (401, 403, 5xx dopo i tentativi) valgono per tutti i ticket e vengono propagati
+        if e.response is None or e.response.status_code != 400:
+            raise
+        print(f"Ricerca di {len(keys)} ticket non riuscita ({e.response.status_code}), recupero singolo")
+        return []
+    return issues
+
+# === Conversione dei campi Jira nella tupla dei dettagli ticket ===
+def _details_from_fields(fields):
     summary = fields.get("summary", "")
     description = fields.get("description", {})
     riferimenti = parse_rich_text(fields.get(CAMPO_RIFERIMENTI, {}))
@@ -453,7 +856,29 @@ def add_bullet(doc, text, level=1):
 # === Sostituire il case "bulletList" | "orderedList" in parse_adf_to_docx ===
 
 # === Creazione documento Word ===
-def create_word_document(ticket_key, summary, description_adf, riferimenti, ambiente, comments, cliente):
+def create_word_document(ticket_key, summary, description_adf, riferimenti, ambiente, comments, cliente, output_dir="",
+                         backend=None):
+    filename = os.path.join(output_dir, f"{ticket_key}_report.docx")
+    if (backend or DOCX_BACKEND) == "ooxml":
+        # word/document.xml scritto direttamente nel file: rendering e salvataggio sono un'unica fase
+        with span("render", ticket=ticket_key, backend="ooxml"):
+            write_word_document_ooxml(filename, ticket_key, summary, description_adf, riferimenti, ambiente,
+                                      comments, cliente)
+        print(f"Documento salvato: {filename}")
+        return filename
+
+    with span("render", ticket=ticket_key):
+        doc = build_word_document(ticket_key, summary, description_adf, riferimenti, ambiente, comments, cliente)
+
+    # Salvataggio file
+    with span("save", ticket=ticket_key):
+        doc.save(filename)
+    print(f"Documento salvato: {filename}")
+    return filename
+
+# === Documento vuoto con margini e stile di base del report ===
+def _new_document():
+    _load_docx()
     doc = Document()
 
     # Imposta margini pagina
@@ -478,6 +903,11 @@ def create_word_document(ticket_key, summary, description_adf, riferimenti, ambi
     paragraph_format.space_before = Pt(0)
     paragraph_format.space_after = Pt(0)
     paragraph_format.alignment = WD_PARAGRAPH_ALIGNMENT.LEFT
+    return doc
+
+# === Costruzione del documento Word in memoria (senza salvataggio) ===
+def build_word_document(ticket_key, summary, description_adf, riferimenti, ambiente, comments, cliente):
+    doc = _new_document()
 
     # Intestazione
     doc.add_heading(f"{cliente} - {ticket_key}", level=0)
@@ -503,41 +933,874 @@ def create_word_document(ticket_key, summary, description_adf, riferimenti, ambi
     # Descrizione dettagliata
     doc.add_heading("Descrizione dettagliata", level=1)
     if isinstance(description_adf, dict) and "content" in description_adf:
-        parse_adf_to_docx(description_adf["content"], doc)
+        with span("parse_adf", part="description"):
+            parse_adf_to_docx(description_adf["content"], doc)
     elif isinstance(description_adf, str):
         doc.add_paragraph(description_adf.strip())
     else:
         doc.add_paragraph("(Nessuna descrizione fornita)")
 
     # Elenco Commenti
+    # comments può essere una lista o un generatore (iter_ticket_comments): ogni commento
+    # viene scritto nel documento appena disponibile
     doc.add_heading("Commenti del Progetto", level=1)
-    if comments:
-        for c in comments:
-            header = f"[{c['created'].strftime('%d-%m-%Y %H:%M')}] {c['author']}"
-            p = doc.add_paragraph()
-            # run = p.add_run(header)
-            run = add_text(p, header, marks=[{"type": "strong"}])
-            run.bold = True
-
-            body = c["body"]
-            if isinstance(body, dict) and "content" in body:
+    rendered = 0
+    for c in comments:
+        header = f"[{c['created'].strftime('%d-%m-%Y %H:%M')}] {c['author']}"
+        p = doc.add_paragraph()
+        # run = p.add_run(header)
+        run = add_text(p, header, marks=[{"type": "strong"}])
+        run.bold = True
+
+        body = c["body"]
+        if isinstance(body, dict) and "content" in body:
+            with span("parse_adf", part="comment"):
                 parse_adf_to_docx(body["content"], doc)
-            elif isinstance(body, str):
-                add_multiline_text(doc, body.strip())
-            else:
-                doc.add_paragraph("—")
+        elif isinstance(body, str):
+            add_multiline_text(doc, body.strip())
+        else:
+            doc.add_paragraph("—")
 
-            doc.add_paragraph("")  # spazio tra commenti
-    else:
+        doc.add_paragraph("")  # spazio tra commenti
+        rendered += 1
+
+    if not rendered:
         doc.add_paragraph("(Nessun commento)")
 
-    # Salvataggio file
-    filename = f"{ticket_key}_report.docx"
-    doc.save(filename)
-    print(f"Documento salvato: {filename}")
+    return doc
+
+# === Backend OOXML diretto: word/document.xml scritto come testo nel file .docx (jira_ooxml.py) ===
+# Stessa struttura e stessi stili di build_word_document, senza oggetti python-docx per paragrafi e run.
+# I frammenti che dipendono da python-docx (rPr per combinazione di marks, pPr di titoli ed elenchi,
+# tabella del pannello, modello .docx con margini e stile Normal) vengono calcolati una sola volta
+# con python-docx stesso e poi riusati come testo.
+class _OoxmlFragments:
+    def __init__(self):
+        scratch = _new_document()
+        buffer = BytesIO()
+        scratch.save(buffer)
+        self.template = buffer.getvalue()
+
+        # Modello del report consolidato: Word aggiorna i campi (sommario) all'apertura
+        update = OxmlElement("w:updateFields")
+        update.set(qn("w:val"), "true")
+        scratch.settings.element.insert_element_before(
+            update, "w:hdrShapeDefaults", "w:footnotePr", "w:endnotePr", "w:compat", "w:docVars", "w:rsids")
+        buffer = BytesIO()
+        scratch.save(buffer)
+        self.consolidated_template = buffer.getvalue()
+
+        self._scratch = scratch
+        self._lock = threading.Lock()
+        self._rpr = {}
+        self._heading_ppr = {}
+        self._bullet_ppr = {}
+
+        # Pannello nel corpo del documento e dentro una cella (python-docx aggiunge un paragrafo
+        # vuoto dopo una tabella annidata); il contenuto va prima di </w:tc>
+        table = scratch.add_table(rows=1, cols=1)
+        add_info_panel(table.rows[0].cells[0])
+        xml = element_xml(table._tbl)
+        cut = xml.rindex("</w:tc>")
+        self.panel = (xml[:cut], xml[cut:])
+
+        inner = table.rows[0].cells[0].add_table(rows=1, cols=1)
+        add_info_panel(inner.rows[0].cells[0])
+        xml = element_xml(inner._tbl)
+        cut = xml.rindex("</w:tc>")
+        self.panel_in_cell = (xml[:cut], xml[cut:] + "<w:p/>")
+
+    def rpr(self, marks, code=False):
+        """<w:rPr> di un run con questi marks (code=True: blocco di codice, Courier New 9)."""
+        if not marks and not code:
+            return ""
+        # Stessa chiave di _run_styles: i marks senza effetto sullo stile (es. link e href) non la cambiano
+        key = (_marks_key(marks), code)
+        found = self._rpr.get(key)
+        if found is None:
+            # Run isolato, fuori da qualsiasi documento
+            run = Run(OxmlElement("w:r"), None)
+            apply_marks_to_run(run, marks)
+            if code:
+                run.font.name = "Courier New"
+                run.font.size = Pt(9)
+            rpr = run._r.rPr
+            found = self._rpr[key] = element_xml(rpr) if rpr is not None else ""
+        return found
+
+    def heading_ppr(self, level):
+        found = self._heading_ppr.get(level)
+        if found is None:
+            with self._lock:
+                found = self._heading_ppr[level] = element_xml(self._scratch.add_heading("", level=level)._p.pPr)
+        return found
+
+    def bullet_ppr(self, level):
+        """pPr della prima riga di un bullet al livello indicato (le righe successive usano level + 1)."""
+        found = self._bullet_ppr.get(level)
+        if found is None:
+            with self._lock:
+                pf = self._scratch.add_paragraph().paragraph_format
+                pf.left_indent = Cm(0.75 * (level - 1))
+                pf.first_line_indent = Cm(0)
+                pf.space_after = Pt(2)
+                found = self._bullet_ppr[level] = element_xml(pf._element.pPr)
+        return found
+
+_ooxml = None
+_ooxml_lock = threading.Lock()
+
+def _ooxml_fragments():
+    global _ooxml
+    with _ooxml_lock:
+        if _ooxml is None:
+            _load_docx()
+            _ooxml = _OoxmlFragments()
+        return _ooxml
+
+class _XmlBuffer(list):
+    # Destinazione dei frammenti di un blocco da memorizzare nella cache dei frammenti
+    write = list.append
+
+def _xml_text_paragraph(text, ppr=""):
+    # Come add_paragraph(text): nessun run se il testo è vuoto
+    return paragraph_xml(run_xml(text) if text else "", ppr)
+
+def _xml_heading(out, text, level):
+    out.write(_xml_text_paragraph(text, _ooxml.heading_ppr(level)))
+
+def _xml_multiline_text(out, text):
+    # Come add_multiline_text
+    if not text:
+        return
+    for line in text.splitlines():
+        out.write(_xml_text_paragraph(line.strip()))
+
+def _xml_bullet(out, text, level=1):
+    # Come add_bullet
+    if not text:
+        return
+    lines = text.splitlines()
+    first_line = lines[0] if lines else ""
+    out.write(paragraph_xml(run_xml("• " + first_line), _ooxml.bullet_ppr(level)))
+    for extra_line in lines[1:]:
+        # p2.add_run(extra_line): il run c'è anche se la riga è vuota
+        out.write(paragraph_xml(run_xml(extra_line), _ooxml.bullet_ppr(level + 1)))
+
+# Contesto dei blocchi: [out, level, in_cell]; contesto in linea: lista dei run del paragrafo
+def _xml_paragraph(node, ctx):
+    out, runs = ctx[0], []
+    return node.get("content", ()), OOXML_INLINE_TABLE, runs, lambda: out.write(paragraph_xml("".join(runs)))
+
+def _xml_heading_node(node, ctx):
+    ctx[1] = level = node.get("attrs", {}).get("level", 1)
+    if "content" in node:
+        heading_text = "".join(
+            [c.get("text", "") for c in node["content"] if c["type"] == "text"]
+        )
+        # dentro una cella (panel) il titolo non viene riportato
+        if not ctx[2]:
+            _xml_heading(ctx[0], heading_text, level)
+
+def _xml_list(node, ctx):
+    return node.get("content", ()), OOXML_LIST_TABLE, ctx, None
+
+def _xml_list_item(li, ctx):
+    out, level, in_cell = ctx
+    text_parts = []
+    for child in li.get("content", []):
+        if child.get("type") == "paragraph":
+            text_parts.append(get_text_from_content(child.get("content", [])))
+    raw_text = "\n".join([t for t in text_parts if t.strip()])
+    if raw_text:
+        _xml_bullet(out, raw_text, level)
+    sublists = [child for child in li.get("content", []) if child.get("type") in LIST_TYPES]
+    if sublists:
+        return sublists, OOXML_TABLE, [out, level + 1, in_cell], None
+
+def _xml_code_block(node, ctx):
+    code_text = ""
+    for child in node.get("content", []):
+        if child["type"] == "text":
+            code_text += child.get("text", "") + "\n"
+    if code_text.strip():
+        ctx[0].write(paragraph_xml(run_xml(code_text.rstrip(), _ooxml.rpr(node.get("marks", []), code=True))))
+
+def _xml_panel(node, ctx):
+    out = ctx[0]
+    start, end = _ooxml.panel_in_cell if ctx[2] else _ooxml.panel
+    out.write(start)
+    if "content" in node:
+        return node["content"], OOXML_TABLE, [out, ctx[1], True], lambda: out.write(end)
+    out.write(end)
+
+def _xml_text(node, ctx):
+    text = node.get("text", "")
+    if text:
+        ctx[0].write(paragraph_xml(run_xml(text, _ooxml.rpr(node.get("marks", [])))))
+
+def _xml_hard_break(node, ctx):
+    ctx[0].write("<w:p/>")
+
+def _xml_container(node, ctx):
+    if "content" in node:
+        return node["content"], OOXML_TABLE, [ctx[0], ctx[1], ctx[2]], None
+
+def _xml_inline_text(node, runs):
+    text = node.get("text", "")
+    if text:
+        runs.append(run_xml(text, _ooxml.rpr(node.get("marks", []))))
+
+def _xml_inline_hard_break(node, runs):
+    runs.append("<w:r><w:br/></w:r>")
+
+def _xml_inline_container(node, runs):
+    # Come _inline_container: il contenuto è smistato come un blocco con il paragrafo come parent
+    if "content" in node:
+        return node["content"], OOXML_IN_PARAGRAPH_TABLE, runs, None
+
+# Blocchi con un paragrafo come parent (ADF non valido: un paragraph contiene solo nodi in linea).
+# Testo e a capo diventano run del paragrafo come nel backend python-docx; i blocchi che python-docx
+# non può inserire in un paragrafo (paragraph, heading, codeBlock, panel, voci di elenco con testo)
+# vengono ignorati, mentre le sotto-liste delle voci sono visitate come in _docx_list_item
+def _xml_block_in_paragraph(node, runs):
+    pass
+
+def _xml_list_in_paragraph(node, runs):
+    return node.get("content", ()), OOXML_IN_PARAGRAPH_LIST_TABLE, runs, None
+
+def _xml_list_item_in_paragraph(li, runs):
+    sublists = [child for child in li.get("content", []) if child.get("type") in LIST_TYPES]
+    if sublists:
+        return sublists, OOXML_IN_PARAGRAPH_TABLE, runs, None
+
+OOXML_TABLE = {
+    "paragraph": _xml_paragraph,
+    "heading": _xml_heading_node,
+    "bulletList": _xml_list,
+    "orderedList": _xml_list,
+    "codeBlock": _xml_code_block,
+    "panel": _xml_panel,
+    "text": _xml_text,
+    "hardBreak": _xml_hard_break,
+    DEFAULT: _xml_container,
+}
+
+OOXML_LIST_TABLE = {
+    "listItem": _xml_list_item,
+}
+
+OOXML_INLINE_TABLE = {
+    "text": _xml_inline_text,
+    "hardBreak": _xml_inline_hard_break,
+    DEFAULT: _xml_inline_container,
+}
+
+OOXML_IN_PARAGRAPH_TABLE = {
+    "paragraph": _xml_block_in_paragraph,
+    "heading": _xml_block_in_paragraph,
+    "bulletList": _xml_list_in_paragraph,
+    "orderedList": _xml_list_in_paragraph,
+    "codeBlock": _xml_block_in_paragraph,
+    "panel": _xml_block_in_paragraph,
+    "text": _xml_inline_text,
+    "hardBreak": _xml_inline_hard_break,
+    DEFAULT: _xml_inline_container,
+}
+
+OOXML_IN_PARAGRAPH_LIST_TABLE = {
+    "listItem": _xml_list_item_in_paragraph,
+}
+
+def write_adf_ooxml(content, out, level=1):
+    """Come parse_adf_to_docx nel corpo del documento, scrivendo l'XML in out (DocxStreamWriter)."""
+    render_cache = get_render_cache()
+    if render_cache is None:
+        walk_adf(content, OOXML_TABLE, [out, level, False])
+        return
+
+    for node in content:
+        key, size = fragment_key("ooxml", level, node)
+        cached = render_cache.get(key)
+        if cached is None:
+            buffer = _XmlBuffer()
+            ctx = [buffer, level, False]
+            walk_adf((node,), OOXML_TABLE, ctx)
+            cached = ("".join(buffer), ctx[1])
+            render_cache.put(key, cached, size)
+        xml, level = cached
+        out.write(xml)
+
+def write_word_document_ooxml(filename, ticket_key, summary, description_adf, riferimenti, ambiente, comments, cliente):
+    """Scrive il report in `filename` con lo stesso contenuto e gli stessi stili di build_word_document."""
+    _ooxml_fragments()
+    with DocxStreamWriter(filename, _ooxml.template) as out:
+        # Intestazione
+        _xml_heading(out, f"{cliente} - {ticket_key}", 0)
+        write_report_body_ooxml(out, summary, description_adf, riferimenti, ambiente, comments)
+
+def write_report_body_ooxml(out, summary, description_adf, riferimenti, ambiente, comments):
+    """Contenuto del report dopo l'intestazione (anche le sezioni del report consolidato)."""
+    # Descrizione breve
+    _xml_heading(out, "Descrizione", 1)
+    out.write(_xml_text_paragraph(summary or "-"))
+
+    # Riferimenti
+    _xml_heading(out, "Riferimenti delle persone del cliente", 1)
+    if isinstance(riferimenti, list):
+        for ref in riferimenti:
+            _xml_bullet(out, ref)
+    elif isinstance(riferimenti, str):
+        _xml_multiline_text(out, riferimenti.strip())
+    else:
+        out.write(_xml_text_paragraph("-"))
+
+    # Ambiente
+    _xml_heading(out, "Informazioni sull'Ambiente", 1)
+    _xml_multiline_text(out, ambiente)
+
+    # Descrizione dettagliata
+    _xml_heading(out, "Descrizione dettagliata", 1)
+    if isinstance(description_adf, dict) and "content" in description_adf:
+        with span("parse_adf", part="description"):
+            write_adf_ooxml(description_adf["content"], out)
+    elif isinstance(description_adf, str):
+        out.write(_xml_text_paragraph(description_adf.strip()))
+    else:
+        out.write(_xml_text_paragraph("(Nessuna descrizione fornita)"))
+
+    # Elenco Commenti
+    _xml_heading(out, "Commenti del Progetto", 1)
+    if not write_comments_ooxml(out, comments):
+        out.write(_xml_text_paragraph("(Nessun commento)"))
+
+def write_comments_ooxml(out, comments):
+    """Scrive i commenti (intestazione, corpo, riga vuota); restituisce quanti ne sono stati scritti."""
+    header_rpr = _ooxml.rpr([{"type": "strong"}])
+    rendered = 0
+    for c in comments:
+        header = f"[{c['created'].strftime('%d-%m-%Y %H:%M')}] {c['author']}"
+        out.write(paragraph_xml(run_xml(header, header_rpr)))
+
+        body = c["body"]
+        if isinstance(body, dict) and "content" in body:
+            with span("parse_adf", part="comment"):
+                write_adf_ooxml(body["content"], out)
+        elif isinstance(body, str):
+            _xml_multiline_text(out, body.strip())
+        else:
+            out.write(_xml_text_paragraph("—"))
+
+        out.write("<w:p/>")  # spazio tra commenti
+        rendered += 1
+    return rendered
+
+# === Report consolidato: sommario in testa e una sezione per ticket in un unico .docx ===
+# Il sommario è un campo TOC sui paragrafi in stile Title (le intestazioni dei ticket, livello 0):
+# i titoli interni ai report (Heading 1, titoli ADF) non vi compaiono. Il file viene scritto in
+# streaming con DocxStreamWriter, quindi le voci non sono note quando il campo viene scritto:
+# il modello chiede a Word di aggiornare i campi all'apertura (updateFields).
+TOC_INSTRUCTION     = ' TOC \\h \\z \\t "Title,1" '
+TOC_PLACEHOLDER     = "Sommario da aggiornare: aprire il documento in Word e confermare l'aggiornamento dei campi (F9)."
+PAGE_BREAK_XML      = '<w:p><w:r><w:br w:type="page"/></w:r></w:p>'
+
+def ticket_bookmark(ticket_key):
+    """Nome del segnalibro della sezione di un ticket (DNT-3 -> DNT_3: Word non ammette trattini)."""
+    return re.sub(r"\W", "_", ticket_key)
+
+class ConsolidatedReport:
+    """
+    Un unico documento Word per più ticket: sommario iniziale e, per ogni ticket, una sezione con lo
+    stesso contenuto di create_word_document, che inizia su una nuova pagina con il titolo
+    del ticket racchiuso in un segnalibro (ticket_bookmark).
+    Le sezioni vengono aggiunte nell'ordine in cui sono pronte e scritte subito nel file: in memoria
+    resta solo la sezione corrente, mai un Document per ticket.
+    Il file viene scritto in filename + ".tmp" e sostituisce il report precedente solo in close():
+    con abort() il report consolidato già esistente resta invariato.
+    """
+
+    def __init__(self, filename):
+        _ooxml_fragments()
+        self.filename = filename
+        self.sections = []
+        self._out = DocxStreamWriter(filename, _ooxml.consolidated_template)
+        _xml_heading(self._out, "Sommario", 1)
+        self._out.write(
+            '<w:p><w:r><w:fldChar w:fldCharType="begin" w:dirty="true"/></w:r>'
+            f'<w:r><w:instrText xml:space="preserve">{TOC_INSTRUCTION}</w:instrText></w:r>'
+            '<w:r><w:fldChar w:fldCharType="separate"/></w:r>'
+            f'{run_xml(TOC_PLACEHOLDER)}'
+            '<w:r><w:fldChar w:fldCharType="end"/></w:r></w:p>'
+        )
+
+    def _start_section(self, ticket_key, cliente):
+        bookmark_id = len(self.sections)
+        self.sections.append(ticket_key)
+        self._out.write(PAGE_BREAK_XML)
+        self._out.write(paragraph_xml(
+            f'<w:bookmarkStart w:id="{bookmark_id}" w:name="{ticket_bookmark(ticket_key)}"/>'
+            f'{run_xml(f"{cliente} - {ticket_key}")}'
+            f'<w:bookmarkEnd w:id="{bookmark_id}"/>',
+            _ooxml.heading_ppr(0),
+        ))
+
+    def add_section(self, ticket_key, summary, description_adf, riferimenti, ambiente, comments, cliente):
+        """Scrive la sezione di un ticket (stessi argomenti di create_word_document)."""
+        # La sezione viene generata a parte e scritta tutta insieme solo se completa:
+        # un errore a metà rendering non lascia nel documento XML troncato
+        with span("render", ticket=ticket_key, backend="ooxml", consolidated=True):
+            body_xml = render_report_body_ooxml(summary, description_adf, riferimenti, ambiente, comments)
+        self.append_section(ticket_key, cliente, body_xml)
+
+    def append_section(self, ticket_key, cliente, body_xml):
+        """Aggiunge una sezione il cui contenuto è già stato generato (render_report_body_ooxml)."""
+        self._start_section(ticket_key, cliente)
+        self._out.write(body_xml)
+        print(f"Sezione aggiunta: {ticket_key}")
+
+    def close(self):
+        self._out.close()
+        print(f"Documento salvato: {self.filename} ({len(self.sections)} ticket)")
+        return self.filename
+
+    def abort(self):
+        self._out.abort()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+def render_report_body_ooxml(summary, description_adf, riferimenti, ambiente, comments):
+    """XML del contenuto di una sezione (per i processi del RenderPool)."""
+    _ooxml_fragments()
+    buffer = _XmlBuffer()
+    write_report_body_ooxml(buffer, summary, description_adf, riferimenti, ambiente, comments)
+    return "".join(buffer)
+
+# === Lettura dei codici ticket da un elenco attività (es. elenco_attivita.txt) ===
+def read_ticket_keys(filename):
+    keys = []
+    with open(filename, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            m = RE_TICKET_KEY.match(line)
+            if m:
+                keys.append(m.group(1))
+    return keys
+
+# === Report di un ticket (dettagli e commenti completi, poi documento) ===
+def generate_report(ticket_key, output_dir=""):
+    details = get_ticket_details(ticket_key)
+    if not details:
+        print(f"Errore nel recupero ticket {ticket_key}.")
+        return False
+
+    summary, description_adf, riferimenti, ambiente, cliente = details
+    create_word_document(ticket_key, summary, description_adf, riferimenti, ambiente,
+                         get_ticket_comments(ticket_key), cliente, output_dir)
+    return True
+
+# === Report di un ticket con i commenti scritti man mano che arrivano da Jira ===
+# Sempre con il backend OOXML, indipendentemente da --backend: python-docx costruirebbe comunque in
+# memoria l'albero dell'intero documento, mentre DocxStreamWriter scrive ogni pagina di commenti nel file.
+def generate_report_streaming(ticket_key, output_dir="", details=None):
+    details = details or get_ticket_details(ticket_key)
+    if not details:
+        print(f"Errore nel recupero ticket {ticket_key}.")
+        return False
+
+    summary, description_adf, riferimenti, ambiente, cliente = details
+    create_word_document(ticket_key, summary, description_adf, riferimenti, ambiente,
+                         iter_ticket_comments(ticket_key), cliente, output_dir, backend="ooxml")
+    return True
+
+# === Rigenerazione incrementale: manifest accanto al report ===
+# <KEY>_report.manifest.json registra lo stato del ticket al momento dell'ultima scrittura del report:
+# hash di intestazione, descrizione, riferimenti e ambiente, numero di commenti, id e data dell'ultimo
+# commento, dimensione e data di modifica del .docx. Se nulla di questo è cambiato, i commenti nuovi
+# vengono scritti in fondo al documento esistente (DocxAppendWriter) senza rigenerare il resto.
+# Le modifiche a commenti già presenti nel report non vengono rilevate: per rigenerare da zero
+# basta eliminare il manifest.
+def manifest_path(filename):
+    return os.path.splitext(filename)[0] + ".manifest.json"
+
+def details_hash(ticket_key, details):
+    return fragment_key("details", ticket_key, list(details))[0].hex()
+
+def read_manifest(filename):
+    """Manifest del report, oppure None se assente, illeggibile o non più corrispondente al .docx."""
+    try:
+        with open(manifest_path(filename), encoding="utf-8") as f:
+            manifest = json.load(f)
+        stat = os.stat(filename)
+    except (OSError, ValueError):
+        return None
+    if (manifest.get("version") != MANIFEST_VERSION or manifest.get("size") != stat.st_size
+            or manifest.get("mtime_ns") != stat.st_mtime_ns):
+        return None
+    return manifest
+
+def write_manifest(filename, ticket_key, digest, count, last_comment):
+    stat = os.stat(filename)
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "ticket": ticket_key,
+        "details": digest,
+        "comments": count,
+        "last_comment_id": last_comment["id"] if last_comment else None,
+        "last_comment_created": last_comment["created"].isoformat() if last_comment else None,
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+    }
+    path = manifest_path(filename)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(path + ".tmp", path)
+
+def append_comments_to_report(filename, comments):
+    """Aggiunge i commenti in fondo a un report esistente (stesso XML dei due backend)."""
+    _ooxml_fragments()
+    with span("render", part="append"), DocxAppendWriter(filename) as out:
+        return write_comments_ooxml(out, comments)
+
+def generate_report_incremental(ticket_key, output_dir="", details=None):
+    """
+    Come generate_report, ma se il report esiste e il manifest è valido vengono scaricati e aggiunti
+    solo i commenti nuovi: il costo dipende dall'attività recente, non dalla storia del ticket.
+    Il report viene rigenerato da zero se intestazione, descrizione, riferimenti o ambiente sono
+    cambiati, se l'ultimo commento registrato non è più al suo posto o se il report non aveva commenti.
+    """
+    details = details or get_ticket_details(ticket_key)
+    if not details:
+        print(f"Errore nel recupero ticket {ticket_key}.")
+        return False
+
+    filename = os.path.join(output_dir, f"{ticket_key}_report.docx")
+    digest = details_hash(ticket_key, details)
+    manifest = read_manifest(filename)
+    if manifest and manifest["details"] == digest and manifest["comments"] > 0:
+        comments = get_ticket_comments_since(ticket_key, manifest["comments"], manifest["last_comment_id"])
+        if comments is not None:
+            if not comments:
+                print(f"Documento già aggiornato: {filename}")
+                return True
+            append_comments_to_report(filename, comments)
+            write_manifest(filename, ticket_key, digest, manifest["comments"] + len(comments), comments[-1])
+            print(f"Documento aggiornato: {filename} ({len(comments)} commenti nuovi)")
+            return True
+
+    summary, description_adf, riferimenti, ambiente, cliente = details
+    comments = get_ticket_comments(ticket_key)
+    create_word_document(ticket_key, summary, description_adf, riferimenti, ambiente, comments, cliente, output_dir)
+    write_manifest(filename, ticket_key, digest, len(comments), comments[-1] if comments else None)
+    return True
+
+# === Pool di processi per la generazione dei documenti ===
+class RenderPool:
+    """
+    Genera i documenti Word in processi separati. Il processo principale recupera i dati da Jira e
+    passa a ogni worker un payload compatto (dettagli e commenti del ticket serializzati con pickle);
+    il worker esegue create_word_document e scrive il file. Con report (ConsolidatedReport) il worker
+    restituisce invece l'XML della sezione, che viene aggiunta al report appena pronta.
+    La somma dei payload in volo (in coda o in rendering) resta entro memory_mb: submit attende
+    la fine di un rendering prima di accodarne un altro (un payload più grande del limite passa da solo).
+    """
+
+    def __init__(self, processes, memory_mb=None, backend=None, output_dir="", report=None):
+        self.budget = (memory_mb if memory_mb is not None else RENDER_MEMORY_MB) * 1024 * 1024
+        self.backend = backend or DOCX_BACKEND
+        self.output_dir = output_dir
+        self.report = report
+        self.in_flight_bytes = 0
+        self.failed = []
+        self._in_flight = {}   # future -> (chiave, dimensione del payload, cliente)
+        self._pool = ProcessPoolExecutor(max_workers=max(1, processes))
+
+    def submit(self, ticket_key, details, comments):
+        payload = pickle.dumps((ticket_key, details, list(comments), self.output_dir, self.backend),
+                               protocol=pickle.HIGHEST_PROTOCOL)
+        while self._in_flight and self.in_flight_bytes + len(payload) > self.budget:
+            self._collect(wait(self._in_flight, return_when=FIRST_COMPLETED).done)
+
+        fut = self._pool.submit(_render_section_payload if self.report else _render_payload, payload)
+        self._in_flight[fut] = (ticket_key, len(payload), details[4])
+        self.in_flight_bytes += len(payload)
+        self._collect([f for f in self._in_flight if f.done()])
+
+    def _collect(self, done):
+        for fut in done:
+            ticket_key, size, cliente = self._in_flight.pop(fut)
+            self.in_flight_bytes -= size
+            try:
+                result = fut.result()
+                if self.report:
+                    self.report.append_section(ticket_key, cliente, result)
+            except Exception as e:
+                print(f"Errore nella generazione del report {ticket_key}: {e}")
+                self.failed.append(ticket_key)
+
+    def close(self):
+        """Attende i rendering in corso e restituisce i ticket il cui documento non è stato generato."""
+        self._collect(wait(self._in_flight).done)
+        self._pool.shutdown()
+        return self.failed
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def _render_payload(payload):
+    # Eseguita nei processi del pool
+    ticket_key, details, comments, output_dir, backend = pickle.loads(payload)
+    summary, description_adf, riferimenti, ambiente, cliente = details
+    return create_word_document(ticket_key, summary, description_adf, riferimenti, ambiente, comments, cliente,
+                                output_dir, backend=backend)
+
+def _render_section_payload(payload):
+    # Eseguita nei processi del pool (report consolidato)
+    ticket_key, details, comments, output_dir, backend = pickle.loads(payload)
+    summary, description_adf, riferimenti, ambiente, cliente = details
+    return render_report_body_ooxml(summary, description_adf, riferimenti, ambiente, comments)
+
+def _render_ticket(ticket_key, details, comments, report=None):
+    """
+    Genera nel processo corrente il report di un ticket (o la sua sezione di report).
+    Come in RenderPool, un errore di rendering viene segnalato e il ticket risulta non generato
+    (False) senza interrompere gli altri.
+    """
+    summary, description_adf, riferimenti, ambiente, cliente = details
+    try:
+        if report:
+            report.add_section(ticket_key, summary, description_adf, riferimenti, ambiente, comments, cliente)
+        else:
+            create_word_document(ticket_key, summary, description_adf, riferimenti, ambiente, comments, cliente)
+    except Exception as e:
+        print(f"Errore nella generazione del report {ticket_key}: {e}")
+        return False
+    return True
+
+# === Generazione report per più ticket in parallelo ===
+def generate_reports_batch(ticket_keys, max_workers=BATCH_WORKERS, stream=False, processes=None, render_memory_mb=None,
+                           consolidated=None, incremental=False):
+    """
+    Recupera dettagli e commenti di tutti i ticket con poche ricerche `key in (...)`
+    (get_ticket_details_bulk, iter_ticket_comments_bulk); i ticket con molti commenti vengono
+    paginati da un pool di thread limitato e i documenti Word sono generati man mano che
+    i commenti di ciascun ticket sono completi, mentre le richieste degli altri ticket sono ancora in corso.
+    Con stream=True ogni worker genera un report in streaming (generate_report_streaming), con
+    incremental=True aggiorna il report esistente con i soli commenti nuovi (generate_report_incremental).
+    Con processes > 0 (default RENDER_PROCESSES) i documenti sono generati da un RenderPool di
+    `processes` processi, con al massimo render_memory_mb (default RENDER_MEMORY_MB) di dati in attesa.
+    Con consolidated (nome del file) viene generato un unico ConsolidatedReport con una sezione per
+    ticket, aggiunta appena i commenti del ticket sono completi (non compatibile con stream=True).
+    Restituisce la lista dei ticket per cui non è stato possibile generare il report.
+    """
+    if (stream or incremental) and consolidated:
+        raise ValueError("Il report consolidato non è compatibile con le modalità streaming e incrementale")
+    processes = RENDER_PROCESSES if processes is None else processes
+    ticket_keys = list(dict.fromkeys(ticket_keys))  # rimuove duplicati mantenendo l'ordine
+    richiesti = len(ticket_keys)
+    falliti = []
+
+    try:
+        all_details = get_ticket_details_bulk(ticket_keys, max_workers=max_workers)
+    except requests.RequestException as e:
+        print(f"Errore di connessione nel recupero dei dettagli: {e}")
+        all_details = {}
+
+    for key in ticket_keys:
+        if key not in all_details:
+            print(f"Errore nel recupero ticket {key}.")
+            falliti.append(key)
+    ticket_keys = [key for key in ticket_keys if key in all_details]
+
+    if stream or incremental:
+        generate = generate_report_incremental if incremental else generate_report_streaming
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+            futures = {pool.submit(generate, key, "", all_details[key]): key for key in ticket_keys}
+            for fut in as_completed(futures):
+                try:
+                    ok = fut.result()
+                except requests.RequestException as e:
+                    print(f"Errore di connessione per {futures[fut]}: {e}")
+                    ok = False
+                except Exception as e:
+                    print(f"Errore nella generazione del report {futures[fut]}: {e}")
+                    ok = False
+                if not ok:
+                    falliti.append(futures[fut])
+        print(f"Report generati: {richiesti - len(falliti)}/{richiesti}")
+        return falliti
+
+    generati = set()
+    report = ConsolidatedReport(consolidated) if consolidated else None
+    renderer = RenderPool(processes, render_memory_mb, report=report) if processes > 0 else None
+    try:
+        try:
+            for key, comments in iter_ticket_comments_bulk(ticket_keys, max_workers=max_workers):
+                if comments is None:
+                    print(f"Errore nel recupero ticket {key}.")
+                    falliti.append(key)
+                    continue
+
+                # Dettagli e commenti disponibili: il documento viene generato subito
+                if renderer:
+                    renderer.submit(key, all_details[key], comments)
+                elif not _render_ticket(key, all_details[key], comments, report):
+                    falliti.append(key)
+                    continue
+                generati.add(key)
+        except requests.RequestException as e:
+            print(f"Errore di connessione nel recupero dei commenti: {e}")
+            falliti += [key for key in ticket_keys if key not in generati and key not in falliti]
+        finally:
+            if renderer:
+                falliti += renderer.close()
+    except BaseException:
+        # Errore di rendering o interruzione: il report consolidato incompleto viene scartato
+        if report:
+            report.abort()
+        raise
+    if report:
+        report.close()
+
+    print(f"Report generati: {richiesti - len(falliti)}/{richiesti}")
+    return falliti
+
+# === Equivalenti asincroni delle funzioni di recupero (motore jira_async.py) ===
+async def get_tickets_for_user_async(engine):
+    issues = await engine.search_issues(JQL_BASE, "key, summary", path="/rest/api/3/search")
+    tickets = [f"{i['key']} - {i['fields']['summary']}" for i in issues]
+    return sorted(tickets, key=lambda x: x.split(" - ")[0])
+
+async def get_ticket_details_async(engine, ticket_key):
+    fields = await engine.get_issue_fields(ticket_key, CAMPI_DETTAGLI)
+    if fields is None:
+        return None
+    return _details_from_fields(fields)
+
+async def _search_chunk_async(engine, keys, fields):
+    """Come _search_chunk con il motore asincrono: solo con un 400 i ticket vengono recuperati uno per uno."""
+    from jira_async import JiraResponseError
+
+    try:
+        return await engine.search_issues(f"key in ({', '.join(keys)})", fields, page_size=len(keys))
+    except JiraResponseError as e:
+        if e.status != 400:
+            raise
+        print(f"Ricerca di {len(keys)} ticket non riuscita ({e.status}), recupero singolo")
+        return []
+
+async def get_ticket_details_bulk_async(engine, ticket_keys, chunk_size=BULK_CHUNK):
+    import asyncio
+
+    chunks = [ticket_keys[i:i + chunk_size] for i in range(0, len(ticket_keys), chunk_size)]
+    results = await asyncio.gather(*(_search_chunk_async(engine, chunk, CAMPI_DETTAGLI) for chunk in chunks))
+    details = {issue["key"]: _details_from_fields(issue.get("fields", {})) for issues in results for issue in issues}
+
+    # Ticket non restituiti dalla ricerca: recupero singolo
+    missing = [key for key in ticket_keys if key not in details]
+    found = await asyncio.gather(*(get_ticket_details_async(engine, key) for key in missing))
+    details.update({key: d for key, d in zip(missing, found) if d})
+    return details
+
+async def get_inline_comments_bulk_async(engine, ticket_keys, chunk_size=BULK_CHUNK):
+    """{chiave: commenti} dei ticket i cui commenti sono tutti inclusi nel campo `comment` della ricerca."""
+    import asyncio
+
+    chunks = [ticket_keys[i:i + chunk_size] for i in range(0, len(ticket_keys), chunk_size)]
+    results = await asyncio.gather(*(_search_chunk_async(engine, chunk, "comment") for chunk in chunks))
+    complete = {}
+    for issues in results:
+        for issue in issues:
+            inline = issue.get("fields", {}).get("comment") or {}
+            raw_comments = inline.get("comments", [])
+            if len(raw_comments) >= inline.get("total", len(raw_comments)):
+                complete[issue["key"]] = _comments_from_raw(raw_comments)
+    return complete
+
+async def get_ticket_comments_async(engine, ticket_key):
+    return _comments_from_raw(await engine.get_raw_comments(ticket_key))
+
+# === Generazione report per più ticket con il motore asincrono ===
+async def generate_reports_async(ticket_keys, concurrency=BATCH_WORKERS, processes=None, render_memory_mb=None,
+                                 consolidated=None):
+    """
+    Come generate_reports_batch (dettagli con ricerche `key in (...)`), ma tutte le richieste sono coroutine su un'unica sessione aiohttp
+    limitata da un semaforo. I documenti Word vengono generati in un thread separato (oppure passati
+    a un RenderPool con processes > 0), così il ciclo degli eventi continua a servire le richieste degli altri ticket.
+    Con consolidated le sezioni vengono aggiunte a un unico ConsolidatedReport.
+    """
+    import asyncio
+    import aiohttp
+    from jira_async import AsyncJiraClient, JiraResponseError
+
+    processes = RENDER_PROCESSES if processes is None else processes
+    ticket_keys = list(dict.fromkeys(ticket_keys))
+    falliti = []
+    report = ConsolidatedReport(consolidated) if consolidated else None
+    renderer = RenderPool(processes, render_memory_mb, report=report) if processes > 0 else None
+
+    try:
+        try:
+            async with AsyncJiraClient(JIRA_URL, USERNAME, API_TOKEN, concurrency=concurrency) as engine:
+                # Dettagli e commenti di tutti i ticket con poche ricerche `key in (...)`;
+                # il pager per issue serve solo ai ticket con più commenti di quelli inclusi nella ricerca
+                all_details = asyncio.ensure_future(get_ticket_details_bulk_async(engine, ticket_keys))
+                inline_comments = asyncio.ensure_future(get_inline_comments_bulk_async(engine, ticket_keys))
+
+                async def fetch(key):
+                    try:
+                        details, inline = await asyncio.gather(all_details, inline_comments)
+                        comments = inline.get(key)
+                        if comments is None:
+                            comments = await get_ticket_comments_async(engine, key)
+                    except JiraResponseError as e:
+                        # Sottoclasse di aiohttp.ClientError: Jira ha risposto, ma con un errore HTTP
+                        print(f"Errore nel recupero ticket {key}: HTTP {e.status}")
+                        return key, None, None
+                    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                        print(f"Errore di connessione per {key}: {e}")
+                        return key, None, None
+                    return key, details.get(key), comments
+
+                for next_done in asyncio.as_completed([fetch(key) for key in ticket_keys]):
+                    key, details, comments = await next_done
+                    if not details or comments is None:
+                        print(f"Errore nel recupero ticket {key}.")
+                        falliti.append(key)
+                        continue
+
+                    if renderer:
+                        await asyncio.to_thread(renderer.submit, key, details, comments)
+                    elif not await asyncio.to_thread(_render_ticket, key, details, comments, report):
+                        falliti.append(key)
+        finally:
+            if renderer:
+                falliti += await asyncio.to_thread(renderer.close)
+    except BaseException:
+        if report:
+            report.abort()
+        raise
+    if report:
+        await asyncio.to_thread(report.close)
+    print(f"Report generati: {len(ticket_keys) - len(falliti)}/{len(ticket_keys)}")
+    return falliti
 
 # === GUI selezione ticket ===
 def select_ticket_gui(tickets_list):
+    from tkinter import Button, Entry, Label, StringVar, Tk, messagebox
+    from tkinter.ttk import Combobox
+
     root = Tk()
     root.title("Selezione Ticket Jira")
     root.geometry("500x200")
@@ -572,8 +1835,88 @@ def select_ticket_gui(tickets_list):
 
 # === Main ===
 if __name__ == "__main__":
-    if len(sys.argv) > 1:
-        ticket_key = sys.argv[1]
+    parser = argparse.ArgumentParser(description=f"Report progetto Jira v{VERSION}")
+    parser.add_argument("ticket", nargs="?", help="codice ticket (es. XXX-123); se omesso viene mostrata la GUI")
+    parser.add_argument("--batch", nargs="*", metavar="KEY",
+                        help="genera i report per più ticket in parallelo; senza codici usa i ticket aperti (JQL_BASE)")
+    parser.add_argument("--file", help="legge i codici ticket da un elenco attività (es. elenco_attivita.txt)")
+    parser.add_argument("--workers", type=int, default=BATCH_WORKERS, help="numero massimo di richieste parallele")
+    parser.add_argument("--no-cache", action="store_true", help="ignora la cache locale e scarica tutto da Jira")
+    parser.add_argument("--delta", action="store_true",
+                        help="elenco dei ticket aperti con sincronizzazione incrementale (solo modifiche)")
+    parser.add_argument("--stream", action="store_true",
+                        help="scrive i commenti nel documento pagina per pagina (memoria limitata; "
+                             "sempre con il backend ooxml)")
+    parser.add_argument("--async", dest="use_async", action="store_true",
+                        help="modalità batch con il motore asincrono (richiede aiohttp)")
+    parser.add_argument("--headless", action="store_true", default=HEADLESS,
+                        help="non usa mai la GUI: il ticket va indicato da riga di comando (anche JIRA_HEADLESS=1)")
+    parser.add_argument("--trace", metavar="FILE",
+                        help="salva latenza e byte delle richieste Jira e la durata delle fasi (jira_trace.py)")
+    parser.add_argument("--processes", type=int, default=RENDER_PROCESSES,
+                        help="modalità batch: processi che generano i documenti (0 = processo principale; "
+                             "anche JIRA_RENDER_PROCESSES)")
+    parser.add_argument("--render-memory", type=int, default=RENDER_MEMORY_MB, metavar="MB",
+                        help="modalità batch con --processes: dati dei ticket in attesa di rendering "
+                             "(anche JIRA_RENDER_MEMORY_MB)")
+    parser.add_argument("--consolidated", nargs="?", const=CONSOLIDATED_FILE, metavar="FILE",
+                        help="modalità batch: un unico documento con sommario e una sezione per ticket "
+                             f"(default {CONSOLIDATED_FILE}; anche JIRA_CONSOLIDATED_FILE)")
+    parser.add_argument("--incremental", action="store_true", default=INCREMENTAL,
+                        help="aggiorna i report esistenti aggiungendo solo i commenti nuovi "
+                             "(manifest <KEY>_report.manifest.json; anche JIRA_INCREMENTAL=1)")
+    parser.add_argument("--backend", choices=DOCX_BACKENDS, default=DOCX_BACKEND,
+                        help="scrittura dei documenti: docx (python-docx) oppure ooxml (XML diretto, più rapido "
+                             "con molti commenti); anche JIRA_DOCX_BACKEND")
+    parser.add_argument("--trace-format", choices=("summary", "chrome"), default="summary",
+                        help="riepilogo JSON oppure file Chrome Trace (chrome://tracing, Perfetto)")
+    args = parser.parse_args()
+
+    if args.trace:
+        enable_trace(args.trace, args.trace_format)
+
+    if args.no_cache:
+        cache = None
+    DOCX_BACKEND = args.backend
+    if args.delta:
+        DELTA_SYNC = True
+    if args.consolidated and args.stream:
+        parser.error("--consolidated non è compatibile con --stream")
+    if args.incremental and (args.stream or args.consolidated or args.use_async):
+        parser.error("--incremental non è compatibile con --stream, --consolidated e --async")
+
+    if args.batch is not None or args.file or args.consolidated:
+        keys = list(args.batch or [])
+        if args.ticket:
+            keys.insert(0, args.ticket)
+        if args.file:
+            keys += read_ticket_keys(args.file)
+        if not keys:
+            keys = [t.split(" - ")[0] for t in get_tickets_for_user()]
+        if not keys:
+            print("Nessun ticket da elaborare.")
+            sys.exit(1)
+
+        print(f"Generazione report per {len(keys)} ticket (max {args.workers} richieste parallele)...")
+        if args.use_async:
+            import asyncio
+            falliti = asyncio.run(generate_reports_async(keys, concurrency=args.workers, processes=args.processes,
+                                                         render_memory_mb=args.render_memory,
+                                                         consolidated=args.consolidated))
+        else:
+            falliti = generate_reports_batch(keys, max_workers=args.workers, stream=args.stream,
+                                             processes=args.processes, render_memory_mb=args.render_memory,
+                                             consolidated=args.consolidated, incremental=args.incremental)
+        if falliti:
+            print(f"Ticket non elaborati: {', '.join(falliti)}")
+            sys.exit(1)
+        sys.exit(0)
+
+    if args.ticket:
+        ticket_key = args.ticket
+    elif args.headless:
+        print("Modalità headless: indicare il codice ticket oppure --batch/--file.")
+        sys.exit(2)
     else:
         tickets = get_tickets_for_user()
         ticket_key = select_ticket_gui(tickets)
@@ -583,15 +1926,25 @@ if __name__ == "__main__":
         sys.exit(1)
 
     print(f"Recupero dettagli per {ticket_key}...")
-    details = get_ticket_details(ticket_key)
-    if not details:
-        print("Errore nel recupero ticket.")
+    try:
+        if args.stream:
+            sys.exit(0 if generate_report_streaming(ticket_key) else 1)
+        if args.incremental:
+            sys.exit(0 if generate_report_incremental(ticket_key) else 1)
+
+        details = get_ticket_details(ticket_key)
+        if not details:
+            print("Errore nel recupero ticket.")
+            sys.exit(1)
+
+        summary, description_adf, riferimenti, ambiente, cliente = details
+        comments = get_ticket_comments(ticket_key)
+        create_word_document(ticket_key, summary, description_adf, riferimenti, ambiente, comments, cliente)
+    except requests.RequestException as e:
+        # Nessun report parziale: meglio nessun documento che un documento con commenti mancanti
+        print(f"Errore nel recupero del ticket {ticket_key}: {e}")
         sys.exit(1)
 
-    summary, description_adf, riferimenti, ambiente, cliente = details
-    comments = get_ticket_comments(ticket_key)
-    create_word_document(ticket_key, summary, description_adf, riferimenti, ambiente, comments, cliente)
-
 # === Fine script ===
 
 # === Roadmap future ===
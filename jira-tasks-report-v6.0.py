@@ -4,44 +4,63 @@ Script Python per interrogare l'API Jira e generare un report delle issue assegn
 Funzionalità principali:
 - Carica il token API Jira da un file .env per motivi di sicurezza.
 - Esegue una query JQL per recuperare le issue assegnate all'utente con stati specifici (Da Gestire, In corso, Stand by Cliente, Stand by Interno).
+- Converte ogni pagina della ricerca in record compatti (IssueRecord) man mano che arriva: la memoria
+  non cresce con il JSON completo delle issue anche con decine di migliaia di ticket.
 - Raggruppa le issue per priorità (High, Medium, Low, Nessuna).
-- Ordina le issue per data di scadenza e data di creazione.
+- Ordina le issue per data di scadenza e data di creazione (date convertite una sola volta alla ricezione,
+  un unico ordinamento su chiave composta).
 - Genera due file di output:
   1. Un documento Word (.docx) con le issue formattate, in cui la chiave dell’issue è in grassetto.
   2. Un file di testo (.txt) con l’elenco delle issue.
-- Gestisce eventuali errori di risposta dall’API.
+- Gestisce eventuali errori di risposta dall’API: i limiti di Jira Cloud (429, Retry-After) e gli errori
+  transitori vengono gestiti con nuovi tentativi (jira_ratelimit.py); se le issue non sono recuperabili
+  per intero i file non vengono generati.
 
 Prerequisiti:
 - Installare le librerie Python: requests, python-docx, python-dotenv
+- Modulo condiviso jira_client.py nella stessa cartella dello script.
+- Opzionale: pyarrow per `--export arrow` e `--export parquet`.
 - Creare un file `.env` contenente la variabile JIRA_API_TOKEN con il token API di Jira.
 
 Utilizzo:
 - Modificare le variabili JIRA_URL e USERNAME con i propri dati.
-- Eseguire lo script da riga di comando.
+- Eseguire lo script da riga di comando; opzionalmente passare il progetto (es. `SAL`, oppure `tutti`)
+  per saltare la finestra di selezione; con `--headless` (o JIRA_HEADLESS=1) la finestra non viene
+  mai aperta e, senza progetto, si elaborano tutti i progetti.
+- Con `--export ndjson|arrow|parquet` (ripetibile) lo stesso elenco viene esportato anche in formati
+  tipizzati per l'analisi dati (jira_export.py), scritti mentre arrivano le pagine della ricerca.
+- Con `--delta` (o JIRA_DELTA_SYNC=1) vengono scaricate solo le issue modificate dall'ultima
+  esecuzione e unite all'istantanea locale (jira_sync.py).
+- Con JIRA_TRACE=<file> (jira_trace.py) vengono registrate le richieste a Jira e la durata
+  delle fasi (recupero, rendering, salvataggio); JIRA_TRACE_FORMAT=chrome per un file Chrome Trace.
 - Trovare i file `elenco_attivita.docx` e `elenco_attivita.txt` nella cartella di esecuzione.
 
+Utilizzo come libreria (es. da un processo pianificatore con interprete e connessioni già attivi):
+    report = importlib.import_module(...)      # il nome del file contiene trattini
+    issues = report.fetch_issues("SAL", client=client_utente)
+    doc, lines = report.render_report(report.group_by_priority(issues))
+    report.save_report(doc, lines, output_dir="report/utente")
+oppure generate_task_report(project, client, output_dir) per l'intera sequenza.
+L'importazione non esegue nulla: lo script completo è main().
+
 Nome del file: 
 - jira-tasks-report-v6.0.py
 
 Autore: Roberto Raimondi
 """
 
-from tkinter.font import Font
+import argparse
 import requests
 import sys
 import os
-import csv
-from datetime import datetime
+from dataclasses import dataclass
+from datetime import date, datetime
 from dotenv import load_dotenv
-from docx import Document
-from docx.shared import Pt, Cm
-from docx.oxml.ns import qn
-from docx.enum.text import WD_LINE_SPACING
-from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
-from tkinter import Tk, Label, Button, StringVar
-from tkinter.ttk import Combobox
-
-doc = Document()
+from jira_client import get_client
+from jira_export import EXPORTERS, get_exporter
+from jira_sync import sync_issues
+from jira_trace import span
+
 load_dotenv()   
 
 # Carica le variabili d'ambiente da .env se presente
@@ -52,54 +71,123 @@ API_TOKEN = os.getenv("JIRA_API_TOKEN")
 
 # JQL di ricerca
 JQL = 'assignee = currentUser() AND status in ("Da Gestire", "In corso", "Stand by Cliente", "Stand by Interno") ORDER BY priority DESC, project, duedate ASC, created ASC'
+JQL_PROGETTO = 'assignee = currentUser() AND project = "{project}" AND status in ("Da Gestire", "In corso", "Stand by Cliente", "Stand by Interno") ORDER BY priority DESC, project, duedate ASC, created ASC'
+
+TUTTI_I_PROGETTI = "Tutti i progetti"
+PRIORITA = ["Highest", "High", "Medium", "Low", "Lowest", "Nessuna"]
+PRIORITA_ORDINE = {label: i for i, label in enumerate(PRIORITA)}
+SENZA_SCADENZA = date.max.toordinal()   # le issue senza scadenza vanno in fondo al gruppo
 
 # === PARAMETRI RICHIESTA ===
-URL = f"{JIRA_URL}/rest/api/3/search/jql"
-HEADERS = {"Accept": "application/json"}
-AUTH = (USERNAME, API_TOKEN)
+URL = "/rest/api/3/search/jql"
+FIELDS = "summary,status,priority,created,duedate,project,key"
+max_results = 100  # limite massimo Jira Cloud
 
-SEARCH_PARAMS = {
-    "jql": JQL,
-    "fields": "key",
-    "maxResults": 1000
-}
+# Sincronizzazione incrementale (solo issue modificate dall'ultima esecuzione)
+DELTA_SYNC = os.getenv("JIRA_DELTA_SYNC") == "1"
+
+# Senza interfaccia grafica (CI, pianificazioni): tkinter non viene importato, default tutti i progetti
+HEADLESS = os.getenv("JIRA_HEADLESS") == "1"
+
+# File generati (nella cartella di output)
+EXPORT_BASENAME = "elenco_attivita"   # + estensione del formato di esportazione (jira_export.py)
+DOCX_FILENAME = "elenco_attivita.docx"
+TXT_FILENAME  = "elenco_attivita.txt"
+
+# === Date in forma numerica (giorno ordinale), calcolate una sola volta alla ricezione ===
+def parse_day(date_str):
+    """"AAAA-MM-GG..." -> numero ordinale del giorno (date.toordinal), None se assente."""
+    return date.fromisoformat(date_str[:10]).toordinal() if date_str else None
+
+# === Issue in forma compatta ===
+@dataclass(slots=True)
+class IssueRecord:
+    """Solo i campi usati dal report: il JSON completo di ogni issue viene scartato appena convertito."""
+    key: str
+    project: str          # chiave del progetto (CSV)
+    project_name: str     # nome del progetto (Word e testo)
+    summary: str
+    status: str
+    priority: str         # "" se la issue non ha priorità
+    created: str          # data e ora ISO come restituite da Jira
+    due: str | None       # AAAA-MM-GG oppure None
+    created_day: int      # giorno ordinale di created (ordinamento)
+    due_day: int          # giorno ordinale di due, SENZA_SCADENZA se assente (ordinamento)
+
+    @classmethod
+    def from_json(cls, issue):
+        fields = issue.get("fields", {})
+        project = fields.get("project") or {}
+        created = fields.get("created", "")
+        due = fields.get("duedate")
+        return cls(
+            key=issue.get("key", ""),
+            project=project.get("key", ""),
+            project_name=project.get("name", ""),
+            summary=fields.get("summary", ""),
+            status=(fields.get("status") or {}).get("name", ""),
+            priority=(fields.get("priority") or {}).get("name", ""),
+            created=created,
+            due=due,
+            created_day=parse_day(created) or 0,
+            due_day=parse_day(due) or SENZA_SCADENZA,
+        )
+
+    @property
+    def title(self):
+        """Titolo senza il nome del progetto ripetuto in testa."""
+        if self.summary.lower().startswith(self.project_name.lower()):
+            return self.summary[len(self.project_name):].lstrip(" -:–—")
+        return self.summary
+
+# === Client Jira: quello passato dal chiamante oppure la sessione condivisa del processo ===
+def _client(client=None):
+    # Sessione HTTP condivisa (keep-alive, pool di connessioni, gzip)
+    return client or get_client(base_url=JIRA_URL, username=USERNAME, api_token=API_TOKEN)
+
+# === JQL delle issue aperte, per un progetto o per tutti ===
+def build_jql(project=None):
+    if project and project != TUTTI_I_PROGETTI:
+        return JQL_PROGETTO.format(project=project)
+    return JQL
 
 # === Recupero delle issue aperte ===
-def get_project_for_user():
+def get_project_for_user(client=None, delta=DELTA_SYNC):
+    jira = _client(client)
     jql_projects = JQL
     params = {
         "jql": jql_projects,
-        "fields": "project",
-        "maxResults": 1000
+        "fields": "project"
     }
 
+    # Estrai i progetti unici (tutte le pagine della ricerca)
+    projects = set()
     try:
-        resp = requests.get(URL, headers=HEADERS, auth=AUTH, params=params)
+        pages = [sync_issues(jira, params["jql"], params["fields"], URL)] if delta else jira.iter_pages(URL, params)
+        for issues in pages:
+            for issue in issues:
+                project_key = issue["fields"]["project"]["key"]
+                projects.add(project_key)
+    except requests.HTTPError as e:
+        resp = e.response
+        if resp.status_code == 410:
+            print(f"Errore 410: l'endpiont API non è più valido."
+                  "Aggiornare l'URL secondo le nuove specifiche di Jira Cloud.")
+        else:
+            print(f"Errore nella richiesta recupero progetti: {resp.status_code} {resp.text}")
+        return []
     except requests.RequestException as e:
         print(f"Errore di connessione a Jira: {e}")
-        return []    
-    
-    if resp.status_code == 410:
-        print(f"Errore 410: l'endpiont API non è più valido."
-              "Aggiornare l'URL secondo le nuove specifiche di Jira Cloud.")
         return []
-    
-    if resp.status_code != 200:
-        print(f"Errore nella richiesta recupero progetti: {resp.status_code} {resp.text}")
-        return []
-    
-    data = resp.json()
-    issues = data.get("issues", [])
-    # Estrai i progetti unici
-    projects = set()
-    for issue in issues:
-        project_key = issue["fields"]["project"]["key"]
-        projects.add(project_key)
+
     return sorted(projects)   
 
 # === Selezione del progetto ===
 def select_project_gui(projects_list):
-    projects_list = ["Tutti i progetti"] + sorted(projects_list)
+    from tkinter import Tk, Label, Button, StringVar
+    from tkinter.ttk import Combobox
+
+    projects_list = [TUTTI_I_PROGETTI] + sorted(projects_list)
 
     root = Tk()
     root.title("Selezione Progetto Jira")
@@ -121,200 +209,231 @@ def select_project_gui(projects_list):
 
     return selected_project.get()
 
-# === Recupero lista progetti e selezione ===
-projects = get_project_for_user()
-if not projects:
-     print("Nessun progetto trovato per l'utente corrente.")
-     sys.exit(1)
-
-selected_project = select_project_gui(projects)
-if not selected_project:
-    print("Nessun progetto selezionato.")
-    sys.exit(1)
-
-base_JQL = JQL
-if selected_project != "Tutti i progetti":
-    JQL = f'assignee = currentUser() AND project = "{selected_project}" AND status in ("Da Gestire", "In corso", "Stand by Cliente", "Stand by Interno") ORDER BY priority DESC, project, duedate ASC, created ASC'
-else:
-    JQL = base_JQL
-    
-print(f"Progetto selezionato: {selected_project}")
-
-all_issues = []
-start_at = 0
-max_results = 100  # limite massimo Jira Cloud
-
-while True:
-    PARAMS = {
-        "jql": JQL,
-        "fields": "summary,status,priority,created,duedate,project,key",
-        "startAt": start_at,
-        "maxResults": max_results
-    }
-
-    response = requests.get(URL,
-        headers=HEADERS, auth=AUTH, params=PARAMS)
-
-    if response.status_code != 200:
-        print(f"Errore nella richiesta: {response.status_code} {response.text}")
-        break
-
-    data = response.json()
-
-    issues = data.get("issues", [])
-    if not issues:
-        break
-
-    all_issues.extend(issues)
-
-    print(f"Recuperati {len(issues)} ticket (totale finora: {len(all_issues)})")
-
-    # Controlla se abbiamo preso tutto
-    if start_at + max_results >= data.get("total", 0):
-        break
-
-    start_at += max_results
-
-print(f"\nRecuperati in totale {len(all_issues)} ticket da Jira")
-progetti = sorted(set(issue["fields"]["project"]["key"] for issue in all_issues))
-progetti.insert(0, "Tutti i progetti")
+# === Recupero delle issue di un progetto (o di tutti) ===
+def fetch_issues(project=None, client=None, delta=DELTA_SYNC, exporters=()):
+    """
+    Restituisce le issue aperte assegnate all'utente del client (IssueRecord), nell'ordine della JQL.
+    Ogni pagina viene convertita e scartata appena ricevuta: in memoria resta solo la forma compatta.
+    Ogni pagina convertita viene passata anche agli esportatori indicati (jira_export.py).
+    Solleva requests.HTTPError se una pagina non è recuperabile (dopo i tentativi del client):
+    un elenco parziale non deve diventare un report apparentemente completo.
+    """
+    jira = _client(client)
+    all_issues = []
+
+    # Pagine a offset scaricate in parallelo dopo la prima, oppure cursore nextPageToken in streaming
+    with span("fetch.search", project=project or TUTTI_I_PROGETTI):
+        if delta:
+            all_issues = [IssueRecord.from_json(issue) for issue in sync_issues(jira, build_jql(project), FIELDS, URL)]
+            for exporter in exporters:
+                exporter.write(all_issues)
+        else:
+            for issues in jira.iter_pages(URL, {"jql": build_jql(project), "fields": FIELDS}, page_size=max_results):
+                if not issues:
+                    break
+
+                records = [IssueRecord.from_json(issue) for issue in issues]
+                all_issues.extend(records)
+                for exporter in exporters:
+                    exporter.write(records)
+
+                print(f"Recuperati {len(issues)} ticket (totale finora: {len(all_issues)})")
+
+    print(f"\nRecuperati in totale {len(all_issues)} ticket da Jira")
+    return all_issues
+
+# === Esportazioni (CSV e formati per l'analisi: ndjson, arrow, parquet) ===
+def open_exporters(formats, output_dir=""):
+    """Esportatori per i formati richiesti, nella cartella di output; ImportError se manca pyarrow."""
+    exporters = []
+    try:
+        for fmt in dict.fromkeys(formats):
+            exporters.append(get_exporter(fmt, os.path.join(output_dir, EXPORT_BASENAME + EXPORTERS[fmt].extension)))
+    except BaseException:
+        for exporter in exporters:
+            exporter.abort()
+        raise
+    return exporters
 
-# Salvataggio CSV
-csv_filename = "elenco_attivita.csv"
-with open(csv_filename, mode="w", newline="", encoding="utf-8") as file:
-    writer = csv.writer(file)
-    # intestazioni CSV
-    writer.writerow(["Key", "Summary", "Status", "Priority", "Created", "Due Date", "Project"])
-    
+# === CATEGORIZZAZIONE PER PRIORITÀ ===
+def group_by_priority(all_issues):
+    """Raggruppa le issue per priorità; ogni gruppo è ordinato per scadenza e poi per creazione."""
+    priorities = {label: [] for label in PRIORITA}
+
+    # Un solo ordinamento su chiave composta (priorità, scadenza, creazione) con le date già numeriche;
+    # l'ordinamento è stabile, a parità di chiave resta l'ordine della JQL.
+    # Le priorità non previste seguono quelle note, nell'ordine in cui compaiono.
+    ordine = dict(PRIORITA_ORDINE)
     for issue in all_issues:
-        fields = issue.get("fields", {})
-        writer.writerow([
-            issue.get("key", ""),
-            fields.get("summary", ""),
-            fields.get("status", {}).get("name", ""),
-            fields.get("priority", {}).get("name", ""),
-            fields.get("created", ""),
-            fields.get("duedate", ""),
-            fields.get("project", {}).get("key", "")
-        ])
-
-print(f"💾 File salvato: {csv_filename}")
+        ordine.setdefault(issue.priority or "Nessuna", len(ordine))
+    ordered = sorted(all_issues, key=lambda x: (ordine[x.priority or "Nessuna"], x.due_day, x.created_day))
 
-# === CATEGORIZZAZIONE PER PRIORITÀ ===
-priorities = {
-    "Highest": [],
-    "High": [],
-    "Medium": [],
-    "Low": [],
-    "Lowest": [],
-    "Nessuna": []
-}
-
-def parse_date(date_str):
-    return datetime.strptime(date_str, "%Y-%m-%d") if date_str else None
-
-def parse_created(date_str):
-    return datetime.strptime(date_str, "%Y-%m-%d")
-
-for issue in all_issues:
-    fields = issue["fields"]
-    key = issue["key"]
-    project_name = fields["project"]["name"]
-    title = fields["summary"]
-    status = fields["status"]["name"]
-    priority = fields.get("priority", {}).get("name", "Nessuna")
-    duedate = fields.get("duedate")  # può essere None
-    created = fields["created"][:10]
-
-    title_clean = title
-    if title.lower().startswith(project_name.lower()):
-        title_clean = title[len(project_name):].lstrip(" -:–—")
-
-    priorities.setdefault(priority, []).append({
-        "key": key,
-        "progetto": project_name,
-        "titolo": title_clean,
-        "stato": status,
-        "scadenza": duedate,
-        "creazione": created
-    })
+    # I gruppi contengono gli stessi IssueRecord di all_issues, senza copie
+    for issue in ordered:
+        priorities.setdefault(issue.priority or "Nessuna", []).append(issue)
+
+    return priorities
 
 # === ORDINAMENTO E GENERAZIONE OUTPUT ===
-output_lines = []
-
-# **Aggiunta data attuale allineata a destra e in grassetto**
-today = datetime.today().strftime('%d/%m/%Y')
-p_date = doc.add_paragraph()
-p_date.alignment = WD_PARAGRAPH_ALIGNMENT.RIGHT
-
-run_date = p_date.add_run(f"Data: {today}")
-run_date.bold = True
-run_date.font.name = 'Arial'
-run_date.font.size = Pt(16)
-
-# Imposta margini pagina
-for prio_label in ["Highest", "High", "Medium", "Low", "Lowest", "Nessuna"]:
-    blocco = priorities.get(prio_label, [])
-    if not blocco:
-        continue
-
-    # Imposta margini pagina
-    sections = doc.sections
-    for section in sections:
-        section.top_margin = Cm(0.5)      # margine superiore ridotto (0.5 cm)
-        section.bottom_margin = Cm(0.5)   # margine inferiore ridotto (0.5 cm)
-        section.left_margin = Cm(1)       # margine sinistro 1 cm
-        section.right_margin = Cm(1)      # margine destro 1 cm
-
-    # Definisci stile paragrafo base
-    style = doc.styles['Normal']
-    font = style.font
-    font.name = 'Arial'
-    font.size = Pt(10)
-    # Per applicare Arial correttamente anche a caratteri asiatici ecc.
-    font.element.rPr.rFonts.set(qn('w:eastAsia'), 'Arial')
-
-    # Interlinea singola e nessuno spazio tra paragrafi dello stesso stile
-    paragraph_format = style.paragraph_format
-    paragraph_format.line_spacing_rule = WD_LINE_SPACING.SINGLE
-    paragraph_format.space_before = Pt(0)
-    paragraph_format.space_after = Pt(0)
-
-    # Sezione intestazione
-    doc.add_paragraph("##############################")
-    doc.add_paragraph(f"# {prio_label.upper()} PRIORITY")
-    doc.add_paragraph("##############################\n")
-
-    output_lines.append("##############################")
-    output_lines.append(f"# {prio_label.upper()} PRIORITY")
-    output_lines.append("##############################\n")
-
-    # Ordinamento: prima per scadenza, poi per creazione
-    blocco.sort(key=lambda x: (
-        parse_date(x["scadenza"]) if x["scadenza"] else datetime.max,
-        parse_created(x["creazione"])
-    ))
-
-    for item in blocco:
-        scad = f", scad. {datetime.strptime(item['scadenza'], '%Y-%m-%d').strftime('%d-%m-%Y')}" if item["scadenza"] else ""
-        line = f"{item['progetto']} - {item['titolo']} ({item['stato']}{scad})"
-
-        # Word: key in grassetto
-        p = doc.add_paragraph()
-        run_key = p.add_run(f"{item['key']} ")
-        run_key.bold = True
-        p.add_run(line)
-
-        # TXT: key inclusa
-        output_lines.append(f"{item['key']} {line}")
-
-    doc.add_paragraph("")
-    output_lines.append("")
+def render_report(priorities):
+    """Documento Word e righe del file di testo per le issue raggruppate da group_by_priority."""
+    # python-docx viene importato solo ora, quando i dati sono pronti (l'import domina l'avvio)
+    from docx import Document
+    from docx.shared import Pt, Cm
+    from docx.oxml.ns import qn
+    from docx.enum.text import WD_LINE_SPACING
+    from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
+
+    doc = Document()
+    output_lines = []
+
+    with span("render", issues=sum(len(b) for b in priorities.values())):
+        # **Aggiunta data attuale allineata a destra e in grassetto**
+        today = datetime.today().strftime('%d/%m/%Y')
+        p_date = doc.add_paragraph()
+        p_date.alignment = WD_PARAGRAPH_ALIGNMENT.RIGHT
+
+        run_date = p_date.add_run(f"Data: {today}")
+        run_date.bold = True
+        run_date.font.name = 'Arial'
+        run_date.font.size = Pt(16)
+
+        # Imposta margini pagina
+        for prio_label in PRIORITA:
+            blocco = priorities.get(prio_label, [])
+            if not blocco:
+                continue
+
+            # Imposta margini pagina
+            sections = doc.sections
+            for section in sections:
+                section.top_margin = Cm(0.5)      # margine superiore ridotto (0.5 cm)
+                section.bottom_margin = Cm(0.5)   # margine inferiore ridotto (0.5 cm)
+                section.left_margin = Cm(1)       # margine sinistro 1 cm
+                section.right_margin = Cm(1)      # margine destro 1 cm
+
+            # Definisci stile paragrafo base
+            style = doc.styles['Normal']
+            font = style.font
+            font.name = 'Arial'
+            font.size = Pt(10)
+            # Per applicare Arial correttamente anche a caratteri asiatici ecc.
+            font.element.rPr.rFonts.set(qn('w:eastAsia'), 'Arial')
+
+            # Interlinea singola e nessuno spazio tra paragrafi dello stesso stile
+            paragraph_format = style.paragraph_format
+            paragraph_format.line_spacing_rule = WD_LINE_SPACING.SINGLE
+            paragraph_format.space_before = Pt(0)
+            paragraph_format.space_after = Pt(0)
+
+            # Sezione intestazione
+            doc.add_paragraph("##############################")
+            doc.add_paragraph(f"# {prio_label.upper()} PRIORITY")
+            doc.add_paragraph("##############################\n")
+
+            output_lines.append("##############################")
+            output_lines.append(f"# {prio_label.upper()} PRIORITY")
+            output_lines.append("##############################\n")
+
+            for item in blocco:
+                scad = f", scad. {date.fromordinal(item.due_day):%d-%m-%Y}" if item.due else ""
+                line = f"{item.project_name} - {item.title} ({item.status}{scad})"
+
+                # Word: key in grassetto
+                p = doc.add_paragraph()
+                run_key = p.add_run(f"{item.key} ")
+                run_key.bold = True
+                p.add_run(line)
+
+                # TXT: key inclusa
+                output_lines.append(f"{item.key} {line}")
+
+            doc.add_paragraph("")
+            output_lines.append("")
+
+    return doc, output_lines
 
 # === SALVA I FILE ===
-doc.save("elenco_attivita.docx")
-
-with open("elenco_attivita.txt", "w", encoding="utf-8") as f:
-    f.write("\n".join(output_lines))
+def save_report(doc, output_lines, output_dir=""):
+    docx_path = os.path.join(output_dir, DOCX_FILENAME)
+    txt_path = os.path.join(output_dir, TXT_FILENAME)
+
+    with span("save"):
+        doc.save(docx_path)
+
+        with open(txt_path, "w", encoding="utf-8") as f:
+            f.write("\n".join(output_lines))
+
+    print("✅ File 'elenco_attivita.docx' e 'elenco_attivita.txt' generati correttamente.")
+    return docx_path, txt_path
+
+# === Report completo: recupero, CSV, raggruppamento, Word e testo ===
+def generate_task_report(project=None, client=None, delta=DELTA_SYNC, output_dir="", formats=("csv",)):
+    """
+    Genera i file del report in output_dir (default cartella corrente) e ne restituisce i percorsi:
+    prima le esportazioni nell'ordine di `formats` (default solo il CSV), poi docx e txt.
+    Le esportazioni vengono scritte mentre arrivano le pagine della ricerca; se il recupero fallisce
+    i file parziali vengono rimossi.
+    """
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    exporters = open_exporters(formats, output_dir)
+    try:
+        all_issues = fetch_issues(project, client=client, delta=delta, exporters=exporters)
+    except BaseException:
+        for exporter in exporters:
+            exporter.abort()
+        raise
+    for exporter in exporters:
+        exporter.close()
+        print(f"💾 File salvato: {exporter.path}")
+
+    doc, output_lines = render_report(group_by_priority(all_issues))
+    return tuple(exporter.path for exporter in exporters) + save_report(doc, output_lines, output_dir)
+
+# === Main ===
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=f"Report attività Jira v{VERSIONE}")
+    parser.add_argument("project", nargs="?",
+                        help="progetto (es. SAL) oppure 'tutti'; se omesso viene mostrata la GUI di selezione")
+    parser.add_argument("--delta", action="store_true", default=DELTA_SYNC,
+                        help="scarica solo le issue modificate dall'ultima esecuzione (jira_sync.py)")
+    parser.add_argument("--headless", action="store_true", default=HEADLESS,
+                        help="non usa mai la GUI; senza progetto elabora tutti i progetti")
+    parser.add_argument("--output-dir", default="", help="cartella dei file generati (default: cartella corrente)")
+    parser.add_argument("--export", action="append", choices=[fmt for fmt in EXPORTERS if fmt != "csv"], default=[],
+                        help="esporta anche in questo formato (ripetibile; arrow e parquet richiedono pyarrow)")
+    args = parser.parse_args(argv)
+
+    # === Recupero lista progetti e selezione ===
+    project_arg = args.project or ("tutti" if args.headless else None)
+    if project_arg:
+        selected_project = TUTTI_I_PROGETTI if project_arg.lower() in ("tutti", "all") else project_arg
+    else:
+        projects = get_project_for_user(delta=args.delta)
+        if not projects:
+            print("Nessun progetto trovato per l'utente corrente.")
+            return 1
+
+        selected_project = select_project_gui(projects)
+    if not selected_project:
+        print("Nessun progetto selezionato.")
+        return 1
+
+    print(f"Progetto selezionato: {selected_project}")
+    try:
+        generate_task_report(selected_project, delta=args.delta, output_dir=args.output_dir,
+                             formats=["csv"] + args.export)
+    except ImportError as e:
+        print(e)
+        return 1
+    except requests.HTTPError as e:
+        print(f"Errore nella richiesta: {e.response.status_code} {e.response.text}")
+        return 1
+    except requests.RequestException as e:
+        print(f"Errore di connessione a Jira: {e}")
+        return 1
+    return 0
 
-print("✅ File 'elenco_attivita.docx' e 'elenco_attivita.txt' generati correttamente.")
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,224 @@
+"""
+Motore di attraversamento dei documenti ADF (Atlassian Document Format).
+
+Funzionalità principali:
+- walk_adf: visita iterativa (stack esplicito, nessuna ricorsione Python) di una lista di nodi ADF.
+  Ogni nodo viene smistato con una tabella {tipo nodo: handler} calcolata una sola volta;
+  un handler può chiedere di visitare dei figli con un'altra tabella, un altro contesto
+  e una funzione da eseguire al termine dei figli.
+- adf_to_text: estrazione del testo semplice (stesse regole di get_text_from_content)
+  con un unico join finale, in tempo lineare rispetto al numero di nodi.
+- FragmentCache: cache LRU, limitata in dimensione, dei frammenti ADF già convertiti (testo o
+  elementi OOXML), indirizzata dall'hash del frammento canonico (fragment_key).
+
+Configurazione (variabili d'ambiente):
+- JIRA_RENDER_CACHE_MB   dimensione massima della cache dei frammenti (default 32, 0 = disattivata)
+
+Contratto degli handler:
+    handler(node, ctx) -> None
+    handler(node, ctx) -> (figli, tabella, contesto_figli, dopo)
+
+    dove `figli` è un iterabile di nodi, `tabella` il dizionario di smistamento dei figli,
+    `contesto_figli` il contesto passato ai loro handler e `dopo` una funzione senza argomenti
+    (oppure None) eseguita quando tutti i figli sono stati visitati.
+    La chiave DEFAULT della tabella indica l'handler dei tipi non elencati.
+
+Nome del file:
+- jira_adf.py
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+
+from collections import OrderedDict
+from itertools import chain
+
+from dotenv import load_dotenv
+
+# === Caricamento variabili ambiente ===
+load_dotenv()
+
+DEFAULT = object()  # chiave della tabella per i tipi di nodo non previsti
+
+LIST_TYPES = ("bulletList", "orderedList")
+
+# === Attraversamento iterativo di una lista di nodi ADF ===
+def walk_adf(content, table, ctx):
+    stack = [(iter(content), table, ctx, None)]
+    while stack:
+        children, table, ctx, after = stack[-1]
+        default = table.get(DEFAULT)
+        for node in children:
+            handler = table.get(node.get("type"), default)
+            if handler is None:
+                continue
+            descend = handler(node, ctx)
+            if descend is not None:
+                sub_children, sub_table, sub_ctx, sub_after = descend
+                stack.append((iter(sub_children), sub_table, sub_ctx, sub_after))
+                break
+        else:
+            # Figli esauriti: si chiude il livello e si riprende il genitore dal punto in cui era
+            stack.pop()
+            if after is not None:
+                after()
+
+# === Estrazione del testo semplice ===
+class _TextSink:
+    __slots__ = ("parts", "append", "newline")
+
+    def __init__(self):
+        self.parts = []
+        self.append = self.parts.append
+        self.newline = lambda: self.append("\n")
+
+def _text(node, sink):
+    sink.append(node.get("text", ""))
+
+def _hard_break(node, sink):
+    sink.append("\n")
+
+def _block_with_newline(node, sink):
+    # paragraph e listItem: testo dei figli seguito da un a capo
+    return node.get("content", ()), TEXT_TABLE, sink, sink.newline
+
+def _list(node, sink):
+    # Gli elementi dell'elenco contribuiscono solo con il loro contenuto (senza a capo proprio)
+    items = (li.get("content", ()) for li in node.get("content", ()))
+    return chain.from_iterable(items), TEXT_TABLE, sink, None
+
+def _container(node, sink):
+    if "content" in node:
+        return node["content"], TEXT_TABLE, sink, None
+    return None
+
+TEXT_TABLE = {
+    "text": _text,
+    "paragraph": _block_with_newline,
+    "hardBreak": _hard_break,
+    "bulletList": _list,
+    "orderedList": _list,
+    "listItem": _block_with_newline,
+    "panel": _container,
+    DEFAULT: _container,
+}
+
+def adf_to_text(content):
+    """Testo semplice di una lista di nodi ADF."""
+    sink = _TextSink()
+    walk_adf(content, TEXT_TABLE, sink)
+    return "".join(sink.parts)
+
+# === Cache dei frammenti ADF già convertiti (indirizzata dal contenuto, LRU) ===
+# Pannelli, firme e blocchi di codice si ripetono uguali in molti commenti: il risultato della
+# conversione (testo, elementi OOXML) viene memorizzato con la chiave hash del frammento canonico
+# e riutilizzato invece di visitare e ridisegnare di nuovo l'albero.
+RENDER_CACHE_MB = float(os.getenv("JIRA_RENDER_CACHE_MB", "32"))
+
+# Attributi che non influiscono sul risultato (identificativi generati da Jira per ogni nodo)
+RE_LOCAL_ID     = re.compile(r'"localId":"[^"]*"')
+
+class _Raw(str):
+    """Testo JSON già serializzato nella pila di _canonical_json."""
+
+def _canonical_json(value):
+    """
+    Lo stesso testo di json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    dopo la rimozione di RE_LOCAL_ID, prodotto con una pila esplicita: nessun limite di annidamento.
+    Unica differenza: un localId con virgolette viene rimosso per intero (RE_LOCAL_ID si ferma alla prima).
+    """
+    out = []
+    stack = [value]
+    while stack:
+        item = stack.pop()
+        if type(item) is _Raw:
+            out.append(item)
+        elif isinstance(item, dict):
+            tokens = [_Raw("{")]
+            for i, key in enumerate(sorted(item)):
+                if i:
+                    tokens.append(_Raw(","))
+                child = item[key]
+                if key == "localId" and isinstance(child, str):
+                    continue   # come RE_LOCAL_ID: la coppia sparisce, le virgole restano
+                tokens.append(_Raw(json.dumps(key, ensure_ascii=False) + ":"))
+                tokens.append(child)
+            tokens.append(_Raw("}"))
+            stack.extend(reversed(tokens))
+        elif isinstance(item, (list, tuple)):
+            tokens = [_Raw("[")]
+            for i, child in enumerate(item):
+                if i:
+                    tokens.append(_Raw(","))
+                tokens.append(child)
+            tokens.append(_Raw("]"))
+            stack.extend(reversed(tokens))
+        else:
+            out.append(json.dumps(item, ensure_ascii=False))
+    return "".join(out)
+
+def fragment_key(*parts):
+    """Chiave del frammento: hash del JSON canonico (chiavi ordinate, senza localId) e sua dimensione."""
+    try:
+        canonical = json.dumps(parts, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+        canonical = RE_LOCAL_ID.sub("", canonical)
+    except RecursionError:
+        # Frammento più annidato del limite di ricorsione del modulo json: stesso testo, senza ricorsione
+        canonical = _canonical_json(parts)
+    canonical = canonical.encode("utf-8")
+    return hashlib.blake2b(canonical, digest_size=16).digest(), len(canonical)
+
+class FragmentCache:
+    """LRU limitata dalla dimensione complessiva (stimata dal JSON dei frammenti), condivisa tra i thread."""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()   # chiave -> (valore, dimensione)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value, size):
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.size -= old[1]
+            self._entries[key] = (value, size)
+            self.size += size
+            while self.size > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self.size -= evicted
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+_render_cache = None
+_render_cache_lock = threading.Lock()
+
+def get_render_cache():
+    """Cache dei frammenti del processo; None se disattivata (JIRA_RENDER_CACHE_MB=0)."""
+    global _render_cache
+    if RENDER_CACHE_MB <= 0:
+        return None
+    with _render_cache_lock:
+        if _render_cache is None:
+            _render_cache = FragmentCache(int(RENDER_CACHE_MB * 1024 * 1024))
+        return _render_cache
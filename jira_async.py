@@ -0,0 +1,200 @@
+"""
+Motore asincrono (asyncio + aiohttp) per le chiamate alle API Jira.
+
+Funzionalità principali:
+- Un'unica `aiohttp.ClientSession` con connessioni persistenti e limite di connessioni per host.
+- Un semaforo limita il numero di richieste contemporanee, indipendentemente da quante
+  coroutine vengono avviate (centinaia di issue senza un thread per richiesta); entro quel
+  massimo vale il limite adattivo (AIMD) del pianificatore condiviso.
+- Token bucket, concorrenza adattiva, Retry-After / X-RateLimit-* e nuovi tentativi con backoff
+  del pianificatore condiviso (jira_ratelimit.py), con attese che non bloccano il ciclo degli eventi.
+- Paginazione in pipeline: la prima pagina restituisce `total`, dopodiché tutte le pagine
+  restanti (`startAt`) vengono richieste insieme. Per l'endpoint `/search/jql` senza `total`
+  si seguono i `nextPageToken` in sequenza.
+- Equivalenti asincroni delle funzioni di recupero degli script di report:
+    - get_issue_fields      -> dettagli di un'issue (get_ticket_details)
+    - get_raw_comments      -> commenti di un'issue (get_ticket_comments)
+    - search_issues         -> ciclo di paginazione della ricerca (jira-tasks-report-v6.0.py)
+    - get_projects          -> progetti con issue aperte (get_project_for_user)
+
+Requisiti:
+- Librerie Python: aiohttp, python-dotenv
+
+Utilizzo:
+    async with AsyncJiraClient() as engine:
+        issues = await engine.search_issues(JQL, "summary,status")
+
+Nome del file:
+- jira_async.py
+"""
+
+import asyncio
+import json
+import os
+import time
+
+import aiohttp
+from dotenv import load_dotenv
+
+from jira_ratelimit import get_scheduler
+from jira_trace import get_tracer
+
+# === Caricamento variabili ambiente ===
+load_dotenv()
+
+# === Parametri del motore asincrono ===
+CONCURRENCY     = int(os.getenv("JIRA_ASYNC_CONCURRENCY", "16"))
+TIMEOUT         = float(os.getenv("JIRA_TIMEOUT", "60"))
+PAGE_SIZE       = 100  # limite massimo Jira Cloud
+
+SEARCH_PATH     = "/rest/api/3/search/jql"
+
+# === Pagina non recuperabile (i risultati parziali non vengono restituiti) ===
+class JiraResponseError(aiohttp.ClientError):
+    def __init__(self, status, url):
+        super().__init__(f"{status} {url}")
+        self.status = status
+
+# === Client Jira asincrono ===
+class AsyncJiraClient:
+    def __init__(self, base_url=None, username=None, api_token=None,
+                 concurrency=CONCURRENCY, timeout=TIMEOUT):
+        self.base_url = (base_url or os.getenv("JIRA_URL") or "").rstrip("/")
+        self.auth = aiohttp.BasicAuth(username or os.getenv("JIRA_USERNAME") or "",
+                                      api_token or os.getenv("JIRA_API_TOKEN") or "")
+        self.concurrency = concurrency
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self.session = None
+        self._semaphore = None
+        self.scheduler = get_scheduler()
+
+    async def __aenter__(self):
+        await self.open()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def open(self):
+        if self.session is None:
+            connector = aiohttp.TCPConnector(limit=self.concurrency, limit_per_host=self.concurrency)
+            self.session = aiohttp.ClientSession(
+                connector=connector,
+                auth=self.auth,
+                timeout=self.timeout,
+                headers={"Accept": "application/json", "Accept-Encoding": "gzip, deflate"},
+            )
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+
+    async def close(self):
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    async def get_json(self, path, params=None):
+        """Esegue una GET e restituisce (status, json); json è None se la risposta non è 200."""
+        url = path if path.startswith(("http://", "https://")) else f"{self.base_url}{path}"
+        attempt = 0
+        while True:
+            wait = self.scheduler.reserve()
+            if wait:
+                await asyncio.sleep(wait)
+
+            async with self._semaphore:
+                sent = await self.scheduler.acquire_async()
+                start = time.perf_counter()
+                try:
+                    async with self.session.get(url, params=params) as resp:
+                        body = await resp.read()
+                except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                    delay = self.scheduler.retry_delay(attempt)
+                    if delay is None:
+                        raise
+                else:
+                    tracer = get_tracer()
+                    if tracer is not None:
+                        tracer.record_request("GET", str(resp.url), resp.status, start, time.perf_counter(),
+                                              len(body), resp.content_length)
+                    delay = self.scheduler.retry_delay(attempt, resp.status, resp.headers, sent)
+                    if delay is None:
+                        break
+                finally:
+                    self.scheduler.release()
+
+            attempt += 1
+            await asyncio.sleep(delay)
+
+        if resp.status != 200:
+            return resp.status, None
+        return resp.status, json.loads(body)
+
+    # === Dettagli di un'issue ===
+    async def get_issue_fields(self, issue_key, fields):
+        status, data = await self.get_json(f"/rest/api/3/issue/{issue_key}", {"fields": fields})
+        if data is None:
+            return None
+        return data.get("fields", {})
+
+    # === Commenti di un'issue: prima pagina, poi tutte le restanti in parallelo ===
+    async def get_raw_comments(self, issue_key, page_size=PAGE_SIZE):
+        url = f"/rest/api/3/issue/{issue_key}/comment"
+        status, first = await self.get_json(url, {"startAt": 0, "maxResults": page_size})
+        if first is None:
+            raise JiraResponseError(status, url)
+
+        comments = list(first.get("comments", []))
+        total = first.get("total", len(comments))
+        step = len(comments) or page_size
+        if not comments or len(comments) >= total:
+            return comments
+
+        pages = await asyncio.gather(*(
+            self.get_json(url, {"startAt": start_at, "maxResults": step})
+            for start_at in range(len(comments), total, step)
+        ))
+        for status, data in pages:
+            if data is None:
+                raise JiraResponseError(status, url)
+            comments.extend(data.get("comments", []))
+        return comments
+
+    # === Ricerca JQL con paginazione in pipeline ===
+    async def search_issues(self, jql, fields, path=SEARCH_PATH, page_size=PAGE_SIZE):
+        """Tutte le issue della JQL; JiraResponseError se una pagina, anche la prima, non è recuperabile."""
+        params = {"jql": jql, "fields": fields, "startAt": 0, "maxResults": page_size}
+        status, first = await self.get_json(path, params)
+        if first is None:
+            raise JiraResponseError(status, path)
+
+        issues = list(first.get("issues", []))
+        total = first.get("total")
+
+        if total is not None:
+            # Offset noti: tutte le pagine restanti partono insieme, l'ordine viene preservato da gather
+            step = len(issues) or page_size
+            if not issues or len(issues) >= total:
+                return issues
+            pages = await asyncio.gather(*(
+                self.get_json(path, {**params, "startAt": start_at, "maxResults": step})
+                for start_at in range(len(issues), total, step)
+            ))
+            for status, data in pages:
+                if data is None:
+                    raise JiraResponseError(status, path)
+                issues.extend(data.get("issues", []))
+            return issues
+
+        # Endpoint /search/jql senza total: cursore nextPageToken, una pagina dopo l'altra
+        data = first
+        while data.get("nextPageToken") and not data.get("isLast", False):
+            status, data = await self.get_json(path, {"jql": jql, "fields": fields, "maxResults": page_size,
+                                                      "nextPageToken": data["nextPageToken"]})
+            if data is None:
+                raise JiraResponseError(status, path)
+            issues.extend(data.get("issues", []))
+        return issues
+
+    # === Progetti delle issue restituite da una JQL ===
+    async def get_projects(self, jql, path=SEARCH_PATH):
+        issues = await self.search_issues(jql, "project", path=path)
+        return sorted({issue["fields"]["project"]["key"] for issue in issues})
@@ -0,0 +1,146 @@
+"""
+Cache locale persistente delle risposte Jira.
+
+Funzionalità principali:
+- Memorizza su SQLite le risposte (JSON compresso con zlib) indicizzate per codice issue ed endpoint
+  (es. "details", "comments").
+- Ogni voce conserva il campo `updated` dell'issue al momento del download: una voce è valida
+  solo finché l'issue su Jira riporta lo stesso `updated`.
+- Scadenza temporale (TTL) delle voci e limite di dimensione complessiva con eliminazione
+  delle voci usate meno di recente.
+
+Configurazione (variabili d'ambiente o file .env):
+- JIRA_CACHE          "0" per disattivare la cache (default attiva)
+- JIRA_CACHE_PATH     percorso del database (default ~/.jira-report/cache.sqlite)
+- JIRA_CACHE_TTL      durata massima di una voce in secondi (default 7 giorni)
+- JIRA_CACHE_MAX_MB   dimensione massima dei dati in cache in MB (default 200)
+
+Nome del file:
+- jira_cache.py
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+from dotenv import load_dotenv
+
+# === Caricamento variabili ambiente ===
+load_dotenv()
+
+# === Parametri della cache ===
+CACHE_ENABLED   = os.getenv("JIRA_CACHE", "1") != "0"
+CACHE_PATH      = os.getenv("JIRA_CACHE_PATH", os.path.join(os.path.expanduser("~"), ".jira-report", "cache.sqlite"))
+CACHE_TTL       = int(os.getenv("JIRA_CACHE_TTL", str(7 * 24 * 3600)))
+CACHE_MAX_BYTES = int(float(os.getenv("JIRA_CACHE_MAX_MB", "200")) * 1024 * 1024)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    issue_key   TEXT NOT NULL,
+    endpoint    TEXT NOT NULL,
+    updated     TEXT,
+    payload     BLOB NOT NULL,
+    size        INTEGER NOT NULL,
+    stored_at   REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    PRIMARY KEY (issue_key, endpoint)
+)
+"""
+
+# === Cache delle risposte Jira su SQLite ===
+class JiraCache:
+    def __init__(self, path=CACHE_PATH, ttl=CACHE_TTL, max_bytes=CACHE_MAX_BYTES):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(SCHEMA)
+
+    def lookup(self, issue_key, endpoint):
+        """Restituisce (payload, updated) se presente e non scaduta, altrimenti None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload, updated, stored_at FROM entries WHERE issue_key = ? AND endpoint = ?",
+                (issue_key, endpoint),
+            ).fetchone()
+            if row is None:
+                return None
+
+            payload, updated, stored_at = row
+            now = time.time()
+            if now - stored_at > self.ttl:
+                self._conn.execute("DELETE FROM entries WHERE issue_key = ? AND endpoint = ?", (issue_key, endpoint))
+                return None
+
+            self._conn.execute(
+                "UPDATE entries SET accessed_at = ? WHERE issue_key = ? AND endpoint = ?",
+                (now, issue_key, endpoint),
+            )
+        return json.loads(zlib.decompress(payload)), updated
+
+    def get(self, issue_key, endpoint, updated):
+        """Restituisce il payload solo se la voce corrisponde al valore `updated` attuale dell'issue."""
+        hit = self.lookup(issue_key, endpoint)
+        if hit is None or updated is None or hit[1] != updated:
+            return None
+        return hit[0]
+
+    def put(self, issue_key, endpoint, payload, updated):
+        blob = zlib.compress(json.dumps(payload, separators=(",", ":")).encode("utf-8"))
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (issue_key, endpoint, updated, payload, size, stored_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (issue_key, endpoint, updated, blob, len(blob), now, now),
+            )
+            self._evict(now)
+
+    def invalidate(self, issue_key, endpoint=None):
+        with self._lock:
+            if endpoint is None:
+                self._conn.execute("DELETE FROM entries WHERE issue_key = ?", (issue_key,))
+            else:
+                self._conn.execute("DELETE FROM entries WHERE issue_key = ? AND endpoint = ?", (issue_key, endpoint))
+
+    def _evict(self, now):
+        # Voci scadute
+        self._conn.execute("DELETE FROM entries WHERE stored_at < ?", (now - self.ttl,))
+
+        # Limite di dimensione: elimina le voci usate meno di recente fino al 90% del massimo
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        target = int(self.max_bytes * 0.9)
+        rows = self._conn.execute("SELECT issue_key, endpoint, size FROM entries ORDER BY accessed_at ASC").fetchall()
+        for issue_key, endpoint, size in rows:
+            if total <= target:
+                break
+            self._conn.execute("DELETE FROM entries WHERE issue_key = ? AND endpoint = ?", (issue_key, endpoint))
+            total -= size
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+# === Cache condivisa dal processo ===
+_shared_cache = None
+_shared_lock = threading.Lock()
+
+def get_cache():
+    """Restituisce la cache condivisa, oppure None se disattivata (JIRA_CACHE=0)."""
+    global _shared_cache
+    if not CACHE_ENABLED:
+        return None
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = JiraCache()
+        return _shared_cache
@@ -0,0 +1,184 @@
+"""
+Modulo condiviso per l'accesso alle API Jira.
+
+Funzionalità principali:
+- Un'unica `requests.Session` per processo, riutilizzata da tutte le chiamate degli script di report.
+- Connessioni persistenti (keep-alive): handshake TCP+TLS e autenticazione vengono impostati una sola volta.
+- Pool di connessioni configurabile (numero di host e connessioni massime per host).
+- Risposte compresse (gzip/deflate) richieste esplicitamente.
+- Tutte le richieste passano dal pianificatore condiviso (jira_ratelimit.py): limite di frequenza,
+  concorrenza adattiva, rispetto di Retry-After / X-RateLimit-* e nuovi tentativi per gli errori transitori.
+- Paginazione delle risorse Jira (iter_pages):
+    - a offset (`startAt`/`total`): dalla prima pagina si ricava `total` e le pagine restanti
+      vengono scaricate in parallelo, restituite nell'ordine originale;
+    - a cursore (`nextPageToken`, /rest/api/3/search/jql): la pagina successiva viene scaricata
+      mentre il chiamante elabora quella corrente.
+
+Configurazione (variabili d'ambiente o file .env):
+- JIRA_URL, JIRA_USERNAME, JIRA_API_TOKEN
+- JIRA_POOL_SIZE    connessioni massime verso lo stesso host (default 10)
+- JIRA_POOL_HOSTS   numero di host diversi mantenuti nel pool (default 4)
+- JIRA_TIMEOUT      timeout in secondi di ogni richiesta (default 60)
+- JIRA_PAGE_WORKERS pagine scaricate in parallelo da iter_pages (default 4)
+- JIRA_TRACE        registra latenza, stato e byte di ogni richiesta (jira_trace.py)
+
+Nome del file:
+- jira_client.py
+"""
+
+import os
+import threading
+import time
+
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+
+from jira_ratelimit import get_scheduler
+from jira_trace import get_tracer
+
+# === Caricamento variabili ambiente ===
+load_dotenv()
+
+# === Parametri del pool di connessioni ===
+POOL_SIZE       = int(os.getenv("JIRA_POOL_SIZE", "10"))
+POOL_HOSTS      = int(os.getenv("JIRA_POOL_HOSTS", "4"))
+TIMEOUT         = float(os.getenv("JIRA_TIMEOUT", "60"))
+PAGE_WORKERS    = int(os.getenv("JIRA_PAGE_WORKERS", "4"))
+PAGE_SIZE       = 100  # limite massimo Jira Cloud
+
+DEFAULT_HEADERS = {
+    "Accept": "application/json",
+    "Accept-Encoding": "gzip, deflate",
+    "Connection": "keep-alive",
+}
+
+# === Client Jira con sessione e pool di connessioni condivisi ===
+class JiraClient:
+    def __init__(self, base_url=None, username=None, api_token=None,
+                 pool_size=POOL_SIZE, pool_hosts=POOL_HOSTS, timeout=TIMEOUT, scheduler=None):
+        self.base_url = (base_url or os.getenv("JIRA_URL") or "").rstrip("/")
+        self.timeout = timeout
+        self.scheduler = scheduler or get_scheduler()
+
+        self.session = requests.Session()
+        self.session.auth = (username or os.getenv("JIRA_USERNAME"), api_token or os.getenv("JIRA_API_TOKEN"))
+        self.session.headers.update(DEFAULT_HEADERS)
+
+        # pool_block=True: oltre pool_size connessioni per host le richieste attendono
+        # una connessione libera invece di aprirne di nuove (e chiuderle subito dopo)
+        adapter = HTTPAdapter(pool_connections=pool_hosts, pool_maxsize=pool_size, pool_block=True)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def url(self, path):
+        if path.startswith(("http://", "https://")):
+            return path
+        return f"{self.base_url}{path}"
+
+    def get(self, path, params=None, **kwargs):
+        """
+        GET tramite il pianificatore: gli errori transitori (429, 502-504, connessione) vengono ripetuti;
+        esauriti i tentativi si riceve l'ultima risposta di errore o l'ultima eccezione.
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        url = self.url(path)
+        return self.scheduler.call(lambda: self._send(url, params, kwargs))
+
+    def _send(self, url, params, kwargs):
+        tracer = get_tracer()
+        if tracer is None:
+            return self.session.get(url, params=params, **kwargs)
+
+        start = time.perf_counter()
+        resp = self.session.get(url, params=params, **kwargs)
+        wire = resp.headers.get("Content-Length")
+        tracer.record_request("GET", resp.url, resp.status_code, start, time.perf_counter(),
+                              len(resp.content), int(wire) if wire and wire.isdigit() else None)
+        return resp
+
+    def get_page(self, path, params):
+        """GET di una pagina JSON; solleva requests.HTTPError se la risposta non è 200."""
+        resp = self.get(path, params=params)
+        if resp.status_code != 200:
+            raise requests.HTTPError(f"{resp.status_code} {resp.text}", response=resp)
+        return resp.json()
+
+    def iter_pages(self, path, params=None, items_key="issues", page_size=PAGE_SIZE, workers=PAGE_WORKERS):
+        """
+        Generatore degli elementi (`items_key`) di ogni pagina di una risorsa paginata, in ordine.
+        Solleva requests.HTTPError se una pagina non può essere recuperata.
+        """
+        params = {**(params or {}), "maxResults": page_size}
+        first = self.get_page(path, {**params, "startAt": 0})
+        items = first.get(items_key, [])
+        yield items
+
+        token = first.get("nextPageToken")
+        if token:
+            # Cursore: una pagina in anticipo rispetto al consumatore
+            cursor_params = {k: v for k, v in params.items() if k != "startAt"}
+            with ThreadPoolExecutor(max_workers=1) as pool:
+                pending = pool.submit(self.get_page, path, {**cursor_params, "nextPageToken": token})
+                while pending is not None:
+                    data = pending.result()
+                    token = data.get("nextPageToken")
+                    pending = None
+                    if token and not data.get("isLast", False):
+                        pending = pool.submit(self.get_page, path, {**cursor_params, "nextPageToken": token})
+                    yield data.get(items_key, [])
+            return
+
+        total = first.get("total")
+        if total is None or not items:
+            return
+
+        # Offset: Jira può restituire meno elementi di maxResults, il passo è quello della prima pagina
+        step = len(items)
+        offsets = range(len(items), total, step)
+        if not offsets:
+            return
+        # Finestra limitata di pagine in anticipo: le pagine già consegnate non restano in memoria
+        workers = max(1, min(workers, len(offsets)))
+        remaining = iter(offsets)
+        futures = deque()
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            def submit_next():
+                start_at = next(remaining, None)
+                if start_at is not None:
+                    futures.append(pool.submit(self.get_page, path, {**params, "startAt": start_at, "maxResults": step}))
+
+            for _ in range(2 * workers):
+                submit_next()
+            try:
+                while futures:
+                    fut = futures.popleft()
+                    submit_next()
+                    yield fut.result().get(items_key, [])
+            finally:
+                for fut in futures:
+                    fut.cancel()
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+# === Client condiviso dal processo ===
+_shared_client = None
+_shared_lock = threading.Lock()
+
+def get_client(**kwargs):
+    """Restituisce il client condiviso, creandolo alla prima chiamata con la configurazione da .env."""
+    global _shared_client
+    with _shared_lock:
+        if _shared_client is None:
+            _shared_client = JiraClient(**kwargs)
+        return _shared_client
@@ -0,0 +1,350 @@
+"""
+Servizio locale (daemon) che genera i report Jira su richiesta, con una coda di lavori.
+
+Funzionalità principali:
+- Carica una sola volta jira-project-report-v4.3.py e jira-tasks-report-v6.0.py (importlib,
+  i nomi dei file contengono trattini): sessione Jira autenticata con connessioni persistenti,
+  cache locale delle issue, python-docx e lxml restano caricati tra un lavoro e l'altro.
+- Coda di lavori servita da più worker in parallelo (thread):
+    - project   report di un ticket (come `jira-project-report-v4.3.py KEY [--stream]`)
+    - tasks     elenco attività di un progetto o di tutti (come `jira-tasks-report-v6.0.py X`)
+- Lavori che scrivono gli stessi file (stesso ticket, oppure due elenchi attività nella stessa
+  cartella) vengono eseguiti uno alla volta: un lock per percorso di output.
+- API HTTP in ascolto solo su localhost, protetta da un token creato all'avvio (header
+  X-Daemon-Token, salvato in JIRA_DAEMON_TOKEN_FILE per il client `submit`); i POST accettano solo
+  Content-Type application/json e output_dir deve restare dentro la cartella di output configurata:
+    - POST /jobs        {"type": "project", "key": "SAL-12", "stream": false, "output_dir": "..."}
+                        {"type": "tasks", "project": "SAL", "output_dir": "...", "export": ["parquet"]}
+                        -> 202 {"id": ..., "status": "queued"}
+    - GET  /jobs        elenco dei lavori (più recenti per ultimi)
+    - GET  /jobs/{id}   stato di un lavoro: queued, running, done, failed (con file generati o errore)
+    - GET  /health      worker, lavori in coda, lavori eseguiti
+
+Configurazione (variabili d'ambiente o file .env):
+- JIRA_URL, JIRA_USERNAME, JIRA_API_TOKEN (come gli script di report)
+- JIRA_DAEMON_PORT      porta su 127.0.0.1 (default 8766)
+- JIRA_DAEMON_WORKERS   lavori eseguiti in parallelo (default 4)
+- JIRA_DAEMON_OUTPUT    cartella radice dei file generati; output_dir dei lavori è relativo a questa (default cartella corrente)
+- JIRA_DAEMON_TOKEN     token dell'API (default: generato a ogni avvio)
+- JIRA_DAEMON_TOKEN_FILE file in cui il servizio scrive il token e da cui `submit` lo legge
+                        (default ~/.jira-report/daemon.token, leggibile solo dall'utente)
+
+Utilizzo:
+    python jira_daemon.py serve
+    python jira_daemon.py submit project SAL-12 --wait
+    python jira_daemon.py submit tasks tutti
+
+Nome del file:
+- jira_daemon.py
+"""
+
+import argparse
+import hmac
+import importlib.util
+import itertools
+import json
+import os
+import queue
+import re
+import secrets
+import sys
+import threading
+import time
+import traceback
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from dotenv import load_dotenv
+
+# === Caricamento variabili ambiente ===
+load_dotenv()
+
+# === Parametri del servizio ===
+HOST            = "127.0.0.1"
+PORT            = int(os.getenv("JIRA_DAEMON_PORT", "8766"))
+WORKERS         = int(os.getenv("JIRA_DAEMON_WORKERS", "4"))
+OUTPUT_DIR      = os.getenv("JIRA_DAEMON_OUTPUT", "")
+TOKEN           = os.getenv("JIRA_DAEMON_TOKEN")
+TOKEN_FILE      = os.getenv("JIRA_DAEMON_TOKEN_FILE",
+                            os.path.join(os.path.expanduser("~"), ".jira-report", "daemon.token"))
+TOKEN_HEADER    = "X-Daemon-Token"
+MAX_JOBS        = 1000  # lavori conclusi conservati per la consultazione dello stato
+
+SCRIPT_DIR      = os.path.dirname(os.path.abspath(__file__))
+PROJECT_REPORT  = os.path.join(SCRIPT_DIR, "jira-project-report-v4.3.py")
+TASKS_REPORT    = os.path.join(SCRIPT_DIR, "jira-tasks-report-v6.0.py")
+
+JOB_TYPES       = ("project", "tasks")
+RE_TICKET_KEY   = re.compile(r"^[A-Z][A-Z0-9_]*-\d+$")
+TASKS_LOCK_NAME = "elenco_attivita"   # file dei lavori tasks: elenco_attivita.* e file esportati
+
+# === Caricamento di uno script di report come modulo ===
+def load_script(path, name):
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+# === Coda dei lavori e worker ===
+class ReportDaemon:
+    def __init__(self, workers=WORKERS, output_dir=OUTPUT_DIR):
+        self.output_dir = os.path.realpath(output_dir or os.getcwd())
+        self.jobs = {}
+        self._lock = threading.Lock()
+        self._path_locks = {}   # percorso di output -> lock dei lavori che lo scrivono
+        self._queue = queue.Queue()
+        self._ids = itertools.count(1)
+
+        # Moduli caricati una volta: client Jira e cache condivisi da tutti i lavori
+        if SCRIPT_DIR not in sys.path:
+            sys.path.insert(0, SCRIPT_DIR)
+        self.project_report = load_script(PROJECT_REPORT, "jira_project_report")
+        self.tasks_report = load_script(TASKS_REPORT, "jira_tasks_report")
+        self._warm_up()
+
+        self._workers = [threading.Thread(target=self._worker, name=f"report-worker-{i + 1}", daemon=True)
+                         for i in range(max(1, workers))]
+        for t in self._workers:
+            t.start()
+
+    def _warm_up(self):
+        # python-docx, lxml e il modello .docx predefinito vengono caricati prima del primo lavoro
+        self.project_report._load_docx()
+        self.project_report.Document()
+
+    def submit(self, spec):
+        """Accoda un lavoro e ne restituisce lo stato; solleva ValueError se la richiesta non è valida."""
+        job_type = spec.get("type")
+        if job_type not in JOB_TYPES:
+            raise ValueError(f"Tipo di lavoro non valido: {job_type!r} (ammessi: {', '.join(JOB_TYPES)})")
+        if job_type == "project" and not RE_TICKET_KEY.match(str(spec.get("key") or "")):
+            raise ValueError("Il lavoro 'project' richiede un codice ticket valido (key, es. SAL-12)")
+        output_dir = self.resolve_output_dir(spec.get("output_dir"))
+
+        job = {
+            "id": str(next(self._ids)),
+            "type": job_type,
+            "spec": spec,
+            "output_dir": output_dir,
+            "status": "queued",
+            "submitted": time.time(),
+            "started": None,
+            "finished": None,
+            "files": [],
+            "error": None,
+        }
+        with self._lock:
+            self.jobs[job["id"]] = job
+            self._trim()
+        self._queue.put(job["id"])
+        return self.status(job["id"])
+
+    def resolve_output_dir(self, requested):
+        """Cartella di output del lavoro: relativa alla radice configurata, ValueError se ne esce."""
+        if requested is not None and not isinstance(requested, str):
+            raise ValueError("output_dir deve essere una stringa")
+        path = os.path.realpath(os.path.join(self.output_dir, requested or ""))
+        if os.path.commonpath([self.output_dir, path]) != self.output_dir:
+            raise ValueError(f"output_dir deve essere dentro {self.output_dir}")
+        return path
+
+    def _path_lock(self, path):
+        with self._lock:
+            return self._path_locks.setdefault(path, threading.Lock())
+
+    def _trim(self):
+        # Rimuove i lavori conclusi più vecchi oltre MAX_JOBS (i dizionari mantengono l'ordine di inserimento)
+        excess = len(self.jobs) - MAX_JOBS
+        for job_id in [j for j, job in self.jobs.items() if job["status"] in ("done", "failed")][:max(0, excess)]:
+            del self.jobs[job_id]
+
+    def status(self, job_id):
+        with self._lock:
+            job = self.jobs.get(job_id)
+            return None if job is None else {k: v for k, v in job.items()}
+
+    def list_jobs(self):
+        with self._lock:
+            return [{k: v for k, v in job.items()} for job in self.jobs.values()]
+
+    def health(self):
+        with self._lock:
+            done = sum(1 for job in self.jobs.values() if job["status"] in ("done", "failed"))
+        return {"workers": len(self._workers), "queued": self._queue.qsize(), "completed": done}
+
+    def _worker(self):
+        while True:
+            job_id = self._queue.get()
+            with self._lock:
+                job = self.jobs.get(job_id)
+                if job is None:
+                    continue
+                job["status"] = "running"
+                job["started"] = time.time()
+            try:
+                files = self._run(job["type"], job["spec"], job["output_dir"])
+                status, error = "done", None
+            except Exception as e:
+                traceback.print_exc()
+                files, status, error = [], "failed", f"{type(e).__name__}: {e}"
+            with self._lock:
+                job.update(status=status, files=files, error=error, finished=time.time())
+
+    def _run(self, job_type, spec, output_dir):
+        os.makedirs(output_dir, exist_ok=True)
+
+        if job_type == "project":
+            key = spec["key"]
+            filename = os.path.join(output_dir, f"{key}_report.docx")
+            generate = self.project_report.generate_report_streaming if spec.get("stream") else self.project_report.generate_report
+            with self._path_lock(filename):
+                if not generate(key, output_dir):
+                    raise RuntimeError(f"Errore nel recupero ticket {key}")
+            return [filename]
+
+        project = spec.get("project")
+        if project and project.lower() in ("tutti", "all"):
+            project = None
+        formats = ["csv"] + list(spec.get("export") or [])
+        # Nomi dei file fissi (elenco_attivita.*): un solo lavoro tasks alla volta per cartella
+        with self._path_lock(os.path.join(output_dir, TASKS_LOCK_NAME)):
+            paths = self.tasks_report.generate_task_report(project, output_dir=output_dir, formats=formats)
+        return [os.path.abspath(p) for p in paths]
+
+# === API HTTP ===
+class DaemonHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    daemon = None   # ReportDaemon, impostato da make_server
+    token = None    # token richiesto in X-Daemon-Token, impostato da make_server
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, obj, status=200):
+        body = json.dumps(obj, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _authorized(self):
+        # Un header personalizzato non può essere inviato da un'altra pagina web senza preflight CORS
+        if hmac.compare_digest(self.headers.get(TOKEN_HEADER, "").encode(), self.token.encode()):
+            return True
+        self._send({"error": "Token mancante o non valido"}, 401)
+        return False
+
+    def do_GET(self):
+        if not self._authorized():
+            return
+        if self.path == "/health":
+            return self._send(self.daemon.health())
+        if self.path == "/jobs":
+            return self._send(self.daemon.list_jobs())
+        if self.path.startswith("/jobs/"):
+            job = self.daemon.status(self.path[len("/jobs/"):])
+            if job is None:
+                return self._send({"error": "Lavoro inesistente"}, 404)
+            return self._send(job)
+        self._send({"error": f"Percorso non valido: {self.path}"}, 404)
+
+    def do_POST(self):
+        if not self._authorized():
+            return
+        if self.path != "/jobs":
+            return self._send({"error": f"Percorso non valido: {self.path}"}, 404)
+        content_type = self.headers.get("Content-Type", "").split(";")[0].strip().lower()
+        if content_type != "application/json":
+            return self._send({"error": "Content-Type deve essere application/json"}, 415)
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            spec = json.loads(self.rfile.read(length) or b"{}")
+            if not isinstance(spec, dict):
+                raise ValueError("Il corpo della richiesta deve essere un oggetto JSON")
+            job = self.daemon.submit(spec)
+        except ValueError as e:
+            return self._send({"error": str(e)}, 400)
+        self._send(job, 202)
+
+def make_server(daemon, token, host=HOST, port=PORT):
+    handler = type("Handler", (DaemonHandler,), {"daemon": daemon, "token": token})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+# === Token dell'API: creato all'avvio e condiviso con il client tramite un file privato ===
+def save_token(token, path=TOKEN_FILE):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(token)
+    os.chmod(path, 0o600)
+
+def load_token(path=TOKEN_FILE):
+    if TOKEN:
+        return TOKEN
+    try:
+        with open(path, encoding="utf-8") as f:
+            return f.read().strip()
+    except OSError:
+        raise RuntimeError(f"Token del servizio non trovato in {path}: il servizio è avviato?") from None
+
+# === Client da riga di comando ===
+def submit_job(spec, port=PORT, wait=False, poll=0.5):
+    import requests
+
+    base = f"http://{HOST}:{port}"
+    headers = {TOKEN_HEADER: load_token()}
+    resp = requests.post(f"{base}/jobs", json=spec, headers=headers, timeout=10)
+    job = resp.json()
+    if resp.status_code != 202:
+        raise RuntimeError(job.get("error", resp.text))
+
+    while wait and job["status"] in ("queued", "running"):
+        time.sleep(poll)
+        job = requests.get(f"{base}/jobs/{job['id']}", headers=headers, timeout=10).json()
+    return job
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Servizio locale per i report Jira")
+    parser.add_argument("--port", type=int, default=PORT)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    serve = sub.add_parser("serve", help="avvia il servizio")
+    serve.add_argument("--workers", type=int, default=WORKERS)
+    serve.add_argument("--output-dir", default=OUTPUT_DIR)
+
+    submit = sub.add_parser("submit", help="accoda un lavoro al servizio in esecuzione")
+    submit.add_argument("type", choices=JOB_TYPES)
+    submit.add_argument("target", nargs="?", help="codice ticket (project) oppure progetto/tutti (tasks)")
+    submit.add_argument("--stream", action="store_true", help="commenti in streaming (solo project)")
+    submit.add_argument("--output-dir", help="cartella relativa alla cartella di output del servizio")
+    submit.add_argument("--export", action="append", help="formato di esportazione aggiuntivo (solo tasks)")
+    submit.add_argument("--wait", action="store_true", help="attende la fine del lavoro")
+    args = parser.parse_args(argv)
+
+    if args.command == "serve":
+        daemon = ReportDaemon(workers=args.workers, output_dir=args.output_dir)
+        token = TOKEN or secrets.token_urlsafe(32)
+        save_token(token)
+        server = make_server(daemon, token, port=args.port)
+        print(f"Servizio report Jira su http://{HOST}:{args.port} ({len(daemon._workers)} worker)")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        return 0
+
+    spec = {"type": args.type, "output_dir": args.output_dir}
+    if args.type == "project":
+        spec.update(key=args.target, stream=args.stream)
+    else:
+        spec.update(project=args.target, export=args.export)
+    job = submit_job(spec, port=args.port, wait=args.wait)
+    print(json.dumps(job, indent=2, ensure_ascii=False))
+    return 1 if job["status"] == "failed" else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
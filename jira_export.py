@@ -0,0 +1,272 @@
+"""
+Esportazione dell'elenco issue in formati per l'analisi dati: CSV, NDJSON tipizzato, Arrow IPC, Parquet.
+
+Funzionalità principali:
+- Stesso insieme di colonne per tutti i formati (COLUMNS): chiave, titolo, stato, priorità,
+  data di creazione, scadenza, progetto.
+- Colonne tipizzate dove il formato lo consente:
+    - created    timestamp con fuso orario (UTC), non più stringa ISO
+    - due        data (giorno), null se assente
+    - status, priority, project, project_name   colonne categoriche (dizionario)
+- Scrittura in streaming: il chiamante passa le issue a blocchi (es. una pagina della ricerca alla
+  volta) e l'esportatore scrive un gruppo di righe ogni ROW_GROUP_SIZE issue, senza tenere in memoria
+  l'intero elenco.
+- Esportatori registrati in EXPORTERS: per un nuovo formato basta una sottoclasse di Exporter
+  che implementi _open, _write_block e _close (metodi astratti).
+
+Formati:
+- csv       elenco_attivita.csv come in jira-tasks-report-v6.0.py (stringhe, date ISO di Jira)
+- ndjson    una issue JSON per riga; created ISO 8601 in UTC, due AAAA-MM-GG, null per i valori assenti
+- arrow     Arrow IPC in formato stream (.arrows): pyarrow.ipc.open_stream(...).read_all()
+- parquet   un row group ogni ROW_GROUP_SIZE issue: pyarrow.parquet.read_table(...) o pandas.read_parquet(...)
+
+Prerequisiti:
+- arrow e parquet richiedono pyarrow (importato solo quando si usa uno dei due formati).
+
+Configurazione (variabili d'ambiente o file .env):
+- JIRA_EXPORT_ROW_GROUP   issue per gruppo di righe / blocco Arrow (default 10000)
+
+Le issue sono oggetti con gli attributi key, summary, status, priority, created, due, project,
+project_name (es. IssueRecord di jira-tasks-report-v6.0.py).
+
+Nome del file:
+- jira_export.py
+"""
+
+import csv
+import json
+import os
+import re
+
+from abc import ABC, abstractmethod
+from datetime import date, datetime, timezone
+
+from dotenv import load_dotenv
+
+# === Caricamento variabili ambiente ===
+load_dotenv()
+
+ROW_GROUP_SIZE  = int(os.getenv("JIRA_EXPORT_ROW_GROUP", "10000"))
+
+# === Colonne esportate: (nome, tipo) ===
+COLUMNS = [
+    ("key",          "string"),
+    ("summary",      "string"),
+    ("status",       "category"),
+    ("priority",     "category"),
+    ("created",      "timestamp"),
+    ("due",          "date"),
+    ("project",      "category"),
+    ("project_name", "category"),
+]
+
+# Fuso orario di Jira senza i due punti (+0200) o "Z": datetime.fromisoformat li accetta solo da Python 3.11
+RE_TZ_OFFSET    = re.compile(r"([+-]\d{2})(\d{2})$")
+
+# Intestazioni del CSV storico di jira-tasks-report-v6.0.py (elenco_attivita.csv)
+CSV_HEADER      = ["Key", "Summary", "Status", "Priority", "Created", "Due Date", "Project"]
+
+# === Conversione dei valori di Jira nei tipi esportati ===
+def to_timestamp(value):
+    """"2025-08-13T09:41:22.123+0200" -> datetime in UTC; None se assente."""
+    if not value:
+        return None
+    if value.endswith("Z"):
+        value = value[:-1] + "+00:00"
+    when = datetime.fromisoformat(RE_TZ_OFFSET.sub(r"\1:\2", value))
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return when.astimezone(timezone.utc)
+
+def to_date(value):
+    return date.fromisoformat(value[:10]) if value else None
+
+def typed_row(issue):
+    """Valori tipizzati di una issue, nell'ordine di COLUMNS ("" diventa None)."""
+    return (
+        issue.key,
+        issue.summary,
+        issue.status or None,
+        issue.priority or None,
+        to_timestamp(issue.created),
+        to_date(issue.due),
+        issue.project or None,
+        issue.project_name or None,
+    )
+
+# === Interfaccia comune degli esportatori ===
+class Exporter(ABC):
+    name = ""
+    extension = ""
+
+    def __init__(self, path, row_group_size=ROW_GROUP_SIZE):
+        self.path = path
+        self.tmp_path = path + ".tmp"   # il file definitivo compare solo con close()
+        self.row_group_size = max(1, row_group_size)
+        self.rows = 0
+        self._pending = []
+        self._open()
+
+    def write(self, issues):
+        """Accoda un blocco di issue; scrive un gruppo di righe ogni row_group_size issue."""
+        self._pending.extend(issues)
+        while len(self._pending) >= self.row_group_size:
+            block = self._pending[:self.row_group_size]
+            del self._pending[:self.row_group_size]
+            self._flush(block)
+
+    def close(self):
+        if self._pending:
+            self._flush(self._pending)
+            self._pending = []
+        self._close()
+        os.replace(self.tmp_path, self.path)
+
+    def abort(self):
+        """Chiude e scarta il file temporaneo: un'esportazione parziale non sostituisce quella precedente."""
+        self._pending = []
+        try:
+            self._close()
+        finally:
+            if os.path.exists(self.tmp_path):
+                os.remove(self.tmp_path)
+
+    def _flush(self, block):
+        self._write_block(block)
+        self.rows += len(block)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    # Da implementare nelle sottoclassi
+    @abstractmethod
+    def _open(self):
+        """Crea il file temporaneo (tmp_path) e scrive l'eventuale intestazione."""
+
+    @abstractmethod
+    def _write_block(self, block):
+        """Scrive un gruppo di righe."""
+
+    @abstractmethod
+    def _close(self):
+        """Chiude il file temporaneo."""
+
+# === CSV (stringhe come restituite da Jira) ===
+class CsvExporter(Exporter):
+    name = "csv"
+    extension = ".csv"
+
+    def _open(self):
+        self._file = open(self.tmp_path, mode="w", newline="", encoding="utf-8")
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(CSV_HEADER)
+
+    def _write_block(self, block):
+        self._writer.writerows(
+            [issue.key, issue.summary, issue.status, issue.priority, issue.created, issue.due, issue.project]
+            for issue in block
+        )
+
+    def _close(self):
+        self._file.close()
+
+# === NDJSON tipizzato ===
+class NdjsonExporter(Exporter):
+    name = "ndjson"
+    extension = ".ndjson"
+
+    def _open(self):
+        self._file = open(self.tmp_path, mode="w", encoding="utf-8")
+        self._names = [name for name, _ in COLUMNS]
+
+    def _write_block(self, block):
+        lines = []
+        for issue in block:
+            row = {name: value.isoformat() if isinstance(value, (date, datetime)) else value
+                   for name, value in zip(self._names, typed_row(issue))}
+            lines.append(json.dumps(row, ensure_ascii=False))
+        self._file.write("\n".join(lines) + "\n")
+
+    def _close(self):
+        self._file.close()
+
+# === Formati Arrow (pyarrow opzionale) ===
+def _import_pyarrow(fmt):
+    try:
+        import pyarrow
+    except ImportError as e:
+        raise ImportError(f"L'esportazione {fmt} richiede pyarrow (pip install pyarrow)") from e
+    return pyarrow
+
+class _ArrowExporter(Exporter):
+    """Base per arrow e parquet: converte ogni blocco in una RecordBatch tipizzata."""
+
+    def _open(self):
+        pa = self._pa = _import_pyarrow(self.name)
+        types = {
+            "string": pa.string(),
+            "category": pa.dictionary(pa.int32(), pa.string()),
+            "timestamp": pa.timestamp("ms", tz="UTC"),
+            "date": pa.date32(),
+        }
+        self.schema = pa.schema([(name, types[kind]) for name, kind in COLUMNS])
+        self._writer = None
+        self._open_writer()
+
+    @abstractmethod
+    def _open_writer(self):
+        """Crea lo scrittore pyarrow su tmp_path con self.schema."""
+
+    def _batch(self, block):
+        pa = self._pa
+        columns = list(zip(*(typed_row(issue) for issue in block)))
+        arrays = []
+        for (name, kind), values in zip(COLUMNS, columns):
+            if kind == "category":
+                arrays.append(pa.array(values, type=pa.string()).dictionary_encode())
+            else:
+                arrays.append(pa.array(values, type=self.schema.field(name).type))
+        return pa.RecordBatch.from_arrays(arrays, schema=self.schema)
+
+    def _close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+class ArrowExporter(_ArrowExporter):
+    name = "arrow"
+    extension = ".arrows"
+
+    def _open_writer(self):
+        # Formato stream: ogni blocco può avere il proprio dizionario delle colonne categoriche
+        self._writer = self._pa.ipc.new_stream(self.tmp_path, self.schema)
+
+    def _write_block(self, block):
+        self._writer.write_batch(self._batch(block))
+
+class ParquetExporter(_ArrowExporter):
+    name = "parquet"
+    extension = ".parquet"
+
+    def _open_writer(self):
+        import pyarrow.parquet as pq
+        self._writer = pq.ParquetWriter(self.tmp_path, self.schema, compression="zstd")
+
+    def _write_block(self, block):
+        # Una chiamata = un row group
+        self._writer.write_table(self._pa.Table.from_batches([self._batch(block)]), row_group_size=len(block))
+
+# === Registro dei formati ===
+EXPORTERS = {cls.name: cls for cls in (CsvExporter, NdjsonExporter, ArrowExporter, ParquetExporter)}
+
+def get_exporter(fmt, path, row_group_size=ROW_GROUP_SIZE):
+    """Apre l'esportatore del formato indicato; ValueError se il formato non esiste."""
+    if fmt not in EXPORTERS:
+        raise ValueError(f"Formato non valido: {fmt} (ammessi: {', '.join(EXPORTERS)})")
+    return EXPORTERS[fmt](path, row_group_size)
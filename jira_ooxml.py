@@ -0,0 +1,186 @@
+"""
+Scrittura diretta di documenti Word (.docx): word/document.xml generato come flusso di testo XML.
+
+Funzionalità principali:
+- DocxStreamWriter: copia nel nuovo .docx tutte le parti di un documento modello (stili, impostazioni,
+  proprietà, relazioni) e scrive word/document.xml direttamente nel file zip, a blocchi, man mano
+  che il chiamante produce i paragrafi. Nessun oggetto python-docx/lxml per paragrafi e run:
+  la memoria non cresce con la lunghezza del documento. Il pacchetto viene scritto in path + ".tmp"
+  e sostituisce `path` solo in close(): un'interruzione lascia intatto il documento precedente.
+- Frammenti XML con le stesse regole di python-docx, così il risultato è equivalente a quello
+  costruito con l'API a oggetti:
+    - run_xml: testo di un run (\\t -> <w:tab/>, \\n e \\r -> <w:br/>, xml:space="preserve"
+      se il testo inizia o finisce con spazi);
+    - paragraph_xml: paragrafo con proprietà e run (<w:p/> se vuoto);
+    - element_xml: serializzazione di un elemento lxml senza dichiarazioni di namespace, per
+      precalcolare rPr/pPr/tabelle con python-docx una sola volta e riusarli come testo.
+- DocxAppendWriter: aggiunge paragrafi in fondo al corpo di un .docx esistente (prima delle
+  proprietà di sezione finali) senza analizzarne l'XML: il vecchio word/document.xml viene copiato
+  a blocchi. Il file viene sostituito solo a operazione conclusa.
+
+Il modello è un .docx (bytes) con il corpo vuoto: le sue proprietà di sezione (margini) chiudono
+il corpo del documento generato.
+
+Nome del file:
+- jira_ooxml.py
+"""
+
+import os
+import re
+import zipfile
+
+from io import BytesIO
+from xml.sax.saxutils import escape
+
+DOCUMENT_PART   = "word/document.xml"
+FLUSH_CHARS     = 1 << 16  # caratteri accumulati prima di comprimere e scrivere un blocco
+
+# Caratteri non ammessi in XML 1.0 (lxml li rifiuta: qui vengono scartati)
+RE_XML_INVALID  = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]")
+RE_XMLNS        = re.compile(r' xmlns:\w+="[^"]*"')
+RE_RUN_SPLIT    = re.compile(r"([\t\r\n])")
+
+# === Frammenti XML ===
+def element_xml(element):
+    """XML di un elemento lxml come appare dentro word/document.xml (senza xmlns ripetuti)."""
+    from lxml import etree
+    return RE_XMLNS.sub("", etree.tostring(element, encoding="unicode"))
+
+def _t_xml(text):
+    if len(text.strip()) < len(text):
+        return f'<w:t xml:space="preserve">{escape(text)}</w:t>'
+    return f"<w:t>{escape(text)}</w:t>"
+
+def run_xml(text, rpr=""):
+    """Run con testo e proprietà (rpr: XML di <w:rPr>, vuoto se nessuno stile)."""
+    if not text:
+        return f"<w:r>{rpr}</w:r>" if rpr else "<w:r/>"
+    text = RE_XML_INVALID.sub("", text)
+    parts = [f"<w:r>{rpr}"]
+    for piece in RE_RUN_SPLIT.split(text):
+        if piece == "\t":
+            parts.append("<w:tab/>")
+        elif piece in ("\r", "\n"):
+            parts.append("<w:br/>")
+        elif piece:
+            parts.append(_t_xml(piece))
+    parts.append("</w:r>")
+    return "".join(parts)
+
+def paragraph_xml(runs="", ppr=""):
+    """Paragrafo con proprietà (ppr: XML di <w:pPr>) e run già serializzati."""
+    if not runs and not ppr:
+        return "<w:p/>"
+    return f"<w:p>{ppr}{runs}</w:p>"
+
+# === Scrittura del pacchetto .docx ===
+class DocxStreamWriter:
+    def __init__(self, path, template):
+        """path: file .docx da creare; template: bytes di un .docx modello con il corpo vuoto."""
+        self.path = path
+        self._target = path + ".tmp"   # file scritto (rinominato in path da close, rimosso da abort)
+        self._source = zipfile.ZipFile(BytesIO(template))
+        self._open_document()
+
+        document = self._source.read(DOCUMENT_PART).decode("utf-8")
+        body = document.index("<w:body>") + len("<w:body>")
+        self._head, self._tail = document[:body], document[body:]
+        self._parts = [self._head]
+        self._pending = len(self._head)
+
+    def _open_document(self):
+        # Parti che precedono word/document.xml copiate subito, le successive in close()
+        names = self._source.namelist()
+        index = names.index(DOCUMENT_PART)
+        self._after = names[index + 1:]
+        self._zip = zipfile.ZipFile(self._target, "w", zipfile.ZIP_DEFLATED)
+        for name in names[:index]:
+            self._copy(name)
+        self._out = self._zip.open(DOCUMENT_PART, "w")
+
+    def _copy(self, name):
+        self._zip.writestr(name, self._source.read(name), compress_type=zipfile.ZIP_DEFLATED)
+
+    def write(self, xml):
+        self._parts.append(xml)
+        self._pending += len(xml)
+        if self._pending >= FLUSH_CHARS:
+            self.flush()
+
+    def flush(self):
+        self._out.write("".join(self._parts).encode("utf-8"))
+        self._parts = []
+        self._pending = 0
+
+    def close(self):
+        self.write(self._tail)
+        self.flush()
+        self._out.close()
+        for name in self._after:
+            self._copy(name)
+        self._zip.close()
+        self._source.close()
+        os.replace(self._target, self.path)
+
+    def abort(self):
+        """Chiude e rimuove il file incompleto; un documento `path` già esistente resta invariato."""
+        try:
+            self._out.close()
+            self._zip.close()
+            self._source.close()
+        finally:
+            if os.path.exists(self._target):
+                os.remove(self._target)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+class DocxAppendWriter(DocxStreamWriter):
+    """
+    Come DocxStreamWriter, ma il contenuto scritto viene aggiunto in fondo al corpo del .docx
+    esistente `path`. Come per DocxStreamWriter il nuovo pacchetto sostituisce l'originale solo in
+    close(): con abort() (o un'eccezione nel blocco with) il documento resta invariato.
+    ValueError se il corpo del documento non termina con le proprietà di sezione o </w:body>.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._target = path + ".tmp"
+        self._source = zipfile.ZipFile(path)
+        try:
+            self._open_document()
+        except Exception:
+            self._source.close()
+            raise
+        try:
+            self._tail = self._copy_body()
+        except Exception:
+            self.abort()
+            raise
+        self._parts = []
+        self._pending = 0
+
+    def _copy_body(self):
+        # Il vecchio document.xml viene copiato a blocchi trattenendo l'ultimo: le proprietà di
+        # sezione finali (<w:sectPr> del corpo) e la chiusura del documento sono al suo interno
+        held = b""
+        with self._source.open(DOCUMENT_PART) as src:
+            for block in iter(lambda: src.read(FLUSH_CHARS), b""):
+                held += block
+                if len(held) > 2 * FLUSH_CHARS:
+                    self._out.write(held[:-FLUSH_CHARS])
+                    held = held[-FLUSH_CHARS:]
+
+        cut = held.rfind(b"<w:sectPr")
+        if cut < 0:
+            cut = held.rfind(b"</w:body>")
+        if cut < 0:
+            raise ValueError(f"{self.path}: fine del corpo del documento non trovata")
+        self._out.write(held[:cut])
+        return held[cut:].decode("utf-8")
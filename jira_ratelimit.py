@@ -0,0 +1,278 @@
+"""
+Pianificatore delle richieste verso Jira Cloud: limiti di frequenza, concorrenza adattiva e tentativi.
+
+Funzionalità principali:
+- Token bucket condiviso da tutti i thread del processo: al massimo JIRA_RATE richieste al secondo
+  con raffiche fino a JIRA_BURST.
+- Concorrenza adattiva AIMD: il numero di richieste contemporanee cresce di 1 ogni `limite`
+  risposte 2xx/3xx e si dimezza a un 429/503 o quando Jira segnala l'avvicinarsi del limite
+  (X-RateLimit-NearLimit, X-RateLimit-Remaining basso). Il dimezzamento avviene al massimo una
+  volta per finestra: le risposte a richieste inviate prima dell'ultimo dimezzamento lo ignorano.
+- `Retry-After` e `X-RateLimit-Reset` sospendono tutte le richieste fino all'istante indicato.
+- Errori transitori (429, 502, 503, 504, errori di connessione e timeout) vengono ripetuti con
+  backoff esponenziale e jitter ("full jitter"); esauriti i tentativi viene restituita l'ultima
+  risposta (o sollevata l'ultima eccezione), così il chiamante non scambia un errore per dati vuoti.
+
+Il client sincrono (jira_client.py) usa `RequestScheduler.call`; il motore asincrono
+(jira_async.py) usa `reserve`, `acquire_async`/`release` e `retry_delay` per attendere con asyncio.
+Il limite di concorrenza è condiviso tra thread e cicli di eventi.
+
+Configurazione (variabili d'ambiente o file .env):
+- JIRA_RATE             richieste al secondo (default 20)
+- JIRA_BURST            richieste consentite in raffica (default 20)
+- JIRA_MAX_RETRIES      tentativi aggiuntivi per gli errori transitori (default 5)
+- JIRA_MAX_CONCURRENCY  limite massimo di richieste contemporanee (default JIRA_POOL_SIZE o 10)
+
+Nome del file:
+- jira_ratelimit.py
+"""
+
+import asyncio
+import os
+import random
+import threading
+import time
+
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+import requests
+from dotenv import load_dotenv
+
+# === Caricamento variabili ambiente ===
+load_dotenv()
+
+# === Parametri del pianificatore ===
+RATE            = float(os.getenv("JIRA_RATE", "20"))
+BURST           = float(os.getenv("JIRA_BURST", "20"))
+MAX_RETRIES     = int(os.getenv("JIRA_MAX_RETRIES", "5"))
+MAX_CONCURRENCY = int(os.getenv("JIRA_MAX_CONCURRENCY", os.getenv("JIRA_POOL_SIZE", "10")))
+MIN_CONCURRENCY = 1
+
+BACKOFF_BASE    = 0.5   # secondi, primo intervallo di attesa prima del jitter
+BACKOFF_CAP     = 30.0  # secondi, attesa massima tra due tentativi
+NEAR_LIMIT_LEFT = 0.1   # frazione di X-RateLimit-Remaining sotto la quale si rallenta
+
+RETRY_STATUS    = frozenset({429, 502, 503, 504})
+THROTTLE_STATUS = frozenset({429, 503})
+RETRY_ERRORS    = (requests.ConnectionError, requests.Timeout)
+
+# === Lettura degli header di limitazione ===
+def parse_retry_after(value):
+    """Secondi indicati da Retry-After (numero di secondi oppure data HTTP); None se assente o non valido."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+def parse_reset(value):
+    """Secondi mancanti a X-RateLimit-Reset (data ISO 8601); None se assente o non valido."""
+    if not value:
+        return None
+    try:
+        when = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+def backoff_delay(attempt, base=BACKOFF_BASE, cap=BACKOFF_CAP):
+    """Full jitter: attesa casuale tra 0 e min(cap, base * 2^attempt)."""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+def _resolve(waiter):
+    if not waiter.done():
+        waiter.set_result(None)
+
+# === Pianificatore condiviso ===
+class RequestScheduler:
+    def __init__(self, rate=RATE, burst=BURST, max_retries=MAX_RETRIES,
+                 max_concurrency=MAX_CONCURRENCY, min_concurrency=MIN_CONCURRENCY):
+        self.rate = rate
+        self.burst = max(1.0, burst)
+        self.max_retries = max_retries
+        self.max_concurrency = max(min_concurrency, max_concurrency)
+        self.min_concurrency = min_concurrency
+
+        self.limit = float(self.max_concurrency)   # concorrenza corrente (AIMD)
+        self.in_flight = 0
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.decreased_at = float("-inf")          # istante dell'ultimo dimezzamento
+        self.stats = {"requests": 0, "retries": 0, "throttled": 0}
+        self._cond = threading.Condition()
+        self._async_waiters = []                   # (ciclo di eventi, future) in attesa di un posto
+
+    # === Token bucket e sospensioni ===
+    def _refill(self, now):
+        if self.rate > 0:
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self):
+        """Prenota un token e restituisce i secondi da attendere prima di inviare la richiesta."""
+        with self._cond:
+            now = time.monotonic()
+            self._refill(now)
+            wait = max(0.0, self.paused_until - now)
+            if self.rate > 0:
+                self.tokens -= 1
+                if self.tokens < 0:
+                    wait = max(wait, -self.tokens / self.rate)
+            return wait
+
+    def pause(self, seconds):
+        with self._cond:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+    def _count(self, name):
+        with self._cond:
+            self.stats[name] += 1
+
+    # === Concorrenza adattiva ===
+    def _take_slot(self):
+        # Da chiamare con il lock acquisito; restituisce l'istante di invio della richiesta
+        self.in_flight += 1
+        self.stats["requests"] += 1
+        return time.monotonic()
+
+    def acquire(self):
+        """Attende un posto libero entro il limite corrente; restituisce l'istante di invio (da passare a observe)."""
+        with self._cond:
+            while self.in_flight >= int(self.limit):
+                self._cond.wait()
+            return self._take_slot()
+
+    async def acquire_async(self):
+        """Come acquire, ma l'attesa non blocca il ciclo di eventi."""
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._cond:
+                if self.in_flight < int(self.limit):
+                    return self._take_slot()
+                waiter = loop.create_future()
+                self._async_waiters.append((loop, waiter))
+            await waiter
+
+    def release(self):
+        with self._cond:
+            self.in_flight -= 1
+            self._wake()
+
+    def _wake(self):
+        # Da chiamare con il lock acquisito: risveglia i thread e le coroutine in attesa di un posto
+        self._cond.notify_all()
+        for loop, waiter in self._async_waiters:
+            if not waiter.done() and not loop.is_closed():   # coroutine annullata o ciclo terminato
+                loop.call_soon_threadsafe(_resolve, waiter)
+        self._async_waiters.clear()
+
+    def _increase(self):
+        # Additive increase: circa +1 ogni `limit` risposte riuscite
+        with self._cond:
+            self.limit = min(self.max_concurrency, self.limit + 1.0 / self.limit)
+            self._wake()
+
+    def _decrease(self, sent=None):
+        # Multiplicative decrease, una volta per finestra: le richieste già in volo al momento
+        # del dimezzamento precedente riflettono ancora il vecchio limite e vengono ignorate
+        with self._cond:
+            if sent is not None and sent < self.decreased_at:
+                return
+            self.limit = max(self.min_concurrency, self.limit / 2)
+            self.decreased_at = time.monotonic()
+
+    # === Valutazione di una risposta ===
+    def observe(self, status, headers, sent=None):
+        """
+        Aggiorna concorrenza e sospensioni in base alla risposta.
+        sent è l'istante di invio restituito da acquire (None: il dimezzamento non viene filtrato).
+        Restituisce i secondi da attendere prima di ripetere la richiesta, oppure None se non va ripetuta.
+        """
+        headers = headers or {}
+        remaining = headers.get("X-RateLimit-Remaining")
+        limit = headers.get("X-RateLimit-Limit")
+        near = headers.get("X-RateLimit-NearLimit", "").lower() == "true"
+        if remaining is not None and limit:
+            try:
+                near = near or int(remaining) <= NEAR_LIMIT_LEFT * int(limit)
+                if int(remaining) <= 0:
+                    reset = parse_reset(headers.get("X-RateLimit-Reset"))
+                    if reset:
+                        self.pause(reset)
+            except ValueError:
+                pass
+
+        if status in THROTTLE_STATUS:
+            self._count("throttled")
+            self._decrease(sent)
+            retry_after = parse_retry_after(headers.get("Retry-After"))
+            if retry_after is not None:
+                self.pause(retry_after)
+                return retry_after
+            return None if status not in RETRY_STATUS else 0.0
+        if near:
+            self._decrease(sent)
+        elif 200 <= status < 400:
+            self._increase()
+        return 0.0 if status in RETRY_STATUS else None
+
+    def retry_delay(self, attempt, status=None, headers=None, sent=None):
+        """Secondi da attendere prima del tentativo attempt+1, oppure None se non va ripetuto."""
+        if status is None:   # errore di connessione o timeout
+            server_wait = 0.0
+        else:
+            server_wait = self.observe(status, headers, sent)
+            if server_wait is None:
+                return None
+        if attempt >= self.max_retries:
+            return None
+        self._count("retries")
+        return max(server_wait, backoff_delay(attempt))
+
+    # === Esecuzione di una richiesta con attese e tentativi ===
+    def call(self, send):
+        """Esegue send() (che restituisce una requests.Response) rispettando limiti e tentativi."""
+        attempt = 0
+        while True:
+            wait = self.reserve()
+            if wait:
+                time.sleep(wait)
+
+            sent = self.acquire()
+            try:
+                resp = send()
+            except RETRY_ERRORS:
+                delay = self.retry_delay(attempt)
+                if delay is None:
+                    raise
+            else:
+                delay = self.retry_delay(attempt, resp.status_code, resp.headers, sent)
+                if delay is None:
+                    return resp
+                resp.close()
+            finally:
+                self.release()
+
+            attempt += 1
+            time.sleep(delay)
+
+# === Pianificatore condiviso dal processo (client sincrono e motore asincrono) ===
+_shared_scheduler = None
+_shared_lock = threading.Lock()
+
+def get_scheduler():
+    global _shared_scheduler
+    with _shared_lock:
+        if _shared_scheduler is None:
+            _shared_scheduler = RequestScheduler()
+        return _shared_scheduler
@@ -0,0 +1,114 @@
+"""
+Sincronizzazione incrementale delle issue restituite da una JQL.
+
+Funzionalità principali:
+- Salva localmente l'ultima sincronizzazione riuscita (istante e issue scaricate) per ogni
+  combinazione di JQL, campi e istanza Jira.
+- Alle esecuzioni successive scarica solo le issue con `updated >= -<minuti>m` (data relativa,
+  così non dipende dal fuso orario impostato sul profilo Jira) e le unisce all'istantanea.
+- Le issue uscite dal filtro (chiuse, riassegnate, eliminate) vengono individuate con una
+  ricerca che restituisce solo le chiavi; la stessa ricerca fornisce l'ordinamento della JQL.
+
+Configurazione (variabili d'ambiente o file .env):
+- JIRA_SNAPSHOT_DIR   cartella delle istantanee (default ~/.jira-report/snapshots)
+
+Nome del file:
+- jira_sync.py
+"""
+
+import hashlib
+import json
+import math
+import os
+import re
+import time
+
+from dotenv import load_dotenv
+
+# === Caricamento variabili ambiente ===
+load_dotenv()
+
+# === Parametri della sincronizzazione ===
+SNAPSHOT_DIR    = os.getenv("JIRA_SNAPSHOT_DIR", os.path.join(os.path.expanduser("~"), ".jira-report", "snapshots"))
+SYNC_MARGIN_MIN = 5  # minuti aggiunti all'intervallo per coprire ritardi di indicizzazione e orologi
+SEARCH_PATH     = "/rest/api/3/search/jql"
+
+RE_ORDER_BY     = re.compile(r"\s+ORDER\s+BY\s+.*$", re.IGNORECASE | re.DOTALL)
+
+# === Percorso dell'istantanea di una ricerca ===
+def snapshot_path(client, jql, fields, snapshot_dir=SNAPSHOT_DIR):
+    # L'utente autenticato fa parte dell'identità: la JQL usa currentUser(), quindi due credenziali
+    # diverse sulla stessa istanza hanno istantanee distinte
+    user = (client.session.auth or ("",))[0] or ""
+    ident = f"{client.base_url}|{user}|{jql}|{fields}".encode("utf-8")
+    return os.path.join(snapshot_dir, hashlib.sha1(ident).hexdigest() + ".json")
+
+def load_snapshot(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def save_snapshot(path, snapshot):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(snapshot, f, separators=(",", ":"))
+    os.replace(tmp, path)
+
+# === Ricerca completa: tutte le pagine ===
+def _search(client, jql, fields, path):
+    issues = []
+    for page in client.iter_pages(path, {"jql": jql, "fields": fields}):
+        issues.extend(page)
+    return issues
+
+# === Sincronizzazione (completa o incrementale) delle issue di una JQL ===
+def sync_issues(client, jql, fields, path=SEARCH_PATH, full=False, snapshot_dir=SNAPSHOT_DIR):
+    """
+    Restituisce le issue della JQL nello stesso ordine della ricerca completa.
+    Solleva requests.HTTPError se una richiesta fallisce; in quel caso l'istantanea non viene aggiornata.
+    """
+    snap_file = snapshot_path(client, jql, fields, snapshot_dir)
+    snapshot = None if full else load_snapshot(snap_file)
+    started = time.time()
+
+    if snapshot is None:
+        issues = _search(client, jql, fields, path)
+        save_snapshot(snap_file, {
+            "last_sync": started,
+            "issues": {issue["key"]: issue for issue in issues},
+            "order": [issue["key"] for issue in issues],
+        })
+        print(f"Sincronizzazione completa: {len(issues)} issue")
+        return issues
+
+    stored = snapshot["issues"]
+    filtro = RE_ORDER_BY.sub("", jql)
+
+    # 1) Issue modificate dall'ultima sincronizzazione
+    minutes = math.ceil((started - snapshot["last_sync"]) / 60) + SYNC_MARGIN_MIN
+    changed = _search(client, f"({filtro}) AND updated >= -{minutes}m", fields, path)
+    for issue in changed:
+        stored[issue["key"]] = issue
+
+    # 2) Chiavi attualmente nel filtro (nell'ordine della JQL): le altre sono uscite dal filtro
+    order = [issue["key"] for issue in _search(client, jql, "key", path)]
+    current = set(order)
+    removed = [key for key in stored if key not in current]
+    for key in removed:
+        del stored[key]
+
+    # 3) Issue entrate nel filtro senza modifiche recenti (caso raro): recupero puntuale
+    missing = [key for key in order if key not in stored]
+    for start in range(0, len(missing), 100):
+        chunk = ", ".join(missing[start:start + 100])
+        for issue in _search(client, f"key in ({chunk})", fields, path):
+            stored[issue["key"]] = issue
+
+    issues = [stored[key] for key in order if key in stored]
+    save_snapshot(snap_file, {"last_sync": started, "issues": stored, "order": order})
+    print(f"Sincronizzazione incrementale: {len(changed)} modificate, {len(removed)} rimosse, "
+          f"{len(missing)} aggiunte ({len(issues)} issue totali)")
+    return issues
@@ -0,0 +1,184 @@
+"""
+Strumentazione opzionale degli script di report: richieste HTTP verso Jira e durata delle fasi.
+
+Funzionalità principali:
+- Per ogni chiamata a Jira (jira_client.py e jira_async.py) registra metodo, endpoint, stato HTTP,
+  latenza e byte ricevuti (decompressi e, se indicati da Content-Length, trasferiti).
+- Intervalli di tempo (span) per le fasi degli script: recupero, parsing ADF, rendering, salvataggio.
+- Al termine dell'esecuzione scrive:
+    - summary  riepilogo JSON (richieste per endpoint e per stato, statistiche delle fasi);
+    - chrome   file Chrome Trace Event, apribile con chrome://tracing o https://ui.perfetto.dev
+- Disattivata per default: senza JIRA_TRACE `span()` non misura nulla e i client non registrano
+  le richieste.
+
+Configurazione (variabili d'ambiente o file .env):
+- JIRA_TRACE          file in cui salvare i dati a fine esecuzione (vuoto = strumentazione disattivata)
+- JIRA_TRACE_FORMAT   summary (default) oppure chrome
+
+Utilizzo:
+    with span("render", ticket=ticket_key):
+        doc = build_word_document(...)
+
+Nome del file:
+- jira_trace.py
+"""
+
+import atexit
+import json
+import os
+import re
+import statistics
+import threading
+import time
+
+from contextlib import contextmanager, nullcontext
+
+from dotenv import load_dotenv
+
+# === Caricamento variabili ambiente ===
+load_dotenv()
+
+TRACE_FORMATS   = ("summary", "chrome")
+
+# Chiavi e identificativi numerici negli endpoint: /issue/SAL-12/comment -> /issue/{key}/comment
+RE_PATH_KEY     = re.compile(r"/issue/[^/?]+")
+
+def endpoint_of(url):
+    path = url.split("://", 1)[-1]
+    path = path[path.find("/"):] if "/" in path else "/"
+    return RE_PATH_KEY.sub("/issue/{key}", path.split("?", 1)[0])
+
+# === Registro degli eventi di un'esecuzione ===
+class Tracer:
+    def __init__(self):
+        self.requests = []
+        self.spans = []
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter()
+        self._pid = os.getpid()
+
+    def _us(self, t):
+        return round((t - self._origin) * 1_000_000, 1)
+
+    def record_request(self, method, url, status, start, end, nbytes, wire_bytes=None):
+        """Registra una richiesta HTTP; start/end sono valori di time.perf_counter()."""
+        event = {
+            "method": method,
+            "endpoint": endpoint_of(url),
+            "url": url,
+            "status": status,
+            "start": start,
+            "duration": end - start,
+            "bytes": nbytes,
+            "wire_bytes": wire_bytes,
+            "thread": threading.get_ident(),
+        }
+        with self._lock:
+            self.requests.append(event)
+
+    @contextmanager
+    def span(self, name, **args):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            event = {"name": name, "start": start, "duration": time.perf_counter() - start,
+                     "args": args, "thread": threading.get_ident()}
+            with self._lock:
+                self.spans.append(event)
+
+    # === Riepilogo JSON ===
+    def summary(self):
+        with self._lock:
+            requests, spans = list(self.requests), list(self.spans)
+
+        by_endpoint = {}
+        for r in requests:
+            by_endpoint.setdefault(r["endpoint"], []).append(r)
+        by_span = {}
+        for s in spans:
+            by_span.setdefault(s["name"], []).append(s["duration"])
+
+        return {
+            "wall_time": time.perf_counter() - self._origin,
+            "requests": {
+                "count": len(requests),
+                "bytes": sum(r["bytes"] for r in requests),
+                "wire_bytes": sum(r["wire_bytes"] or 0 for r in requests),
+                "time": sum(r["duration"] for r in requests),
+                "status": {str(s): sum(1 for r in requests if r["status"] == s)
+                           for s in sorted({r["status"] for r in requests}, key=str)},
+                "endpoints": {
+                    endpoint: {
+                        "count": len(items),
+                        "bytes": sum(r["bytes"] for r in items),
+                        "time": sum(r["duration"] for r in items),
+                        "median": statistics.median(r["duration"] for r in items),
+                        "max": max(r["duration"] for r in items),
+                    }
+                    for endpoint, items in sorted(by_endpoint.items())
+                },
+            },
+            "spans": {
+                name: {
+                    "count": len(durations),
+                    "total": sum(durations),
+                    "median": statistics.median(durations),
+                    "max": max(durations),
+                }
+                for name, durations in by_span.items()
+            },
+        }
+
+    # === Formato Chrome Trace Event ("X" = evento completo con durata) ===
+    def chrome_trace(self):
+        with self._lock:
+            requests, spans = list(self.requests), list(self.spans)
+
+        events = []
+        for s in spans:
+            events.append({"name": s["name"], "cat": "fase", "ph": "X", "pid": self._pid, "tid": s["thread"],
+                           "ts": self._us(s["start"]), "dur": round(s["duration"] * 1_000_000, 1),
+                           "args": s["args"]})
+        for r in requests:
+            events.append({"name": f"{r['method']} {r['endpoint']}", "cat": "http", "ph": "X",
+                           "pid": self._pid, "tid": r["thread"],
+                           "ts": self._us(r["start"]), "dur": round(r["duration"] * 1_000_000, 1),
+                           "args": {"url": r["url"], "status": r["status"], "bytes": r["bytes"],
+                                    "wire_bytes": r["wire_bytes"]}})
+        events.sort(key=lambda e: e["ts"])
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write(self, path, fmt="summary"):
+        data = self.chrome_trace() if fmt == "chrome" else self.summary()
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=None if fmt == "chrome" else 2)
+        print(f"Strumentazione salvata: {path} ({fmt})")
+
+# === Tracer del processo (None se la strumentazione è disattivata) ===
+_tracer = None
+_tracer_lock = threading.Lock()
+
+def enable(path, fmt="summary"):
+    """Attiva la strumentazione; i dati vengono scritti in `path` all'uscita del processo."""
+    global _tracer
+    if fmt not in TRACE_FORMATS:
+        raise ValueError(f"Formato non valido: {fmt} (ammessi: {', '.join(TRACE_FORMATS)})")
+    with _tracer_lock:
+        if _tracer is None:
+            _tracer = Tracer()
+            atexit.register(lambda: _tracer.write(path, fmt))
+        return _tracer
+
+def get_tracer():
+    return _tracer
+
+def span(name, **args):
+    """Context manager che misura una fase; senza strumentazione attiva non fa nulla."""
+    tracer = _tracer
+    if tracer is None:
+        return nullcontext()
+    return tracer.span(name, **args)
+
+if os.getenv("JIRA_TRACE"):
+    enable(os.getenv("JIRA_TRACE"), os.getenv("JIRA_TRACE_FORMAT", "summary"))
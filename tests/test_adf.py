@@ -0,0 +1,55 @@
+"""
+Chiavi della cache dei frammenti ADF (jira_adf.fragment_key).
+
+- il JSON canonico prodotto senza ricorsione coincide con quello di json.dumps;
+- frammenti annidati oltre il limite di ricorsione hanno una chiave, indipendente dai localId.
+
+Utilizzo:
+    python -m unittest discover -s tests
+    python -m pytest tests
+
+Nome del file:
+- tests/test_adf.py
+"""
+
+import json
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from jira_adf import RE_LOCAL_ID, _canonical_json, fragment_key
+
+def nested_list(depth, id_prefix="id"):
+    node = {"type": "paragraph", "content": [{"type": "text", "text": "fondo"}]}
+    for i in range(depth):
+        item = {"type": "listItem", "attrs": {"localId": f"{id_prefix}-{i}", "order": i}, "content": [node]}
+        node = {"type": "bulletList", "content": [item]}
+    return node
+
+class FragmentKeyTest(unittest.TestCase):
+    def test_canonical_json_matches_json_dumps(self):
+        samples = [
+            ("ooxml", 2, nested_list(20)),
+            ("text", [{"type": "text", "text": "è \\ \"virgolette\"\n\x01", "marks": [{"type": "strong"}]}]),
+            ("details", "DNT-3", [None, True, 1.5, -3, {}, [], {"localId": 7, "a": {"localId": "x"}}]),
+        ]
+        for parts in samples:
+            expected = json.dumps(parts, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+            self.assertEqual(_canonical_json(parts), RE_LOCAL_ID.sub("", expected))
+
+    def test_deep_fragment(self):
+        depth = sys.getrecursionlimit() * 2
+        key, size = fragment_key("docx", 1, nested_list(depth))
+        self.assertGreater(size, depth)
+        self.assertNotEqual(key, fragment_key("docx", 2, nested_list(depth))[0])
+
+    def test_local_id_ignored(self):
+        for depth in (5, sys.getrecursionlimit() * 2):
+            with self.subTest(depth=depth):
+                self.assertEqual(fragment_key("ooxml", 1, nested_list(depth)),
+                                 fragment_key("ooxml", 1, nested_list(depth, id_prefix="altro")))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+"""
+Errori HTTP del motore asincrono (jira_async.py) con un server aiohttp locale al posto di Jira.
+
+- search_issues solleva JiraResponseError anche quando fallisce la prima pagina (nessuna lista vuota);
+- le ricerche `key in (...)` di jira-project-report-v4.3.py ripiegano sul recupero singolo solo con 400.
+
+Utilizzo:
+    python -m unittest discover -s tests
+    python -m pytest tests
+
+Nome del file:
+- tests/test_async.py
+"""
+
+import asyncio
+import importlib.util
+import os
+import sys
+import unittest
+
+from aiohttp import web
+
+ROOT            = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROJECT_REPORT  = os.path.join(ROOT, "jira-project-report-v4.3.py")
+
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from jira_async import AsyncJiraClient, JiraResponseError
+
+def load_report():
+    os.environ.setdefault("JIRA_URL", "http://127.0.0.1")
+    os.environ["JIRA_CACHE"] = "0"
+    spec = importlib.util.spec_from_file_location("jira_project_report_async_test", PROJECT_REPORT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+# === Jira finto: la ricerca risponde sempre con search_status, le issue esistono tutte ===
+async def serve(search_status, test):
+    async def search(request):
+        return web.json_response({"errorMessages": ["errore"]}, status=search_status)
+
+    async def issue(request):
+        key = request.match_info["key"]
+        return web.json_response({"key": key, "fields": {"summary": f"Titolo {key}", "project": {"name": "Cliente"}}})
+
+    app = web.Application()
+    app.router.add_get("/rest/api/3/search/jql", search)
+    app.router.add_get("/rest/api/3/issue/{key}", issue)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = runner.addresses[0][1]
+    try:
+        async with AsyncJiraClient(f"http://127.0.0.1:{port}", "utente", "token") as engine:
+            return await test(engine)
+    finally:
+        await runner.cleanup()
+
+class AsyncErrorsTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.report = load_report()
+
+    def test_first_page_error_raises(self):
+        async def test(engine):
+            with self.assertRaises(JiraResponseError) as raised:
+                await engine.search_issues("project = X", "summary")
+            return raised.exception.status
+
+        self.assertEqual(asyncio.run(serve(500, test)), 500)
+
+    def test_bulk_search_falls_back_only_on_400(self):
+        async def details(engine):
+            return await self.report.get_ticket_details_bulk_async(engine, ["A-1", "A-2"])
+
+        found = asyncio.run(serve(400, details))
+        self.assertEqual(sorted(found), ["A-1", "A-2"])
+        self.assertEqual(found["A-1"][0], "Titolo A-1")
+
+        with self.assertRaises(JiraResponseError):
+            asyncio.run(serve(403, details))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+"""
+Generazione di report per più ticket (generate_reports_batch, generate_reports_async) senza Jira:
+le funzioni di recupero sono sostituite da dati in memoria.
+
+- un ticket il cui rendering fallisce viene contato tra i falliti, gli altri report vengono generati
+  (rendering nel processo principale, report singoli e consolidato, motore sincrono e asincrono).
+
+Utilizzo:
+    python -m unittest discover -s tests
+    python -m pytest tests
+
+Nome del file:
+- tests/test_batch.py
+"""
+
+import asyncio
+import importlib.util
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+import zipfile
+
+from datetime import datetime
+
+ROOT            = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROJECT_REPORT  = os.path.join(ROOT, "jira-project-report-v4.3.py")
+
+def load_report():
+    os.environ.setdefault("JIRA_URL", "http://127.0.0.1")
+    os.environ["JIRA_CACHE"] = "0"
+    if ROOT not in sys.path:
+        sys.path.insert(0, ROOT)
+    spec = importlib.util.spec_from_file_location("jira_project_report_batch_test", PROJECT_REPORT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+ADF = {"type": "doc", "content": [{"type": "paragraph", "content": [{"type": "text", "text": "testo"}]}]}
+GOOD_COMMENTS = [{"id": "1", "created": datetime(2025, 1, 1, 9, 0), "author": "Utente", "body": ADF}]
+BAD_COMMENTS = [{"id": "2", "author": "Utente", "body": ADF}]   # senza data: il rendering fallisce
+
+TICKETS = ["OK-1", "BAD-1", "OK-2"]
+
+class BatchTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.report = load_report()
+
+    def setUp(self):
+        self.workdir = tempfile.mkdtemp(prefix="jira-batch-test-")
+        self.cwd = os.getcwd()
+        os.chdir(self.workdir)
+        report = self.report
+        self.saved = {name: getattr(report, name) for name in (
+            "get_ticket_details_bulk", "iter_ticket_comments_bulk",
+            "get_ticket_details_bulk_async", "get_inline_comments_bulk_async")}
+
+        details = {key: ("Titolo", ADF, "", "", "Cliente") for key in TICKETS}
+        comments = {key: BAD_COMMENTS if key.startswith("BAD") else GOOD_COMMENTS for key in TICKETS}
+
+        async def details_async(engine, keys):
+            return {key: details[key] for key in keys}
+
+        async def comments_async(engine, keys):
+            return {key: comments[key] for key in keys}
+
+        report.get_ticket_details_bulk = lambda keys, **kw: {key: details[key] for key in keys}
+        report.iter_ticket_comments_bulk = lambda keys, **kw: ((key, comments[key]) for key in keys)
+        report.get_ticket_details_bulk_async = details_async
+        report.get_inline_comments_bulk_async = comments_async
+
+    def tearDown(self):
+        for name, value in self.saved.items():
+            setattr(self.report, name, value)
+        os.chdir(self.cwd)
+        shutil.rmtree(self.workdir, ignore_errors=True)
+
+    def assertReports(self, falliti):
+        self.assertEqual(falliti, ["BAD-1"])
+        self.assertEqual(sorted(os.listdir(self.workdir)), ["OK-1_report.docx", "OK-2_report.docx"])
+
+    def test_batch_continues_after_render_error(self):
+        self.assertReports(self.report.generate_reports_batch(TICKETS, processes=0))
+
+    def test_async_continues_after_render_error(self):
+        self.assertReports(asyncio.run(self.report.generate_reports_async(TICKETS, processes=0)))
+
+    def test_consolidated_skips_failed_section(self):
+        filename = os.path.join(self.workdir, "consolidato.docx")
+        falliti = self.report.generate_reports_batch(TICKETS, processes=0, consolidated=filename)
+        self.assertEqual(falliti, ["BAD-1"])
+        with zipfile.ZipFile(filename) as docx:
+            document = docx.read("word/document.xml").decode("utf-8")
+        self.assertIn("OK-1", document)
+        self.assertIn("OK-2", document)
+        self.assertNotIn("BAD-1", document)
+
+if __name__ == "__main__":
+    unittest.main()
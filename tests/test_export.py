@@ -0,0 +1,118 @@
+"""
+Esportatori dell'elenco issue (jira_export.py).
+
+- created di Jira (+0200, Z) convertito in UTC con qualsiasi Python supportato;
+- Exporter e _ArrowExporter sono astratti: una sottoclasse incompleta non può essere istanziata;
+- CSV e NDJSON: file definitivo solo con close(), abort() lascia invariato quello precedente;
+- arrow e parquet vengono verificati solo se pyarrow è installato.
+
+Utilizzo:
+    python -m unittest discover -s tests
+    python -m pytest tests
+
+Nome del file:
+- tests/test_export.py
+"""
+
+import csv
+import importlib.util
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+from collections import namedtuple
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from jira_export import CSV_HEADER, Exporter, _ArrowExporter, get_exporter, to_timestamp
+
+HAS_PYARROW = importlib.util.find_spec("pyarrow") is not None
+
+Issue = namedtuple("Issue", "key summary status priority created due project project_name")
+
+ISSUES = [
+    Issue("PRJ-1", "Titolo è", "In corso", "Medium", "2025-08-13T09:41:22.123+0200", "2025-11-02", "PRJ", "Cliente"),
+    Issue("PRJ-2", "Altro", "", "", "2025-08-13T09:41:22Z", "", "PRJ", "Cliente"),
+]
+
+class ExportTest(unittest.TestCase):
+    def setUp(self):
+        self.workdir = tempfile.mkdtemp(prefix="jira-export-test-")
+
+    def tearDown(self):
+        shutil.rmtree(self.workdir, ignore_errors=True)
+
+    def test_jira_timestamps(self):
+        self.assertEqual(to_timestamp("2025-08-13T09:41:22.123+0200"),
+                         datetime(2025, 8, 13, 7, 41, 22, 123000, tzinfo=timezone.utc))
+        self.assertEqual(to_timestamp("2025-08-13T09:41:22.123-0530"),
+                         datetime(2025, 8, 13, 15, 11, 22, 123000, tzinfo=timezone.utc))
+        self.assertEqual(to_timestamp("2025-08-13T09:41:22Z"), datetime(2025, 8, 13, 9, 41, 22, tzinfo=timezone.utc))
+        self.assertIsNone(to_timestamp(""))
+
+    def test_incomplete_exporter(self):
+        class Incomplete(Exporter):
+            def _open(self):
+                pass
+
+        class IncompleteArrow(_ArrowExporter):
+            def _write_block(self, block):
+                pass
+
+        for cls in (Exporter, Incomplete, IncompleteArrow):
+            with self.subTest(cls=cls.__name__), self.assertRaises(TypeError):
+                cls(os.path.join(self.workdir, "x"))
+
+    def test_csv(self):
+        path = os.path.join(self.workdir, "elenco.csv")
+        with get_exporter("csv", path, row_group_size=1) as exporter:
+            exporter.write(ISSUES)
+        with open(path, newline="", encoding="utf-8") as f:
+            rows = list(csv.reader(f))
+        self.assertEqual(rows[0], CSV_HEADER)
+        self.assertEqual(rows[1], ["PRJ-1", "Titolo è", "In corso", "Medium", "2025-08-13T09:41:22.123+0200",
+                                   "2025-11-02", "PRJ"])
+        self.assertEqual(len(rows), 3)
+
+    def test_ndjson_abort_keeps_previous(self):
+        path = os.path.join(self.workdir, "elenco.ndjson")
+        with get_exporter("ndjson", path) as exporter:
+            exporter.write(ISSUES)
+        with open(path, encoding="utf-8") as f:
+            rows = [json.loads(line) for line in f]
+        self.assertEqual(rows[0]["created"], "2025-08-13T07:41:22.123000+00:00")
+        self.assertIsNone(rows[1]["status"])
+
+        with self.assertRaises(RuntimeError):
+            with get_exporter("ndjson", path, row_group_size=1) as exporter:
+                exporter.write(ISSUES[:1])
+                raise RuntimeError("interrotta")
+        with open(path, encoding="utf-8") as f:
+            self.assertEqual([json.loads(line) for line in f], rows)
+        self.assertEqual(os.listdir(self.workdir), ["elenco.ndjson"])
+
+    @unittest.skipUnless(HAS_PYARROW, "pyarrow non installato")
+    def test_arrow_and_parquet(self):
+        import pyarrow.ipc
+        import pyarrow.parquet
+
+        arrow_path = os.path.join(self.workdir, "elenco.arrows")
+        parquet_path = os.path.join(self.workdir, "elenco.parquet")
+        for fmt, path in (("arrow", arrow_path), ("parquet", parquet_path)):
+            with get_exporter(fmt, path, row_group_size=1) as exporter:
+                exporter.write(ISSUES)
+
+        with pyarrow.ipc.open_stream(arrow_path) as reader:
+            table = reader.read_all()
+        self.assertEqual(table.column("key").to_pylist(), ["PRJ-1", "PRJ-2"])
+        parquet = pyarrow.parquet.ParquetFile(parquet_path)
+        self.assertEqual(parquet.metadata.num_row_groups, 2)
+        self.assertEqual(parquet.read().column("created").to_pylist()[0],
+                         datetime(2025, 8, 13, 7, 41, 22, 123000, tzinfo=timezone.utc))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,220 @@
+"""
+Confronto tra i backend di scrittura di jira-project-report-v4.3.py: python-docx (docx) e XML diretto (ooxml).
+
+Per ogni documento ADF i due backend devono produrre lo stesso word/document.xml:
+- alberi ADF casuali (seed fissi, quindi riproducibili) con tutti i nodi gestiti dai renderer,
+  marks, testo con spazi, tabulazioni e a capo, nodi sconosciuti con contenuto;
+- casi specifici: righe vuote nei bullet, blocchi dentro un paragraph, link con href diversi,
+  liste annidate oltre il limite di ricorsione con la cache dei frammenti attiva.
+
+Una rigenerazione interrotta con il backend ooxml (report singolo o consolidato) lascia intatto
+il report precedente.
+
+Gli alberi che python-docx non riesce a rappresentare (blocchi come panel o heading dentro un
+paragraph: ADF non valido) vengono saltati.
+
+Utilizzo:
+    python -m unittest discover -s tests
+    python -m pytest tests
+
+Nome del file:
+- tests/test_ooxml_backend.py
+"""
+
+import importlib.util
+import os
+import random
+import shutil
+import sys
+import tempfile
+import unittest
+import zipfile
+
+from datetime import datetime
+
+ROOT            = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROJECT_REPORT  = os.path.join(ROOT, "jira-project-report-v4.3.py")
+
+RANDOM_TREES    = 300
+
+MARKS = [
+    {"type": "strong"},
+    {"type": "em"},
+    {"type": "underline"},
+    {"type": "strike"},
+    {"type": "code"},
+    {"type": "link", "attrs": {"href": "https://example.com/a"}},
+    {"type": "textColor", "attrs": {"color": "#ff0000"}},
+    {"type": "color", "attrs": {"color": "#0a0"}},
+    {"type": "subsup", "attrs": {"subscript": True}},
+    {"type": "subsup", "attrs": {"superscript": True}},
+]
+NODE_TYPES = ["paragraph", "heading", "bulletList", "orderedList", "listItem", "codeBlock", "panel",
+              "text", "hardBreak", "blockquote", "mention", "expand"]
+TEXTS = ["a", "  spazi ", "x\ny", "\t", "", "b\n\nc", "<&>\"", "riga\r\naltra"]
+
+# === Caricamento dello script come modulo (il nome del file contiene trattini) ===
+def load_report():
+    os.environ.setdefault("JIRA_URL", "http://127.0.0.1")
+    os.environ["JIRA_CACHE"] = "0"
+    if ROOT not in sys.path:
+        sys.path.insert(0, ROOT)
+    spec = importlib.util.spec_from_file_location("jira_project_report_ooxml_test", PROJECT_REPORT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+# === Generazione di alberi ADF casuali ===
+def random_node(rng, depth):
+    node_type = rng.choice(NODE_TYPES)
+    node = {"type": node_type}
+    if node_type == "text":
+        node["text"] = rng.choice(TEXTS)
+        if rng.random() < 0.5:
+            node["marks"] = rng.sample(MARKS, rng.randint(1, 3))
+        return node
+    if node_type == "heading":
+        node["attrs"] = {"level": rng.randint(1, 4)}
+    if node_type == "codeBlock" and rng.random() < 0.3:
+        node["marks"] = rng.sample(MARKS, 1)
+    if depth > 0 and rng.random() < 0.85:
+        node["content"] = [random_node(rng, depth - 1) for _ in range(rng.randint(0, 3))]
+    return node
+
+def random_adf(seed):
+    rng = random.Random(seed)
+    return {"type": "doc", "version": 1, "content": [random_node(rng, 4) for _ in range(rng.randint(1, 4))]}
+
+def text(value, marks=None):
+    node = {"type": "text", "text": value}
+    if marks:
+        node["marks"] = marks
+    return node
+
+def paragraph(*content):
+    return {"type": "paragraph", "content": list(content)}
+
+class OoxmlBackendTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.report = load_report()
+        cls.workdir = tempfile.mkdtemp(prefix="jira-ooxml-test-")
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.workdir, ignore_errors=True)
+
+    def render(self, backend, description, comments=()):
+        output_dir = os.path.join(self.workdir, backend)
+        os.makedirs(output_dir, exist_ok=True)
+        filename = self.report.create_word_document(
+            "TEST-1", "Titolo", description, "Rif. uno\n\nRif. due", "Ambiente", list(comments), "Cliente",
+            output_dir, backend=backend)
+        with zipfile.ZipFile(filename) as docx:
+            return docx.read("word/document.xml").decode("utf-8")
+
+    def assertSameDocument(self, description, comments=()):
+        self.assertEqual(self.render("docx", description, comments), self.render("ooxml", description, comments))
+
+    def test_random_adf(self):
+        compared = 0
+        for seed in range(RANDOM_TREES):
+            adf = random_adf(seed)
+            try:
+                expected = self.render("docx", adf)
+            except AttributeError:
+                continue   # blocco dentro un paragraph: python-docx non può inserirlo
+            with self.subTest(seed=seed):
+                self.assertEqual(expected, self.render("ooxml", adf))
+            compared += 1
+        self.assertGreater(compared, RANDOM_TREES * 3 // 4)
+
+    def test_random_adf_in_comments(self):
+        comments = [{"id": str(seed), "created": datetime(2025, 1, 1 + seed % 28, 9, seed % 60),
+                     "author": f"Utente {seed}", "body": random_adf(seed)}
+                    for seed in range(RANDOM_TREES, RANDOM_TREES + 40)]
+        try:
+            self.render("docx", None, comments)
+        except AttributeError:
+            comments = [c for c in comments if self._docx_accepts(c["body"])]
+        self.assertSameDocument(None, comments)
+
+    def _docx_accepts(self, adf):
+        try:
+            self.render("docx", adf)
+        except AttributeError:
+            return False
+        return True
+
+    def test_bullet_with_empty_lines(self):
+        adf = {"type": "doc", "content": [{"type": "bulletList", "content": [
+            {"type": "listItem", "content": [paragraph(text("prima\n\nterza"), {"type": "hardBreak"}, text("x"))]},
+        ]}]}
+        self.assertSameDocument(adf)
+
+    def test_list_inside_paragraph(self):
+        adf = {"type": "doc", "content": [paragraph(
+            text("prima "),
+            {"type": "orderedList", "content": [
+                {"type": "blockquote", "content": [{"type": "hardBreak"}, text("ignorato")]},
+                {"type": "listItem", "content": [{"type": "bulletList", "content": [
+                    {"type": "listItem", "content": []}]}]},
+            ]},
+            {"type": "mention", "content": [text("dentro"), {"type": "hardBreak"}]},
+        )]}
+        self.assertSameDocument(adf)
+
+    def test_links_share_run_style(self):
+        links = [text(f"link {i}", [{"type": "link", "attrs": {"href": f"https://example.com/{i}"}},
+                                    {"type": "strong"}]) for i in range(50)]
+        self.assertSameDocument({"type": "doc", "content": [paragraph(*links)]})
+        # l'href non fa parte della chiave: 50 link diversi condividono un solo rPr
+        keys = [key for key in self.report._ooxml._rpr if key[0] == (("strong",),) and not key[1]]
+        self.assertEqual(keys, [((("strong",),), False)])
+
+    def test_deep_nesting_with_render_cache(self):
+        # Oltre il limite di ricorsione del modulo json: la chiave della cache dei frammenti è iterativa
+        self.assertIsNotNone(self.report.get_render_cache())
+        node = paragraph(text("fondo"))
+        for i in range(sys.getrecursionlimit()):
+            node = {"type": "bulletList", "content": [
+                {"type": "listItem", "attrs": {"localId": str(i)}, "content": [node]}]}
+        adf = {"type": "doc", "content": [node]}
+        comments = [{"id": "1", "created": datetime(2025, 1, 1), "author": "Utente", "body": adf}]
+        self.assertSameDocument(adf, comments)
+
+    def test_aborted_rewrite_keeps_previous_file(self):
+        output_dir = os.path.join(self.workdir, "abort")
+        os.makedirs(output_dir, exist_ok=True)
+        adf = {"type": "doc", "content": [paragraph(text("versione buona"))]}
+        filename = self.report.create_word_document("TEST-2", "Titolo", adf, "", "", [], "Cliente",
+                                                    output_dir, backend="ooxml")
+        with open(filename, "rb") as f:
+            previous = f.read()
+
+        # Commento senza data: il rendering fallisce a documento già iniziato
+        with self.assertRaises(KeyError):
+            self.report.create_word_document("TEST-2", "Titolo", adf, "", "", [{"author": "x", "body": adf}],
+                                             "Cliente", output_dir, backend="ooxml")
+        with open(filename, "rb") as f:
+            self.assertEqual(f.read(), previous)
+        self.assertEqual(os.listdir(output_dir), ["TEST-2_report.docx"])
+
+    def test_aborted_consolidated_report_keeps_previous_file(self):
+        filename = os.path.join(self.workdir, "consolidato.docx")
+        adf = {"type": "doc", "content": [paragraph(text("sezione"))]}
+        with self.report.ConsolidatedReport(filename) as report:
+            report.add_section("TEST-3", "Titolo", adf, "", "", [], "Cliente")
+        with open(filename, "rb") as f:
+            previous = f.read()
+
+        with self.assertRaises(KeyError):
+            with self.report.ConsolidatedReport(filename) as report:
+                report.add_section("TEST-3", "Titolo", adf, "", "", [], "Cliente")
+                report.add_section("TEST-4", "Titolo", adf, "", "", [{"author": "x", "body": adf}], "Cliente")
+        with open(filename, "rb") as f:
+            self.assertEqual(f.read(), previous)
+        self.assertFalse(os.path.exists(filename + ".tmp"))
+
+if __name__ == "__main__":
+    unittest.main()
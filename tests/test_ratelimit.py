@@ -0,0 +1,90 @@
+"""
+Concorrenza adattiva (AIMD) del pianificatore delle richieste (jira_ratelimit.py).
+
+- un gruppo di 429 relativo alla stessa finestra dimezza il limite una sola volta;
+- solo le risposte 2xx/3xx fanno crescere il limite;
+- acquire_async rispetta il limite corrente, anche quando il posto viene liberato da un altro thread.
+
+Utilizzo:
+    python -m unittest discover -s tests
+    python -m pytest tests
+
+Nome del file:
+- tests/test_ratelimit.py
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from jira_ratelimit import RequestScheduler
+
+def make_scheduler(max_concurrency=8):
+    return RequestScheduler(rate=0, max_retries=0, max_concurrency=max_concurrency)
+
+class AimdTest(unittest.TestCase):
+    def test_decrease_once_per_window(self):
+        scheduler = make_scheduler()
+        sent = [scheduler.acquire() for _ in range(8)]
+        for when in sent:
+            scheduler.observe(429, {}, when)
+            scheduler.release()
+        self.assertEqual(scheduler.limit, 4)
+        self.assertEqual(scheduler.stats["throttled"], 8)
+
+        # Richiesta inviata dopo il dimezzamento: nuova finestra
+        scheduler.observe(429, {}, scheduler.acquire())
+        scheduler.release()
+        self.assertEqual(scheduler.limit, 2)
+
+    def test_only_success_increases(self):
+        scheduler = make_scheduler()
+        scheduler.observe(503, {}, scheduler.acquire())
+        scheduler.release()
+        self.assertEqual(scheduler.limit, 4)
+
+        for status in (400, 404, 500):
+            scheduler.observe(status, {})
+        self.assertEqual(scheduler.limit, 4)
+        scheduler.observe(200, {})
+        scheduler.observe(304, {})
+        self.assertGreater(scheduler.limit, 4)
+
+    def test_acquire_async_honors_limit(self):
+        scheduler = make_scheduler(max_concurrency=4)
+        scheduler.limit = 2
+        peak = 0
+
+        async def request():
+            nonlocal peak
+            await scheduler.acquire_async()
+            peak = max(peak, scheduler.in_flight)
+            await asyncio.sleep(0.01)
+            scheduler.release()
+
+        async def main():
+            await asyncio.gather(*(request() for _ in range(10)))
+
+        asyncio.run(main())
+        self.assertEqual(peak, 2)
+        self.assertEqual(scheduler.in_flight, 0)
+        self.assertEqual(scheduler.stats["requests"], 10)
+
+    def test_acquire_async_woken_by_thread(self):
+        scheduler = make_scheduler(max_concurrency=1)
+        scheduler.acquire()   # posto occupato dal client sincrono
+
+        async def main():
+            threading.Timer(0.05, scheduler.release).start()
+            await asyncio.wait_for(scheduler.acquire_async(), timeout=5)
+            scheduler.release()
+
+        asyncio.run(main())
+        self.assertEqual(scheduler.in_flight, 0)
+
+if __name__ == "__main__":
+    unittest.main()